@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, F, Sum, Value, When
+from django.utils import timezone
+
+from apps.models_app.analytics import PlatformStatsSnapshot, RevenueDaily
+from apps.models_app.field import CropLifecycleDates, Field, FieldIrrigationMethod, FieldIrrigationPractice
+from apps.models_app.user import CustomUser
+from apps.models_app.user_plan import UserPlan
+
+from .conditional import changed_at
+from .roles import EMPLOYEE_ROLES, end_users, holds_any
+from .summary import PAID_STATUSES
+
+logger = logging.getLogger(__name__)
+
+
+def grouped_counts(parts: dict) -> dict[str, Counter]:
+    """Row counts per label for several groupings, fetched as one UNION ALL statement.
+
+    ``parts`` maps a dimension name to ``(queryset, label expression)``; the
+    result maps each dimension to a Counter of label -> rows (labels may be
+    None). Every part scans its own table once and only the grouped rows
+    travel back.
+    """
+    selects = [
+        queryset.order_by()
+        .annotate(label=label)
+        .values("label")
+        .annotate(dimension=Value(name, output_field=CharField()), n=Count("pk"))
+        .values_list("dimension", "label", "n")
+        for name, (queryset, label) in parts.items()
+    ]
+    counts: dict[str, Counter] = defaultdict(Counter)
+    first, *rest = selects
+    for dimension, label, n in first.union(*rest, all=True) if rest else first:
+        counts[dimension][label] += n
+    return {name: counts[name] for name in parts}
+
+
+def _distribution(counter: Counter, missing: str) -> list[dict]:
+    # Largest first, like the ORDER BY -cnt these replace, ties by name so cached
+    # payloads are stable; a null label and its fallback name are one bucket
+    merged = Counter()
+    for label, n in counter.items():
+        merged[label or missing] += n
+    return [{"name": name, "value": n} for name, n in sorted(merged.items(), key=lambda item: (-item[1], item[0]))]
+
+
+def field_summary(fields) -> dict:
+    """Crop, irrigation, lifecycle and region breakdowns over the ``fields`` queryset in one query."""
+    counts = grouped_counts(
+        {
+            "crop": (fields, F("crop__name")),
+            "region": (fields, F("location_name")),
+            "irrigation": (FieldIrrigationMethod.objects.filter(field__in=fields), F("irrigation_method__name")),
+            "practice": (FieldIrrigationPractice.objects.filter(field__in=fields), F("irrigation_method__name")),
+            "lifecycle": (
+                CropLifecycleDates.objects.filter(field__in=fields),
+                Case(
+                    When(harvesting_date__isnull=False, then=Value("Completed")),
+                    default=Value("Remaining"),
+                    output_field=CharField(),
+                ),
+            ),
+        }
+    )
+    crop_distribution = _distribution(counts["crop"], "Unassigned")
+    region_distribution = _distribution(counts["region"], "Unknown")
+    # Prefer the explicit method mapping; fall back to what practices recorded
+    irrigation_distribution = _distribution(counts["irrigation"] or counts["practice"], "Unspecified")
+    completed = counts["lifecycle"]["Completed"]
+    total = completed + counts["lifecycle"]["Remaining"]
+    return {
+        "has_data": bool(crop_distribution or irrigation_distribution or region_distribution or total),
+        "lifecycle_completion": [
+            {"name": "Completed", "value": completed},
+            {"name": "Remaining", "value": total - completed},
+        ],
+        "lifecycle_completion_percent": int(round((completed / total) * 100)) if total else 0,
+        "crop_distribution": crop_distribution,
+        "irrigation_distribution": irrigation_distribution,
+        "region_distribution": region_distribution,
+    }
+
+
+def cached_field_summary(user, privileged: bool) -> dict:
+    """:func:`field_summary` for ``user``'s fields (every field if ``privileged``), cached per data version.
+
+    The key carries the change stamps of the fields scope and the reference
+    tables (crop and method names), so any write starts a fresh entry and
+    old ones simply age out.
+    """
+    scope = "fields" if privileged else f"fields:{user.pk}"
+    stamps = changed_at(scope, "reference")
+    key = f"analytics:fields:{scope}:{'.'.join(map(str, stamps))}"
+    data = cache.get(key)
+    if data is None:
+        data = field_summary(Field.objects.all() if privileged else Field.objects.filter(user=user))
+        cache.set(key, data, settings.ANALYTICS_CACHE_TTL)
+    return data
+
+
+PLATFORM_STATS = "admin-analytics"
+_REFRESH_LOCK = f"lock:snapshot:{PLATFORM_STATS}"
+
+
+def compute_platform_stats() -> dict:
+    """Platform-wide figures for the admin analytics page (everything not tied to the viewer)."""
+    # Transaction figures come from the daily rollup, never from raw transactions;
+    # keys whose rows cancelled out (count 0) are left out like absent ones
+    by_status = list(
+        RevenueDaily.objects.values("status")
+        .annotate(cnt=Sum("count"), amount=Sum("amount"))
+        .filter(cnt__gt=0)
+        .order_by("-cnt")
+    )
+    revenue_amount = sum((row["amount"] or 0) for row in by_status if row["status"] in PAID_STATUSES)
+
+    # One pass over the active users' role masks (see roles.sync_role_masks)
+    segments = CustomUser.objects.filter(is_active=True).aggregate(
+        end_users=Count("id", filter=end_users()),
+        admins=Count("id", filter=holds_any(["Admin"])),
+        employees=Count("id", filter=holds_any(EMPLOYEE_ROLES)),
+    )
+
+    last_7_days = datetime.now().date() - timedelta(days=6)
+    revenue_daily = (
+        RevenueDaily.objects.filter(day__gte=last_7_days, status__in=PAID_STATUSES)
+        .values("day")
+        .annotate(amount=Sum("amount"), cnt=Sum("count"))
+        .filter(cnt__gt=0)
+        .order_by("day")
+    )
+    plan_counts = (
+        UserPlan.objects.filter(is_active=True).values("plan__name").annotate(cnt=Count("id")).order_by("-cnt")
+    )
+    return {
+        "stats": {
+            "total_revenue": float(revenue_amount),
+            "active_end_users": segments["end_users"],
+            "total_fields": Field.objects.count(),
+            "active_admins": segments["admins"],
+            "active_employees": segments["employees"],
+        },
+        "revenue_by_day": [
+            {"name": row["day"].isoformat(), "value": float(row["amount"] or 0)} for row in revenue_daily
+        ],
+        "transactions_by_status": [
+            {"name": (row["status"] or "unknown"), "value": row["cnt"]} for row in by_status
+        ],
+        "plan_distribution": [
+            {"name": (row["plan__name"] or "Unknown"), "value": row["cnt"]} for row in plan_counts
+        ],
+    }
+
+
+def refresh_platform_stats() -> PlatformStatsSnapshot:
+    """Recompute the platform stats and store them as the current snapshot."""
+    started = time.perf_counter()
+    data = compute_platform_stats()
+    snapshot, _ = PlatformStatsSnapshot.objects.update_or_create(
+        key=PLATFORM_STATS,
+        defaults={
+            "data": data,
+            "computed_at": timezone.now(),
+            "duration_ms": int((time.perf_counter() - started) * 1000),
+        },
+    )
+    cache.delete(_REFRESH_LOCK)
+    return snapshot
+
+
+def platform_stats() -> tuple[PlatformStatsSnapshot, bool]:
+    """The current platform stats snapshot and whether it is stale.
+
+    Only a missing snapshot is computed inline. One older than
+    ``PLATFORM_STATS_MAX_AGE`` is still returned while a background refresh
+    is queued (stale-while-revalidate); a cache lock keeps concurrent
+    requests from queueing more than one.
+    """
+    snapshot = PlatformStatsSnapshot.objects.filter(key=PLATFORM_STATS).first()
+    if snapshot is None:
+        return refresh_platform_stats(), False
+    stale = (timezone.now() - snapshot.computed_at).total_seconds() > settings.PLATFORM_STATS_MAX_AGE
+    if stale and cache.add(_REFRESH_LOCK, 1, settings.PLATFORM_STATS_MAX_AGE):
+        from .tasks import refresh_platform_stats as refresh_task
+
+        try:
+            refresh_task.delay()
+        except Exception as exc:
+            # Broker down: keep serving the snapshot and retry in a minute
+            cache.set(_REFRESH_LOCK, 1, 60)
+            logger.warning("Could not queue a platform stats refresh: %s", exc)
+    return snapshot, stale
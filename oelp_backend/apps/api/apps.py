@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class ApiConfig(AppConfig):
+    name = "apps.api"
+    label = "api"
+    verbose_name = "OELP API"
+
+    def ready(self) -> None:
+        # Cache invalidation hooks for the API's in-process caches
+        from . import signals  # noqa: F401
+        # Compile the permission matrix now so a bad policy fails at startup
+        from . import policy  # noqa: F401
@@ -1,35 +1,210 @@
 from __future__ import annotations
 
+import threading
+import time
 from typing import Optional, Tuple
 
+import jwt
+from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from rest_framework import authentication, exceptions
 
-from apps.models_app.token import UserAuthToken
+from apps.models_app.token import UserAuthToken, hash_token
+from apps.models_app.user import CustomUser
+from apps.models_app.user_plan import UserPlan
+
+from .cache import LRUTTLCache
+from .registry import reference
+from .roles import role_names
+
+# digest -> (user_id, session id, concrete field values of the user row, is_active included)
+_token_cache = LRUTTLCache(
+    maxsize=getattr(settings, "AUTH_TOKEN_CACHE_SIZE", 10000),
+    ttl=getattr(settings, "AUTH_TOKEN_CACHE_TTL", 30),
+)
+_user_attnames = [f.attname for f in CustomUser._meta.concrete_fields]
+
+
+def _cache_user(digest: str, session_id: int, user: CustomUser) -> None:
+    values = tuple(getattr(user, name) for name in _user_attnames)
+    _token_cache.set(digest, (user.pk, session_id, values))
+
+
+def invalidate_token(raw_token: str) -> None:
+    _token_cache.pop(hash_token(raw_token))
+
+
+def invalidate_user_tokens(user_id) -> None:
+    _token_cache.prune(lambda _digest, entry: entry[0] == user_id)
+
+
+def invalidate_all_tokens() -> None:
+    _token_cache.clear()
+
+
+class LastSeenBuffer:
+    """Collects token digests seen by this worker and writes ``last_seen`` in one UPDATE per interval.
+
+    ``add`` only records the digest. The UPDATE runs from :meth:`flush`, which
+    ``signals`` calls on ``request_finished``, i.e. once the response has been
+    sent, so no request waits on the write.
+    """
+
+    def __init__(self, interval: float, max_pending: int = 1000) -> None:
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending: set[str] = set()
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, digest: str) -> None:
+        with self._lock:
+            self._pending.add(digest)
+
+    def flush(self, force: bool = False) -> int:
+        """Write the pending digests if the interval passed or the batch is full; returns rows updated."""
+        with self._lock:
+            now = time.monotonic()
+            if not self._pending or (
+                not force and now - self._flushed_at < self.interval and len(self._pending) < self.max_pending
+            ):
+                return 0
+            batch, self._pending, self._flushed_at = self._pending, set(), now
+        try:
+            return UserAuthToken.touch(batch)
+        except Exception:
+            return 0
+
+
+_last_seen = LastSeenBuffer(getattr(settings, "AUTH_LAST_SEEN_FLUSH_INTERVAL", 60))
+
+
+def session_for_token(raw_token: str) -> Optional[Tuple[CustomUser, int]]:
+    """Resolve a raw token to ``(user, session id)``, serving hot tokens from memory."""
+    digest = hash_token(raw_token)
+    entry = _token_cache.get(digest)
+    if entry is not None:
+        _last_seen.add(digest)
+        # Rebuild a fresh instance per request so views can mutate it safely
+        return CustomUser.from_db("default", _user_attnames, list(entry[2])), entry[1]
+    session = UserAuthToken.objects.select_related("user").filter(token_digest=digest).first()
+    if session is None:
+        return None
+    _cache_user(digest, session.pk, session.user)
+    _last_seen.add(digest)
+    return session.user, session.pk
+
+
+def user_for_token(raw_token: str) -> Optional[CustomUser]:
+    found = session_for_token(raw_token)
+    return found[0] if found else None
+
+
+# User flags carried inside access tokens for the auth and permission checks. The payload is
+# only signed, not encrypted, so no profile data (email, phone, name) goes in; views that
+# need it load the row on first access (see CustomUser.refresh_from_db)
+_claim_user_fields = ("is_active", "is_staff", "is_superuser")
+
+
+def issue_access_token(user: CustomUser, session_id: Optional[int] = None) -> str:
+    """Mint a short-lived signed access token for ``user``.
+
+    Roles and the current plan are embedded so most requests authenticate
+    without touching the database; revocation takes effect on expiry.
+    ``session_id`` ties the token to the DB session it was minted from.
+    """
+    now = int(time.time())
+    plan_id = UserPlan.objects.filter(user=user, is_active=True).order_by("-created_at").values_list("plan_id", flat=True).first()
+    plan = reference.table("plan").get(plan_id) if plan_id is not None else None
+    claims = {
+        "sub": str(user.pk),
+        "typ": "access",
+        "iat": now,
+        "exp": now + settings.JWT_ACCESS_TTL,
+        "roles": list(role_names(user)),
+        "plan": plan.name if plan else None,
+        "usr": {name: getattr(user, name) for name in _claim_user_fields},
+    }
+    if session_id is not None:
+        claims["sid"] = session_id
+    return jwt.encode(claims, settings.JWT_SIGNING_KEY, algorithm=settings.JWT_ALGORITHM)
+
+
+def user_from_claims(claims: dict) -> CustomUser:
+    flags = claims.get("usr") or {}
+    values = {name: flags[name] for name in _claim_user_fields if name in flags}
+    values["id"] = int(claims["sub"])
+    # from_db() expects values in model field order; absent columns stay deferred
+    names = [name for name in _user_attnames if name in values]
+    user = CustomUser.from_db("default", names, [values[name] for name in names])
+    # Prime the per-request role memo so permission checks stay query-free
+    user._role_names = tuple(claims.get("roles") or ())
+    return user
+
+
+def _split_auth_header(request, keyword: str) -> Optional[str]:
+    auth = authentication.get_authorization_header(request).split()
+    if not auth or auth[0].lower() != keyword.lower().encode():
+        return None
+    if len(auth) == 1:
+        raise exceptions.AuthenticationFailed(_("Invalid token header. No credentials provided."))
+    if len(auth) > 2:
+        raise exceptions.AuthenticationFailed(_("Invalid token header."))
+    try:
+        return auth[1].decode()
+    except UnicodeError:
+        raise exceptions.AuthenticationFailed(_("Invalid token header. Token string should not contain invalid characters."))
+
+
+class JWTAuthentication(authentication.BaseAuthentication):
+    """Stateless ``Authorization: Bearer <jwt>`` authentication."""
+
+    keyword = "Bearer"
+
+    def authenticate(self, request) -> Optional[Tuple[object, dict]]:
+        token = _split_auth_header(request, self.keyword)
+        if token is None or not settings.AUTH_JWT_ENABLED:
+            return None
+        try:
+            claims = jwt.decode(
+                token,
+                settings.JWT_SIGNING_KEY,
+                algorithms=[settings.JWT_ALGORITHM],
+                options={"require": ["exp", "sub"]},
+            )
+        except jwt.ExpiredSignatureError:
+            raise exceptions.AuthenticationFailed(_("Access token expired."))
+        except jwt.InvalidTokenError:
+            raise exceptions.AuthenticationFailed(_("Invalid access token."))
+        if claims.get("typ") != "access":
+            raise exceptions.AuthenticationFailed(_("Invalid access token."))
+        user = user_from_claims(claims)
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+        return (user, claims)
+
+    def authenticate_header(self, request) -> str:
+        return self.keyword
 
 
 class TokenAuthentication(authentication.BaseAuthentication):
     keyword = "Token"
 
-    def authenticate(self, request) -> Optional[Tuple[object, None]]:
-        auth = authentication.get_authorization_header(request).split()
-        if not auth or auth[0].lower() != self.keyword.lower().encode():
+    def authenticate(self, request) -> Optional[Tuple[object, dict]]:
+        # Views list this class alone, so it also accepts signed bearer tokens
+        bearer = JWTAuthentication().authenticate(request)
+        if bearer is not None:
+            return bearer
+        token = _split_auth_header(request, self.keyword)
+        if token is None:
             return None
-        if len(auth) == 1:
-            raise exceptions.AuthenticationFailed(_("Invalid token header. No credentials provided."))
-        if len(auth) > 2:
-            raise exceptions.AuthenticationFailed(_("Invalid token header."))
-        try:
-            token = auth[1].decode()
-        except UnicodeError:
-            raise exceptions.AuthenticationFailed(_("Invalid token header. Token string should not contain invalid characters."))
 
-        try:
-            user_token = UserAuthToken.objects.select_related("user").get(access_token=token)
-        except UserAuthToken.DoesNotExist:
+        found = session_for_token(token)
+        if found is None:
             raise exceptions.AuthenticationFailed(_("Invalid token."))
-        if not user_token.user.is_active:
+        user, session_id = found
+        if not user.is_active:
             raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
 
-        return (user_token.user, None)
-
+        # request.auth identifies the session, e.g. for logging out this device only
+        return (user, {"sid": session_id})
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from types import MappingProxyType
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from apps.models_app.feature_plan import PlanFeature
+from apps.models_app.plan import Plan
+
+from .cache import bump_version, get_versions
+
+_VERSION_KEY = "catalog:plans"
+
+
+class PlanCatalog:
+    """Serialized plans with their feature names, built in two queries."""
+
+    def __init__(self, version: int) -> None:
+        from .serializers import PlanSerializer
+
+        self.version = version
+        self.loaded_at = time.monotonic()
+        features: dict[int, list[str]] = {}
+        for plan_id, name in PlanFeature.objects.order_by("id").values_list("plan_id", "feature__name"):
+            features.setdefault(plan_id, []).append(name)
+        self.features = MappingProxyType({pk: tuple(names) for pk, names in features.items()})
+        plans = Plan.objects.order_by("pk")
+        data = PlanSerializer(plans, many=True, context={"plan_features": features}).data
+        self.plans = tuple(data)
+        self._by_id = MappingProxyType({item["id"]: item for item in self.plans})
+        payload = json.dumps(self.plans, cls=DjangoJSONEncoder, sort_keys=True).encode()
+        # Content hash rather than the counter: per-process counters differ between workers
+        self.etag = f'"plans-{hashlib.sha1(payload).hexdigest()[:20]}"'
+
+    def get(self, plan_id):
+        """Serialized plan (a fresh dict) or None."""
+        item = self._by_id.get(plan_id)
+        return dict(item, features=list(item["features"])) if item is not None else None
+
+
+_current: PlanCatalog | None = None
+_lock = threading.Lock()
+
+
+def plan_catalog() -> PlanCatalog:
+    """Current catalog; rebuilt when a Plan, PlanFeature or Feature write bumps its version."""
+    global _current
+    (version,) = get_versions(_VERSION_KEY)
+    max_age = getattr(settings, "REFERENCE_REGISTRY_MAX_AGE", 300)
+    current = _current
+    if current is not None and current.version == version and time.monotonic() - current.loaded_at < max_age:
+        return current
+    with _lock:
+        current = _current
+        if current is None or current.version != version or time.monotonic() - current.loaded_at >= max_age:
+            current = _current = PlanCatalog(version)
+    return current
+
+
+def invalidate_plan_catalog() -> None:
+    def _expire():
+        global _current
+        bump_version(_VERSION_KEY)
+        _current = None
+
+    transaction.on_commit(_expire)
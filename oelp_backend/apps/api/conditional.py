@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import exceptions, status
+from rest_framework.response import Response
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _stamps():
+    # Stamps never expire, so they live in a cache every worker shares (CONDITIONAL_CACHE)
+    return caches[getattr(settings, "CONDITIONAL_CACHE", "default")]
+
+
+def touch(*scopes: str) -> None:
+    """Record a change to ``scopes`` once the current transaction commits.
+
+    Each scope holds the millisecond time of its last change, kept strictly
+    increasing so two writes in the same millisecond still change the ETag.
+    """
+
+    def _bump():
+        stamps = _stamps()
+        keys = [f"changed:{scope}" for scope in scopes]
+        now = _now_ms()
+        found = stamps.get_many(keys)
+        stamps.set_many({key: max(now, int(found.get(key) or 0) + 1) for key in keys}, None)
+
+    transaction.on_commit(_bump)
+
+
+def changed_at(*scopes: str) -> tuple[int, ...]:
+    """Last-change stamps for ``scopes`` in one cache round trip.
+
+    A scope missing from the cache (first use, eviction, flush) starts at
+    "now", so a lost counter can only cause a refetch, never a stale 304.
+    """
+    stamps = _stamps()
+    keys = [f"changed:{scope}" for scope in scopes]
+    found = stamps.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        now = _now_ms()
+        for key in missing:
+            stamps.add(key, now, None)
+        found.update(stamps.get_many(missing))
+    return tuple(int(found.get(key) or 0) for key in keys)
+
+
+class NotModified(exceptions.APIException):
+    status_code = status.HTTP_304_NOT_MODIFIED
+    default_detail = ""
+    default_code = "not_modified"
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 13.1.2): W/ prefixes are ignored
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+class ConditionalGetMixin:
+    """ETag / Last-Modified for GET endpoints, answered before the handler runs.
+
+    Views declare the change scopes their response depends on, e.g.
+    ``("fields:{user}", "reference")``; ``{user}`` is the caller's id. Writes
+    call :func:`touch` on the same scopes (see ``signals``). The check runs in
+    ``initial()``, after authentication and permissions, so a 304 costs no
+    queries beyond authentication (one more with the database cache fallback
+    for ``CONDITIONAL_CACHE``). Views with their own version signal can
+    override :meth:`get_conditional_state` instead.
+    """
+
+    conditional_scopes: tuple[str, ...] = ()
+    conditional_actions: tuple[str, ...] = ("list", "retrieve")
+
+    def get_conditional_scopes(self, request) -> tuple[str, ...]:
+        return tuple(scope.format(user=request.user.pk) for scope in self.conditional_scopes)
+
+    def get_conditional_state(self, request) -> tuple[str | None, int | None]:
+        """``(etag, last modified in ms)`` for this request, or ``(None, None)`` to skip."""
+        scopes = self.get_conditional_scopes(request)
+        if not scopes:
+            return None, None
+        stamps = changed_at(*scopes)
+        renderer = getattr(request, "accepted_media_type", "")
+        raw = f"{type(self).__name__}|{request.get_full_path()}|{request.user.pk}|{renderer}|{stamps}"
+        return f'W/"{hashlib.sha1(raw.encode()).hexdigest()[:24]}"', max(stamps)
+
+    def _conditional_applies(self, request) -> bool:
+        if request.method not in ("GET", "HEAD"):
+            return False
+        action = getattr(self, "action", None)
+        return action is None or action in self.conditional_actions
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._conditional = None
+        if not self._conditional_applies(request):
+            return
+        etag, last_ms = self.get_conditional_state(request)
+        if etag is None:
+            return
+        # Only advertise Last-Modified for changes older than the current second;
+        # its one-second resolution could otherwise hide a change made later in it
+        last_modified = last_ms // 1000 if last_ms is not None and last_ms // 1000 < int(time.time()) else None
+        self._conditional = (etag, last_modified)
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match is not None:
+            if _etag_matches(if_none_match, etag):
+                raise NotModified()
+        elif last_modified is not None:
+            since = parse_http_date_safe(request.headers.get("If-Modified-Since") or "")
+            if since is not None and last_modified <= since:
+                raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        state = getattr(self, "_conditional", None)
+        if state is not None and response.status_code in (200, 304):
+            etag, last_modified = state
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+            response["Cache-Control"] = "private, no-cache"
+        return response
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# Serializer fields whose to_representation() returns DB values unchanged
+_PASSTHROUGH = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.FloatField,
+    serializers.IntegerField,
+    serializers.JSONField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+class Computed:
+    """Output value derived from ``paths``: ``convert(*values, ctx)``.
+
+    ``ctx`` holds ``uri`` (absolute URL builder) plus whatever the encoder's
+    ``prepare`` hook returned for the current page.
+    """
+
+    def __init__(self, *paths: str, convert: Callable) -> None:
+        self.paths = paths
+        self.convert = convert
+
+
+class RowEncoder:
+    """Serialize ``values_list()`` rows into the same dicts as a ModelSerializer.
+
+    Each field selection is compiled once into a function mapping a row tuple
+    straight to its output dict: plain columns are copied, dates and decimals
+    go through the serializer field's own ``to_representation()``, method
+    fields use the ``computed`` entries, and dotted sources such as
+    ``plan.name`` are dropped from the row when the relation is null, like
+    DRF does. No model instances or per-row field objects are created.
+    """
+
+    def __init__(self, serializer_class, computed: dict | None = None, prepare: Callable | None = None) -> None:
+        self.serializer_class = serializer_class
+        self.computed = computed or {}
+        # prepare(rows, columns, fields) -> dict merged into ctx, e.g. per-page lookups
+        self.prepare = prepare
+        self._compiled: dict = {}
+        self._lock = threading.Lock()
+
+    def compile(self, fields=None):
+        fields = self._fields(fields)
+        compiled = self._compiled.get(fields)
+        if compiled is None:
+            with self._lock:
+                compiled = self._compiled.get(fields) or self._build(fields)
+                self._compiled[fields] = compiled
+        return compiled
+
+    def _fields(self, fields) -> tuple[str, ...]:
+        return tuple(self.serializer_class.Meta.fields if fields is None else fields)
+
+    def _build(self, fields):
+        declared = self.serializer_class().fields
+        model = self.serializer_class.Meta.model
+        columns: list[str] = []
+        namespace: dict = {}
+
+        def column(path: str) -> str:
+            if path not in columns:
+                columns.append(path)
+            return f"r[{columns.index(path)}]"
+
+        items, skips = [], []
+        for n, name in enumerate(fields):
+            field = declared.get(name)
+            if field is None or field.write_only:
+                continue
+            key = repr(name)
+            if name in self.computed:
+                spec = self.computed[name]
+                namespace[f"c{n}"] = spec.convert
+                args = "".join(f"{column(path)}, " for path in spec.paths)
+                items.append(f"{key}: c{n}({args}x)")
+                continue
+            source = field.source
+            if source == "*" or source.count(".") > 1:
+                raise ImproperlyConfigured(f"{self.serializer_class.__name__}.{name} needs a Computed entry")
+            if "." in source:
+                # farm.name: the whole key is skipped when the relation is null
+                relation, attr = source.split(".")
+                value = column(f"{relation}__{attr}")
+                skips.append(f"    if {column(model._meta.get_field(relation).attname)} is None: del d[{key}]")
+            else:
+                model_field = model._meta.get_field(source)
+                value = column(model_field.attname if model_field.is_relation else source)
+            if isinstance(field, serializers.FileField):
+                namespace[f"s{n}"] = model._meta.get_field(source).storage
+                items.append(f"{key}: x['uri'](s{n}.url({value})) if {value} else None")
+            elif isinstance(field, _PASSTHROUGH):
+                items.append(f"{key}: {value}")
+            else:
+                namespace[f"c{n}"] = field.to_representation
+                items.append(f"{key}: c{n}({value}) if {value} is not None else None")
+
+        body = ["def encode(r, x):", "    d = {" + ", ".join(items) + "}", *skips, "    return d"]
+        exec("\n".join(body), namespace)
+        return tuple(columns), namespace["encode"]
+
+    def rows(self, queryset, fields=None, extra=()):
+        """``queryset`` reduced to the tuples the compiled encoder reads.
+
+        ``extra`` columns are appended after the encoded ones and ignored by
+        :meth:`encode` (keyset pagination reads its cursor from them).
+        """
+        columns, _ = self.compile(fields)
+        return queryset.prefetch_related(None).values_list(*columns, *extra)
+
+    def encode(self, rows, fields=None, request=None) -> list[dict]:
+        fields = self._fields(fields)
+        columns, encode = self.compile(fields)
+        ctx = {"uri": request.build_absolute_uri if request is not None else _identity}
+        if self.prepare is not None:
+            ctx.update(self.prepare(rows, columns, fields))
+        return [encode(row, ctx) for row in rows]
+
+
+def _identity(value):
+    return value
+
+
+class FastListMixin:
+    """Serve ``list`` through ``row_encoder`` when ``FAST_LIST_SERIALIZATION`` is on.
+
+    Filtering, ordering, pagination and ``?fields=`` work as before; only the
+    row materialization changes. Set ``row_encoder`` on the viewset to opt in.
+    """
+
+    row_encoder: RowEncoder | None = None
+
+    def list(self, request, *args, **kwargs):
+        if self.row_encoder is None or not getattr(settings, "FAST_LIST_SERIALIZATION", False):
+            return super().list(request, *args, **kwargs)
+        fields = self.row_encoder.serializer_class.selected_fields(request)
+        row_keys = getattr(self.paginator, "row_keys", None)
+        extra = row_keys(request) if row_keys is not None else ()
+        rows = self.row_encoder.rows(self.filter_queryset(self.get_queryset()), fields, extra)
+        page = self.paginate_queryset(rows)
+        data = self.row_encoder.encode(page if page is not None else list(rows), fields, request)
+        return self.get_paginated_response(data) if page is not None else Response(data)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import json
+
+from django.db import NotSupportedError
+from django.db.models import FloatField, Func
+
+
+class JSONNumber(Func):
+    """Value of ``key`` in a JSON column as a float, NULL unless it is a JSON number.
+
+    Strings, booleans and missing keys give NULL rather than a cast error, so
+    the expression is safe inside ``Sum()``/``Avg()`` over loosely shaped data
+    like ``Field.area``.
+    """
+
+    output_field = FloatField()
+
+    def __init__(self, expression, key: str, **extra):
+        super().__init__(expression, **extra)
+        self.key = key
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.get_source_expressions()[0])
+        return (
+            f"CASE WHEN jsonb_typeof({sql} -> %s) = 'number' THEN ({sql} ->> %s)::double precision END",
+            (*params, self.key, *params, self.key),
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.get_source_expressions()[0])
+        path = f"$.{json.dumps(self.key)}"
+        return (
+            f"CASE WHEN json_type({sql}, %s) IN ('integer', 'real') THEN json_extract({sql}, %s) END",
+            (*params, path, *params, path),
+        )
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(f"JSONNumber is not implemented for {connection.vendor}")
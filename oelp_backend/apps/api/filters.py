@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from rest_framework.filters import BaseFilterBackend
+
+from .serializers import SparseModelSerializer
+
+
+class SparseFieldsFilter(BaseFilterBackend):
+    """Narrow list querysets to the columns behind ``?fields=`` / ``?omit=``.
+
+    The serializer drops the unrequested fields itself; this backend makes
+    the query match by ``only()``-ing the remaining columns and following
+    just the relations they need.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if getattr(view, "action", None) != "list":
+            return queryset
+        serializer_class = view.get_serializer_class()
+        if not issubclass(serializer_class, SparseModelSerializer) or queryset.model is not serializer_class.Meta.model:
+            return queryset
+        fields = serializer_class.selected_fields(request)
+        return queryset if fields is None else serializer_class.narrow_queryset(queryset, fields)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": name,
+                "required": False,
+                "in": "query",
+                "description": description,
+                "schema": {"type": "string"},
+            }
+            for name, description in (
+                ("fields", "Comma-separated fields to include"),
+                ("omit", "Comma-separated fields to leave out"),
+            )
+        ]
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.contrib.auth.hashers import Argon2PasswordHasher
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions, status
+
+
+class ConfigurableArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2 with per-deployment cost parameters.
+
+    Keeps the ``argon2`` algorithm name, so existing hashes verify and are
+    upgraded on the next successful login when the parameters change.
+    """
+
+    time_cost = getattr(settings, "ARGON2_TIME_COST", Argon2PasswordHasher.time_cost)
+    memory_cost = getattr(settings, "ARGON2_MEMORY_COST", Argon2PasswordHasher.memory_cost)
+    parallelism = getattr(settings, "ARGON2_PARALLELISM", Argon2PasswordHasher.parallelism)
+
+
+class PasswordHashingBusy(exceptions.APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _("Too many sign-in attempts in progress, retry shortly.")
+    default_code = "password_hashing_busy"
+
+    def __init__(self, wait: int) -> None:
+        super().__init__()
+        # DRF's exception handler turns ``wait`` into a Retry-After header
+        self.wait = wait
+
+
+class HashingPool:
+    """Size-limited executor for password hashing.
+
+    Argon2 releases the GIL, so a few threads saturate the cores reserved
+    for hashing. At most ``workers + queue`` jobs are admitted; anything
+    beyond that is rejected immediately with :class:`PasswordHashingBusy`
+    instead of piling up behind the pool.
+
+    Only :meth:`arun` frees the caller: ``AsyncLoginView`` (served over
+    ASGI) awaits the hash while its event loop keeps serving other
+    requests. :meth:`run`, used by the sync views (``LoginView``,
+    password change/reset, sign-up), blocks the request thread until the
+    hash is done; there the pool only bounds how much CPU hashing takes
+    per worker and sheds the excess, it does not give the thread back.
+    ``manage.py benchmark_login_storm`` shows the difference.
+    """
+
+    def __init__(self, workers: int, queue: int, retry_after: int) -> None:
+        self.workers = max(workers, 1)
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(self.workers + max(queue, 0))
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created lazily so forked gunicorn workers each start their own threads
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pwhash")
+        return self._executor
+
+    def _admit(self):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHashingBusy(self.retry_after)
+        try:
+            return self._get_executor()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def run(self, fn, *args):
+        """Run ``fn`` on the pool and block the calling thread for the result."""
+        executor = self._admit()
+        try:
+            return executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    async def arun(self, fn, *args):
+        """Run ``fn`` on the pool; the caller's event loop is free while it runs."""
+        executor = self._admit()
+        try:
+            return await asyncio.wrap_future(executor.submit(fn, *args))
+        finally:
+            self._slots.release()
+
+
+pool = HashingPool(
+    workers=getattr(settings, "PASSWORD_HASH_WORKERS", 2),
+    queue=getattr(settings, "PASSWORD_HASH_QUEUE", 8),
+    retry_after=getattr(settings, "PASSWORD_HASH_RETRY_AFTER", 1),
+)
+
+
+def _verify(raw_password: str, encoded: str) -> tuple[bool, bool]:
+    if not hashers.check_password(raw_password, encoded):
+        return False, False
+    # Same upgrade rule as django.contrib.auth.hashers.check_password()
+    preferred = hashers.get_hasher("default")
+    hasher_changed = hashers.identify_hasher(encoded).algorithm != preferred.algorithm
+    return True, hasher_changed or preferred.must_update(encoded)
+
+
+def set_password(user, raw_password: str) -> None:
+    """``user.set_password()`` with the hash computed on the pool."""
+    user.password = pool.run(hashers.make_password, raw_password)
+    user._password = raw_password
+
+
+def check_password(user, raw_password: str) -> bool:
+    """``user.check_password()`` on the pool, upgrading outdated hashes like Django does."""
+    ok, must_update = pool.run(_verify, raw_password, user.password)
+    if must_update:
+        set_password(user, raw_password)
+        user._password = None
+        user.save(update_fields=["password"])
+    return ok
+
+
+def hash_dummy(raw_password: str) -> None:
+    # Same cost as a real check so unknown usernames are not distinguishable by timing
+    pool.run(hashers.make_password, raw_password)
+
+
+async def acheck_password(user, raw_password: str) -> bool:
+    ok, must_update = await pool.arun(_verify, raw_password, user.password)
+    if must_update:
+        user.password = await pool.arun(hashers.make_password, raw_password)
+        await user.asave(update_fields=["password"])
+    return ok
+
+
+async def ahash_dummy(raw_password: str) -> None:
+    await pool.arun(hashers.make_password, raw_password)
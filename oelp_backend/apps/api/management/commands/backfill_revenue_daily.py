@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from ...revenue import rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild RevenueDaily rows from Transaction for a date range (all history by "
+        "default). Existing rollup rows in the range are replaced in one transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=date.fromisoformat, help="First day, YYYY-MM-DD (default: earliest)")
+        parser.add_argument("--end", type=date.fromisoformat, help="Last day, YYYY-MM-DD (default: latest)")
+
+    def handle(self, *args, **options):
+        written = rebuild(options["start"], options["end"])
+        self.stdout.write(f"Wrote {written} revenue rollup rows")
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.models_app.field import Field
+from apps.models_app.notifications import Notification
+from apps.models_app.user_plan import Transaction
+
+from ...renderers import FastJSONParser, FastJSONRenderer, orjson
+from ...serializers import FieldSerializer, NotificationSerializer, TransactionSerializer
+from ...views import AdminAnalyticsView
+from ..seeding import seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Time DRF's JSON renderer/parser against the orjson-backed ones on real "
+        "response shapes from a seeded dataset (rolled back afterwards)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000, help="Rows seeded per list (default 1000)")
+        parser.add_argument("--repeat", type=int, default=5, help="Best of N runs (default 5)")
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError("orjson is not installed; FastJSONRenderer is using the stdlib encoder")
+        with transaction.atomic():
+            admin = seed_dataset(options["rows"])["admin"]
+            fields = FieldSerializer.setup_eager_loading(Field.objects.select_related("farm", "crop_variety"))
+            payloads = {
+                "fields (boundaries)": FieldSerializer(fields, many=True).data,
+                "notifications": NotificationSerializer(Notification.objects.all(), many=True).data,
+                "transactions": TransactionSerializer(Transaction.objects.select_related("plan", "user"), many=True).data,
+                "admin analytics": self._analytics(admin),
+            }
+            transaction.set_rollback(True)
+
+        repeat = max(options["repeat"], 1)
+        self.stdout.write(f"{'payload':<22} {'KiB':>7} {'render ms':>10} {'fast':>7} {'parse ms':>9} {'fast':>7}")
+        mismatched = []
+        for name, data in payloads.items():
+            slow_ms, slow_out = _best_of(lambda: JSONRenderer().render(data), repeat)
+            fast_ms, fast_out = _best_of(lambda: FastJSONRenderer().render(data), repeat)
+            parse_ms, parsed = _best_of(lambda: JSONParser().parse(io.BytesIO(slow_out)), repeat)
+            fast_parse_ms, fast_parsed = _best_of(lambda: FastJSONParser().parse(io.BytesIO(slow_out)), repeat)
+            if slow_out != fast_out or parsed != fast_parsed:
+                mismatched.append(name)
+            self.stdout.write(
+                f"{name:<22} {len(slow_out) / 1024:>7.0f} {slow_ms:>10.2f} {fast_ms:>7.2f} {parse_ms:>9.2f} {fast_parse_ms:>7.2f}"
+            )
+        if mismatched:
+            raise CommandError(f"Output differs for: {', '.join(mismatched)}")
+
+    def _analytics(self, user):
+        request = APIRequestFactory().get("/api/admin/analytics/")
+        force_authenticate(request, user=user)
+        return AdminAnalyticsView.as_view()(request).data
+
+
+def _best_of(fn, repeat):
+    best, out = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, out
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from apps.models_app.field import Field
+from apps.models_app.notifications import Notification
+from apps.models_app.user import CustomUser
+from apps.models_app.user_plan import Transaction
+
+from ...serializers import (
+    FIELD_ROW_ENCODER,
+    NOTIFICATION_ROW_ENCODER,
+    TRANSACTION_ROW_ENCODER,
+    USER_ROW_ENCODER,
+    FieldSerializer,
+    NotificationSerializer,
+    TransactionSerializer,
+    UserSerializer,
+)
+from ..seeding import seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare serializer and values() fast-path list serialization on a seeded "
+        "dataset (rolled back afterwards) and check both produce the same JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000, help="Rows seeded per list (default 10000)")
+        parser.add_argument("--repeat", type=int, default=3, help="Best of N runs (default 3)")
+
+    def handle(self, *args, **options):
+        repeat = max(options["repeat"], 1)
+        with transaction.atomic():
+            owner = seed_dataset(options["rows"])["owner"]
+            cases = {
+                "AdminFieldViewSet": (
+                    FieldSerializer,
+                    FIELD_ROW_ENCODER,
+                    lambda: FieldSerializer.setup_eager_loading(Field.objects.select_related("farm", "crop_variety")),
+                ),
+                "AdminUsersViewSet": (
+                    UserSerializer,
+                    USER_ROW_ENCODER,
+                    lambda: UserSerializer.setup_eager_loading(CustomUser.objects.order_by("-date_joined")),
+                ),
+                "AdminNotificationsViewSet": (
+                    NotificationSerializer,
+                    NOTIFICATION_ROW_ENCODER,
+                    lambda: Notification.objects.select_related("receiver", "sender").order_by("-created_at"),
+                ),
+                "TransactionViewSet": (
+                    TransactionSerializer,
+                    TRANSACTION_ROW_ENCODER,
+                    lambda: Transaction.objects.filter(user=owner).select_related("plan", "user"),
+                ),
+            }
+            results = [(name, *self._compare(*case, repeat)) for name, case in cases.items()]
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'view':<28} {'rows':>7} {'serializer ms':>14} {'fast ms':>9} {'speedup':>8}")
+        mismatched = []
+        for name, count, slow, fast, same in results:
+            self.stdout.write(f"{name:<28} {count:>7} {slow * 1000:>14.1f} {fast * 1000:>9.1f} {slow / fast:>7.1f}x")
+            if not same:
+                mismatched.append(name)
+        if mismatched:
+            raise CommandError(f"Fast path output differs for: {', '.join(mismatched)}")
+
+    def _compare(self, serializer_class, encoder, queryset, repeat):
+        renderer = JSONRenderer()
+
+        def slow():
+            return renderer.render(serializer_class(queryset(), many=True).data)
+
+        def fast():
+            return renderer.render(encoder.encode(list(encoder.rows(queryset()))))
+
+        slow_best, slow_out = _best_of(slow, repeat)
+        fast_best, fast_out = _best_of(fast, repeat)
+        return slow_out.count(b'"id":'), slow_best, fast_best, slow_out == fast_out
+
+
+def _best_of(fn, repeat):
+    best, out = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, out
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import hashers
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import AsyncClient
+
+from apps.models_app.token import UserAuthToken
+
+from ...hashers import pool, set_password
+from ...views import AsyncLoginView, LoginView
+from ..seeding import seed_dataset
+
+PASSWORD = "storm-Password-123"
+
+
+class Command(BaseCommand):
+    help = (
+        "Time GET /api/dashboard/ while concurrent logins hammer the sync and the async "
+        "login endpoints, in-process over ASGI on a seeded dataset (rolled back afterwards). "
+        "Login throttles are switched off for the run so every attempt reaches the hasher."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=8, help="Concurrent login loops (default 8)")
+        parser.add_argument("--samples", type=int, default=15, help="Dashboard requests per scenario (default 15)")
+        parser.add_argument("--rows", type=int, default=200, help="Rows seeded per list (default 200)")
+
+    def handle(self, *args, **options):
+        throttles = LoginView.throttle_classes, AsyncLoginView.throttle_classes
+        LoginView.throttle_classes = AsyncLoginView.throttle_classes = []
+        try:
+            with transaction.atomic():
+                users = seed_dataset(max(options["rows"], 1))
+                # Logins run as the admin so the sessions they open never evict the owner's token
+                admin, owner = users["admin"], users["owner"]
+                set_password(admin, PASSWORD)
+                admin.save(update_fields=["password"])
+                token = UserAuthToken.issue(owner, device="login-storm")[0]
+                results = async_to_sync(self._run)(admin.username, token, options["logins"], max(options["samples"], 1))
+                transaction.set_rollback(True)
+        finally:
+            LoginView.throttle_classes, AsyncLoginView.throttle_classes = throttles
+
+        hasher = hashers.get_hasher("default")
+        self.stdout.write(
+            f"Hasher {hasher.algorithm}; pool of {pool.workers} workers; {options['logins']} concurrent login loops"
+        )
+        self.stdout.write(
+            f"{'scenario':<20} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'logins':>7} {'503':>5} {'other':>6}"
+        )
+        for name, timings, outcomes in results:
+            timings.sort()
+            p50, p95 = timings[len(timings) // 2], timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            other = sum(n for code, n in outcomes.items() if code not in (200, 503))
+            self.stdout.write(
+                f"{name:<20} {p50 * 1000:>8.1f} {p95 * 1000:>8.1f} {timings[-1] * 1000:>8.1f} "
+                f"{outcomes[200]:>7} {outcomes[503]:>5} {other:>6}"
+            )
+
+    async def _run(self, username, token, logins, samples):
+        # Sync views run on the single thread-sensitive executor, like one sync worker
+        client = AsyncClient()
+        scenarios = [
+            ("idle", None),
+            ("async login storm", "/api/auth/login/async/"),
+            ("sync login storm", "/api/auth/login/"),
+        ]
+        results = []
+        for name, path in scenarios:
+            stop, outcomes = asyncio.Event(), Counter()
+            storm = [asyncio.create_task(_login_loop(client, path, username, stop, outcomes)) for _ in range(logins if path else 0)]
+            await asyncio.sleep(0.05 if path else 0)
+            timings = []
+            for _ in range(samples):
+                start = time.perf_counter()
+                response = await client.get("/api/dashboard/", headers={"Authorization": f"Token {token}"})
+                timings.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    raise CommandError(f"Dashboard answered {response.status_code} during '{name}'")
+            stop.set()
+            await asyncio.gather(*storm)
+            results.append((name, timings, outcomes))
+        return results
+
+
+async def _login_loop(client, path, username, stop, outcomes):
+    while not stop.is_set():
+        response = await client.post(path, {"username": username, "password": PASSWORD}, content_type="application/json")
+        outcomes[response.status_code] += 1
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import random
+import secrets
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.models_app.token import UserAuthToken, hash_token
+from apps.models_app.user import CustomUser
+
+from ...auth import invalidate_all_tokens, session_for_token
+from ..seeding import seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Time token authentication lookups against a table of seeded sessions "
+        "(1M by default, rolled back afterwards): cold (database) and hot (auth cache)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tokens", type=int, default=1_000_000, help="Sessions stored (default 1000000)")
+        parser.add_argument("--users", type=int, default=100, help="Users the sessions are spread over (default 100)")
+        parser.add_argument("--lookups", type=int, default=2000, help="Tokens looked up per phase (default 2000)")
+
+    def handle(self, *args, **options):
+        total, lookups = options["tokens"], options["lookups"]
+        if total < lookups:
+            raise CommandError("--tokens must be at least --lookups")
+        with transaction.atomic():
+            seed_dataset(max(options["users"], 1))
+            owners = list(CustomUser.objects.values_list("pk", flat=True))
+            prefix = secrets.token_hex(4)
+            sample = set(random.sample(range(total), lookups))
+            raw_tokens = []
+            self.stdout.write(f"Seeding {total} sessions...")
+            for start in range(0, total, 10000):
+                batch = []
+                for i in range(start, min(start + 10000, total)):
+                    raw = f"bench-{prefix}-{i}"
+                    if i in sample:
+                        raw_tokens.append(raw)
+                    batch.append(UserAuthToken(user_id=owners[i % len(owners)], token_digest=hash_token(raw)))
+                UserAuthToken.objects.bulk_create(batch)
+            random.shuffle(raw_tokens)
+            missing = [f"bench-{prefix}-missing-{i}" for i in range(lookups)]
+
+            invalidate_all_tokens()
+            results = {
+                "cold (database)": _timings(raw_tokens),
+                "hot (auth cache)": _timings(raw_tokens),
+                "unknown token": _timings(missing),
+            }
+            plan = UserAuthToken.objects.filter(token_digest=hash_token(raw_tokens[0])).explain()
+            invalidate_all_tokens()
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"Query plan: {' '.join(plan.split())}")
+        self.stdout.write(f"{'lookup':<18} {'p50 us':>8} {'p99 us':>8} {'max us':>8}")
+        for name, (timings, resolved) in results.items():
+            expected = 0 if name == "unknown token" else len(timings)
+            if resolved != expected:
+                raise CommandError(f"{name}: resolved {resolved} of {len(timings)} tokens, expected {expected}")
+            timings.sort()
+            p50, p99 = timings[len(timings) // 2], timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+            self.stdout.write(f"{name:<18} {p50 * 1e6:>8.0f} {p99 * 1e6:>8.0f} {timings[-1] * 1e6:>8.0f}")
+
+
+def _timings(raw_tokens):
+    timings, resolved = [], 0
+    for raw in raw_tokens:
+        start = time.perf_counter()
+        found = session_for_token(raw)
+        timings.append(time.perf_counter() - start)
+        resolved += found is not None
+    return timings, resolved
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+
+from apps.models_app.token import UserAuthToken
+
+from ...auth import _last_seen
+from ...middleware import load_budgets
+from ...querycount import QueryRecorder
+from ..seeding import seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway dataset, request every route in the query budget file "
+        "and fail when one runs more SQL queries than its budget. Nothing is kept: "
+        "the whole run is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=20, help="Rows seeded per list (default 20)")
+        parser.add_argument("--route", action="append", help="Only check this route (repeatable)")
+
+    def handle(self, *args, **options):
+        budgets = load_budgets()
+        routes = options["route"] or sorted(budgets)
+        unknown = [name for name in routes if name not in budgets]
+        if unknown:
+            raise CommandError(f"No budget for: {', '.join(unknown)}")
+
+        # Keep the last-seen buffer from flushing mid-run and adding a stray UPDATE
+        interval, _last_seen.interval = _last_seen.interval, float("inf")
+        try:
+            with transaction.atomic():
+                users = seed_dataset(options["rows"])
+                tokens = {role: UserAuthToken.issue(user, device="query-budget")[0] for role, user in users.items()}
+                results = [self._measure(name, budgets[name], tokens) for name in routes]
+                transaction.set_rollback(True)
+        finally:
+            _last_seen.interval = interval
+
+        failures = 0
+        for name, budget, status_code, recorder in results:
+            limit = budget["max_queries"]
+            over = recorder.count > limit or status_code >= 400
+            failures += over
+            line = f"{name:<40} {recorder.count:>3}/{limit:<3} {recorder.duration_ms:>8} ms  HTTP {status_code}"
+            self.stdout.write(self.style.ERROR(line) if over else line)
+            if over:
+                for sql, n in recorder.repeated().items():
+                    self.stdout.write(f"    {n}x {sql[:160]}")
+        if failures:
+            raise CommandError(f"{failures} route(s) over their query budget")
+
+    def _measure(self, name, budget, tokens):
+        client = Client(HTTP_HOST="localhost", HTTP_AUTHORIZATION=f"Token {tokens[budget.get('as', 'owner')]}")
+        # First request warms the token, role and reference caches; budgets are for steady state
+        client.get(budget["path"])
+        with QueryRecorder() as recorder:
+            response = client.get(budget["path"])
+        return name, budget, response.status_code, recorder
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...throttling import LoginUsernameThrottle
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent login attempts for one fresh username at the login throttle "
+        "(on the configured AUTH_THROTTLE_CACHE) and fail if more than its limit are admitted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--attempts", type=int, default=200, help="Concurrent attempts (default 200)")
+        parser.add_argument("--threads", type=int, default=32, help="Worker threads (default 32)")
+
+    def handle(self, *args, **options):
+        attempts, threads = options["attempts"], max(options["threads"], 1)
+        limit = LoginUsernameThrottle().limit
+        if attempts <= limit:
+            raise CommandError(f"--attempts must exceed the login_username limit ({limit})")
+        throttle = LoginUsernameThrottle()
+        for _ in range(2):
+            window = int(time.time() // throttle.window)
+            admitted = self._race(attempts, threads)
+            # A run that straddles a window boundary may admit two windows' worth; retry it
+            if int(time.time() // throttle.window) == window:
+                break
+
+        self.stdout.write(f"{attempts} concurrent attempts, limit {limit}: {admitted} admitted")
+        if admitted != limit:
+            raise CommandError(f"Expected {limit} admitted, got {admitted}")
+
+    def _race(self, attempts, threads) -> int:
+        request = SimpleNamespace(data={"username": f"throttle-check-{secrets.token_hex(4)}"})
+        # Release the first wave of threads at once so they race on the same counter
+        barrier = threading.Barrier(threads)
+
+        def attempt(i):
+            if i < threads:
+                barrier.wait()
+            return LoginUsernameThrottle().allow_request(request, None)
+
+        with ThreadPoolExecutor(threads) as executor:
+            return sum(executor.map(attempt, range(attempts)))
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from apps.models_app.user import CustomUser
+
+from ...summary import refresh
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute UserDashboardSummary rows from the source tables, repairing any "
+        "drift from writes that bypassed the model signals (bulk updates, raw SQL)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, action="append", help="Only rebuild this user id (repeatable)")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Users per batch (default 1000)")
+
+    def handle(self, *args, **options):
+        user_ids = options["user"] or CustomUser.objects.order_by("pk").values_list("pk", flat=True).iterator()
+        size = max(options["batch_size"], 1)
+        batch, written = [], 0
+        for user_id in user_ids:
+            batch.append(user_id)
+            if len(batch) >= size:
+                written += refresh(batch)
+                batch = []
+        if batch:
+            written += refresh(batch)
+        self.stdout.write(f"Rebuilt {written} dashboard summaries")
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...revenue import differences, rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare RevenueDaily with totals recomputed from Transaction and report the "
+        "keys that drifted. With --fix, rebuild the affected days; otherwise exit "
+        "non-zero when anything differs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=date.fromisoformat, help="First day, YYYY-MM-DD (default: earliest)")
+        parser.add_argument("--end", type=date.fromisoformat, help="Last day, YYYY-MM-DD (default: latest)")
+        parser.add_argument("--fix", action="store_true", help="Rebuild the days that differ")
+
+    def handle(self, *args, **options):
+        drift = differences(options["start"], options["end"])
+        for key, (raw, rolled) in sorted(drift.items(), key=lambda item: str(item[0])):
+            day, currency, plan_id, transaction_type, status = key
+            self.stdout.write(
+                f"{day} {currency} plan={plan_id} {transaction_type}/{status}: "
+                f"transactions {raw[0]} ({raw[1]}) rollup {rolled[0]} ({rolled[1]})"
+            )
+        if not drift:
+            self.stdout.write("Revenue rollup matches transactions")
+            return
+        days = {key[0] for key in drift}
+        if not options["fix"]:
+            raise CommandError(f"{len(drift)} rollup key(s) differ across {len(days)} day(s); rerun with --fix")
+        written = rebuild(min(days), max(days), days=days)
+        self.stdout.write(f"Rebuilt {len(days)} day(s), {written} rollup rows")
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import math
+import secrets
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
+
+from apps.models_app.crop_variety import Crop, CropVariety
+from apps.models_app.farm import Farm
+from apps.models_app.feature import Feature, FeatureType
+from apps.models_app.feature_plan import PlanFeature
+from apps.models_app.field import CropLifecycleDates, Field, FieldIrrigationMethod, FieldIrrigationPractice
+from apps.models_app.irrigation import IrrigationMethods
+from apps.models_app.models import UserActivity
+from apps.models_app.notifications import Notification
+from apps.models_app.plan import Plan
+from apps.models_app.soil_report import SoilTexture
+from apps.models_app.user import CustomUser, Role, UserRole
+from apps.models_app.user_plan import Transaction, UserPlan
+
+from .. import revenue
+from ..roles import sync_role_masks
+
+
+def seed_dataset(rows: int) -> dict[str, CustomUser]:
+    """Create ``rows`` users, fields, practices, transactions and notifications.
+
+    Names carry a random tag so the data can sit next to real rows; callers
+    run inside a transaction they roll back. Returns the seeded ``admin``
+    (SuperAdmin) and ``owner`` (End-App-User) callers.
+    """
+    tag = secrets.token_hex(3)
+    today = date.today()
+    now = timezone.now()
+
+    admin_role, _ = Role.objects.get_or_create(name="SuperAdmin")
+    user_role, _ = Role.objects.get_or_create(name="End-App-User")
+    admin = CustomUser.objects.create_user(f"qb-admin-{tag}", is_staff=True, is_superuser=True)
+    owner = CustomUser.objects.create_user(f"qb-owner-{tag}")
+    UserRole.objects.create(user=admin, role=admin_role)
+    UserRole.objects.create(user=owner, role=user_role)
+
+    users = CustomUser.objects.bulk_create(
+        CustomUser(username=f"qb-{tag}-{i}", email=f"qb-{tag}-{i}@agriplatform.com") for i in range(rows)
+    )
+    UserRole.objects.bulk_create(UserRole(user=u, role=user_role) for u in users)
+    # bulk_create skips the signals that keep role_mask current
+    sync_role_masks([u.pk for u in users])
+    user_ct = ContentType.objects.get_for_model(CustomUser)
+    UserActivity.objects.bulk_create(
+        UserActivity(user=admin, action="create", content_type=user_ct, object_id=u.pk) for u in users
+    )
+
+    crop = Crop.objects.create(name=f"qb-crop-{tag}")
+    variety = CropVariety.objects.create(crop=crop, name="qb")
+    texture = SoilTexture.objects.create(name=f"qb-soil-{tag}", icon="https://example.com/soil.png")
+    method = IrrigationMethods.objects.create(name=f"qb-drip-{tag}")
+    farm = Farm.objects.create(name="qb", user=owner)
+    fields = Field.objects.bulk_create(
+        Field(
+            name=f"qb-{i}", farm=farm, user=owner, crop=crop, crop_variety=variety,
+            soil_type=texture, area={"hectares": 1.5}, boundary=_boundary(i),
+        )
+        for i in range(rows)
+    )
+    FieldIrrigationMethod.objects.bulk_create(FieldIrrigationMethod(field=f, irrigation_method=method) for f in fields)
+    CropLifecycleDates.objects.bulk_create(CropLifecycleDates(field=f, sowing_date=today) for f in fields)
+    FieldIrrigationPractice.objects.bulk_create(
+        FieldIrrigationPractice(field=f, irrigation_method=method, notes="qb") for f in fields
+    )
+
+    feature_type = FeatureType.objects.create(name=f"qb-type-{tag}")
+    features = Feature.objects.bulk_create(
+        Feature(name=f"qb-feature-{tag}-{i}", feature_type=feature_type) for i in range(3)
+    )
+    plans = Plan.objects.bulk_create(
+        Plan(name=f"qb-plan-{tag}-{i}", price=Decimal("10.00"), duration=30) for i in range(3)
+    )
+    PlanFeature.objects.bulk_create(
+        PlanFeature(plan=p, feature=f, max_count=1, duration_days=30) for p in plans for f in features
+    )
+    UserPlan.objects.create(
+        user=owner, plan=plans[0], start_date=today, end_date=today + timedelta(days=30),
+        expire_at=now + timedelta(days=30),
+    )
+    Transaction.objects.bulk_create(
+        Transaction(user=owner, plan=plans[i % len(plans)], amount=Decimal("10.00")) for i in range(rows)
+    )
+    # bulk_create skips the rollup signals
+    revenue.rebuild(timezone.localdate(), timezone.localdate())
+    Notification.objects.bulk_create(
+        Notification(sender=admin, receiver=users[i], message="qb") for i in range(rows)
+    )
+
+    return {"admin": admin, "owner": owner}
+
+
+def _boundary(i: int, points: int = 24) -> dict:
+    # GeoJSON polygon shaped like the ones the map editor saves
+    lng, lat = 78.0 + (i % 100) * 0.01, 17.0 + (i // 100) * 0.01
+    ring = [
+        [round(lng + 0.002 * math.cos(2 * math.pi * k / points), 6), round(lat + 0.002 * math.sin(2 * math.pi * k / points), 6)]
+        for k in range(points)
+    ]
+    return {"type": "Polygon", "coordinates": [ring + ring[:1]]}
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .querycount import QueryRecorder, route_name
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetMiddleware:
+    """Report per-request SQL cost in response headers when ``QUERY_INSTRUMENTATION`` is on.
+
+    Headers: ``X-DB-Route``, ``X-DB-Queries``, ``X-DB-Time-Ms`` and
+    ``X-DB-Repeated`` (statements run more than once, the usual N+1 sign).
+    Routes that exceed their entry in the query budget file are logged.
+
+    Async capable so a sync-only middleware does not push ASGI requests
+    (``AsyncLoginView``) back onto a worker thread. Under ASGI the queries
+    run on other threads than this middleware, so requests pass through
+    uncounted there; ``check_query_budgets`` measures over WSGI.
+    """
+
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        self.enabled = getattr(settings, "QUERY_INSTRUMENTATION", settings.DEBUG)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.get_response(request)
+        if not self.enabled:
+            return self.get_response(request)
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        route = route_name(request)
+        response["X-DB-Route"] = route
+        response["X-DB-Queries"] = str(recorder.count)
+        response["X-DB-Time-Ms"] = str(recorder.duration_ms)
+        response["X-DB-Repeated"] = str(sum(n - 1 for n in recorder.repeated().values()))
+        budget = load_budgets().get(route)
+        if budget is not None and recorder.count > budget["max_queries"]:
+            logger.warning("%s ran %d queries (budget %d)", route, recorder.count, budget["max_queries"])
+        return response
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoise that also runs natively under ASGI (the stock middleware is sync only)."""
+
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs) -> None:
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+_budgets: dict | None = None
+
+
+def load_budgets() -> dict:
+    """Route -> budget entry from ``QUERY_BUDGET_FILE``, read once per process."""
+    global _budgets
+    if _budgets is None:
+        with open(settings.QUERY_BUDGET_FILE) as fh:
+            _budgets = json.load(fh)["routes"]
+    return _budgets
@@ -1,7 +1,184 @@
+from __future__ import annotations
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class DefaultPageNumberPagination(PageNumberPagination):
     page_size_query_param = "page_size"
     max_page_size = 100
 
+
+def estimated_count(queryset) -> int | None:
+    """Row estimate for ``queryset`` from the PostgreSQL planner, without counting.
+
+    Returns None on other backends or if the plan cannot be read. The figure
+    comes from table statistics (refreshed by autovacuum / ANALYZE) and is
+    only as good as they are.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+    except DatabaseError:
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class KeysetPagination(DefaultPageNumberPagination):
+    """Cursor pagination keyed on ``keyset`` (``created_at``, ``id`` by default).
+
+    Pages are fetched with ``WHERE (created_at, id) < (...) ORDER BY created_at
+    DESC, id DESC LIMIT n``, so they cost the same at any depth and need no
+    COUNT(*). Clients opt in by sending ``?cursor=`` (empty for the first page)
+    and following ``next`` / ``previous``; without it the endpoint keeps
+    page-number pagination. The keyset fixes the order, so ``?ordering=`` is
+    ignored in cursor mode. ``?count=estimate`` adds ``count_estimate`` from
+    planner statistics (PostgreSQL only, null elsewhere).
+
+    Each model paginated this way needs an index matching its filter and the
+    keyset, e.g. ``(receiver, created_at, id)``.
+    """
+
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    keyset: tuple[str, ...] = ("-created_at", "-id")
+
+    def uses_keyset(self, request) -> bool:
+        return self.cursor_query_param in request.query_params
+
+    def row_keys(self, request) -> tuple[str, ...]:
+        """Columns ``values_list()`` rows must end with so cursors can be built from them."""
+        return tuple(key.lstrip("-") for key in self.keyset) if self.uses_keyset(request) else ()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.uses_keyset(request)
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        size = self.get_page_size(request)
+        position, backwards = self._decode_cursor(request, queryset.model)
+        fields = [key.lstrip("-") for key in self.keyset]
+        descending = self.keyset[0].startswith("-") != backwards
+
+        page = queryset.order_by(*[("-" if descending else "") + name for name in fields])
+        if position is not None:
+            page = page.filter(_after(fields, position, descending))
+        rows = list(page[: size + 1])
+        has_more = len(rows) > size
+        rows = rows[:size]
+        if backwards:
+            rows.reverse()
+
+        # Moving forwards there is a previous page whenever we started from a cursor;
+        # moving backwards there is always a next page (the one we came from)
+        has_next = has_more if not backwards else position is not None
+        has_previous = has_more if backwards else position is not None
+        self.next_position = self._position(rows[-1], fields) if rows and has_next else None
+        self.previous_position = self._position(rows[0], fields) if rows and has_previous else None
+        self.count_estimate = (
+            estimated_count(queryset) if request.query_params.get(self.count_query_param) == "estimate" else None
+        )
+        return rows
+
+    def get_paginated_response(self, data):
+        if not getattr(self, "cursor_mode", False):
+            return super().get_paginated_response(data)
+        body = OrderedDict([("next", self.get_next_link()), ("previous", self.get_previous_link())])
+        if self.request.query_params.get(self.count_query_param) == "estimate":
+            body["count_estimate"] = self.count_estimate
+        body["results"] = data
+        return Response(body)
+
+    def get_next_link(self):
+        if not getattr(self, "cursor_mode", False):
+            return super().get_next_link()
+        return self._link(self.next_position, backwards=False)
+
+    def get_previous_link(self):
+        if not getattr(self, "cursor_mode", False):
+            return super().get_previous_link()
+        return self._link(self.previous_position, backwards=True)
+
+    def _link(self, position, backwards: bool):
+        if position is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        payload = json.dumps({"p": position, "r": int(backwards)}, separators=(",", ":"), default=str)
+        return replace_query_param(url, self.cursor_query_param, urlsafe_b64encode(payload.encode()).decode())
+
+    def _decode_cursor(self, request, model):
+        raw = request.query_params.get(self.cursor_query_param) or ""
+        if not raw:
+            return None, False
+        try:
+            payload = json.loads(urlsafe_b64decode(raw.encode()))
+            names = [key.lstrip("-") for key in self.keyset]
+            if len(payload["p"]) != len(names):
+                raise ValueError
+            position = [model._meta.get_field(name).to_python(value) for name, value in zip(names, payload["p"])]
+            return position, bool(payload.get("r"))
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound("Invalid cursor")
+
+    def _position(self, row, fields):
+        # Model instances, or values_list() rows ending with row_keys()
+        if isinstance(row, tuple):
+            return list(row[-len(fields):])
+        return [getattr(row, name) for name in fields]
+
+    def get_paginated_response_schema(self, schema):
+        response = super().get_paginated_response_schema(schema)
+        response["properties"]["count_estimate"] = {"type": "integer", "nullable": True}
+        return response
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Keyset cursor; send it empty for the first page, then follow next/previous.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "`estimate` adds an approximate total from planner statistics (cursor mode).",
+                "schema": {"type": "string", "enum": ["estimate"]},
+            },
+        ]
+
+
+def _after(fields, position, descending: bool) -> Q:
+    """Rows strictly past ``position`` in keyset order (a row-value comparison)."""
+    op = "lt" if descending else "gt"
+    condition = Q(**{f"{fields[-1]}__{op}": position[-1]})
+    for name, value in zip(reversed(fields[:-1]), reversed(position[:-1])):
+        condition = Q(**{f"{name}__{op}": value}) | (Q(**{name: value}) & condition)
+    return condition
+
+
+class CreatedAtCursorPagination(KeysetPagination):
+    keyset = ("-created_at", "-id")
+
+
+class DateJoinedCursorPagination(KeysetPagination):
+    keyset = ("-date_joined", "-id")
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+from .policy import ENDPOINT_MASKS, mask_for
+from .roles import role_mask
+
 
 class IsOwnerOrReadOnly(BasePermission):
     def has_object_permission(self, request, view, obj) -> bool:
@@ -12,16 +15,23 @@ class IsOwnerOrReadOnly(BasePermission):
 
 
 class HasRole(BasePermission):
+    """Allow users holding any role granted by the view's ``permission_policy``.
+
+    Policies are compiled to bitmasks at startup, so the check is a single
+    AND against the user's role mask. A plain ``required_roles`` list on the
+    view is still honoured.
+    """
+
     required_roles: list[str] = []
 
     def has_permission(self, request, view) -> bool:
-        # Allow views to specify required roles via attribute on the view
-        view_required_roles = getattr(view, "required_roles", None)
-        required_roles = view_required_roles if view_required_roles is not None else self.required_roles
-        if not required_roles:
-            return True
-        user_roles = set(
-            request.user.user_roles.select_related("role").values_list("role__name", flat=True)
-        )
-        return any(role in user_roles for role in required_roles) or request.user.is_staff
-
+        policy = getattr(view, "permission_policy", None)
+        if policy is not None:
+            required = ENDPOINT_MASKS[policy]
+        else:
+            view_required_roles = getattr(view, "required_roles", None)
+            required_roles = view_required_roles if view_required_roles is not None else self.required_roles
+            if not required_roles:
+                return True
+            required = mask_for(required_roles)
+        return bool(role_mask(request.user) & required) or request.user.is_staff
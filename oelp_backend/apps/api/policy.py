@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from types import MappingProxyType
+
+from django.core.exceptions import ImproperlyConfigured
+
+from apps.models_app.user import ROLE_BITS
+
+# Roles allowed per protected endpoint; views refer to entries via ``permission_policy``.
+# Django staff pass every check regardless of roles (see HasRole).
+POLICY = {
+    "admin-users": ("SuperAdmin", "Admin", "Analyst", "Business", "Developer"),
+    "users-readonly": ("SuperAdmin", "Admin", "Agronomist", "Analyst", "Business", "Developer", "Support"),
+    "admin-roles": ("SuperAdmin", "Admin", "Business", "Developer"),
+    "admin-notifications": ("SuperAdmin", "Admin", "Support", "Business", "Developer", "Analyst"),
+    "admin-fields": ("SuperAdmin", "Admin", "Analyst", "Agronomist", "Business", "Developer"),
+    "admin-analytics": ("SuperAdmin", "Admin", "Analyst", "Business", "Developer"),
+    "plan-features": ("SuperAdmin", "Admin", "Business", "Developer"),
+    "permission-matrix": ("SuperAdmin", "Admin", "Developer"),
+    "session-revoke": ("SuperAdmin", "Admin"),
+    # Platform-wide data on the dashboard, analytics summary and exports
+    "privileged-data": ("SuperAdmin", "Admin", "Agronomist", "Analyst", "Business", "Developer"),
+}
+
+# Roles notified of a new support request per category; the first is stored as its
+# assigned_role. SuperAdmin is never routed to.
+SUPPORT_ROUTING = {
+    "transaction": ("Business", "Support", "Admin"),
+    "analysis": ("Analyst", "Support", "Admin"),
+    "software_issue": ("Developer", "Support", "Admin"),
+    "crop": ("Agronomist", "Support", "Admin"),
+}
+SUPPORT_FALLBACK = ("Support", "Admin")
+
+
+def mask_for(roles) -> int:
+    """OR together the bits of ``roles``; names without a bit grant nothing."""
+    mask = 0
+    for name in roles:
+        mask |= ROLE_BITS.get(name, 0)
+    return mask
+
+
+def compile_policy(policy: dict) -> MappingProxyType:
+    compiled = {}
+    for key, roles in policy.items():
+        unknown = sorted(set(roles) - set(ROLE_BITS))
+        if unknown:
+            raise ImproperlyConfigured(f"Permission policy {key!r} names unknown roles: {', '.join(unknown)}")
+        compiled[key] = mask_for(roles)
+    return MappingProxyType(compiled)
+
+
+ENDPOINT_MASKS = compile_policy(POLICY)
+# Compiled only so a typo in a role name fails at startup instead of notifying nobody
+SUPPORT_MASKS = compile_policy({**SUPPORT_ROUTING, "fallback": SUPPORT_FALLBACK})
+
+
+def support_roles(category) -> tuple[str, ...]:
+    """Roles a support request of ``category`` is routed to, most specific first."""
+    return SUPPORT_ROUTING.get(category, SUPPORT_FALLBACK)
+
+
+def describe_matrix() -> dict:
+    """The compiled matrix in a JSON-friendly shape, for introspection."""
+    return {
+        "roles": dict(ROLE_BITS),
+        "endpoints": {
+            key: {"mask": mask, "roles": [name for name, bit in ROLE_BITS.items() if mask & bit]}
+            for key, mask in ENDPOINT_MASKS.items()
+        },
+    }
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.db import connections
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """Normalize SQL so the same statement with different parameters compares equal."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _IN_LIST.sub("(...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+class QueryRecorder:
+    """Count queries, total SQL time and statement fingerprints on every DB connection.
+
+    Uses ``execute_wrapper`` so it works without ``DEBUG``::
+
+        with QueryRecorder() as rec:
+            client.get("/api/fields/")
+        rec.count, rec.duration_ms, rec.repeated()
+    """
+
+    def __init__(self, aliases=None) -> None:
+        self.aliases = aliases
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints: Counter[str] = Counter()
+        self._stack: ExitStack | None = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def __enter__(self) -> "QueryRecorder":
+        self._stack = ExitStack()
+        for alias in self.aliases or connections:
+            self._stack.enter_context(connections[alias].execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stack.close()
+
+    @property
+    def duration_ms(self) -> float:
+        return round(self.duration * 1000, 2)
+
+    def repeated(self, threshold: int = 2) -> dict[str, int]:
+        """Fingerprints executed at least ``threshold`` times, the usual sign of an N+1."""
+        return {sql: n for sql, n in self.fingerprints.most_common() if n >= threshold}
+
+
+def route_name(request) -> str:
+    """``ViewClass.action`` for the resolved view, e.g. ``FieldViewSet.list``."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return request.path
+    view_class = getattr(match.func, "cls", None) or getattr(match.func, "view_class", None)
+    if view_class is None:
+        return match.view_name or request.path
+    method = request.method.lower()
+    actions = getattr(match.func, "actions", None) or {}
+    return f"{view_class.__name__}.{actions.get(method, method)}"
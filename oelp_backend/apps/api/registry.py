@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.models_app.crop_variety import Crop
+from apps.models_app.feature import FeatureType
+from apps.models_app.irrigation import IrrigationMethods
+from apps.models_app.plan import Plan
+from apps.models_app.soil_report import SoilTexture
+from apps.models_app.user import Role
+
+from .cache import bump_version, get_versions
+
+# Small lookup tables served from memory; keys double as version counter names
+REFERENCE_MODELS = {
+    "role": Role,
+    "irrigation_method": IrrigationMethods,
+    "soil_texture": SoilTexture,
+    "crop": Crop,
+    "feature_type": FeatureType,
+    "plan": Plan,
+}
+_KEY_BY_MODEL = {model: key for key, model in REFERENCE_MODELS.items()}
+
+
+class ReferenceTable:
+    """Immutable snapshot of one lookup table, indexed by id and by name."""
+
+    def __init__(self, model, version: int) -> None:
+        self.model = model
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self._attnames = [f.attname for f in model._meta.concrete_fields]
+        row_type = namedtuple(f"{model.__name__}Row", self._attnames)
+        rows = [row_type(*values) for values in model.objects.order_by("pk").values_list(*self._attnames)]
+        self.rows = tuple(rows)
+        self._by_id = MappingProxyType({row.id: row for row in rows})
+        by_name = {}
+        for row in rows:
+            # Some tables do not enforce unique names; the oldest row wins like .first()
+            by_name.setdefault(str(row.name).lower(), row)
+        self._by_name = MappingProxyType(by_name)
+
+    def get(self, pk):
+        try:
+            return self._by_id.get(int(pk))
+        except (TypeError, ValueError):
+            return None
+
+    def named(self, name: str):
+        """Case-insensitive lookup by ``name``."""
+        return self._by_name.get(str(name).lower()) if name is not None else None
+
+    def instance(self, pk=None, name: Optional[str] = None):
+        """Return a fresh, unshared model instance for the row, or None."""
+        row = self.get(pk) if pk is not None else self.named(name)
+        if row is None:
+            return None
+        return self.model.from_db("default", self._attnames, list(row))
+
+
+class ReferenceRegistry:
+    """Per-worker registry of reference tables.
+
+    Every access compares the snapshot against its change counter (one cache
+    read); writes to the table bump the counter through signals, and
+    ``REFERENCE_REGISTRY_MAX_AGE`` bounds staleness when the cache is not
+    shared between workers.
+    """
+
+    def __init__(self) -> None:
+        self._tables: dict[str, ReferenceTable] = {}
+        self._lock = threading.Lock()
+
+    def table(self, key: str) -> ReferenceTable:
+        (version,) = get_versions(f"reference:{key}")
+        current = self._tables.get(key)
+        max_age = getattr(settings, "REFERENCE_REGISTRY_MAX_AGE", 300)
+        if current is not None and current.version == version and time.monotonic() - current.loaded_at < max_age:
+            return current
+        with self._lock:
+            current = self._tables.get(key)
+            if current is None or current.version != version or time.monotonic() - current.loaded_at >= max_age:
+                current = ReferenceTable(REFERENCE_MODELS[key], version)
+                self._tables[key] = current
+        return current
+
+    def invalidate(self, model) -> None:
+        key = _KEY_BY_MODEL.get(model)
+        if key is None:
+            return
+
+        def _expire():
+            bump_version(f"reference:{key}")
+            self._tables.pop(key, None)
+
+        # Bump after commit so no worker reloads uncommitted rows under the new version
+        transaction.on_commit(_expire)
+
+    def ensure_id(self, key: str, name: str, **defaults) -> int:
+        """Return the id of the row named ``name``, creating the row if needed."""
+        row = self.table(key).named(name)
+        if row is not None:
+            return row.id
+        obj, _ = REFERENCE_MODELS[key].objects.get_or_create(name=name, defaults=defaults)
+        return obj.pk
+
+
+reference = ReferenceRegistry()
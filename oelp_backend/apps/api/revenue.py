@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from apps.models_app.analytics import RevenueDaily
+from apps.models_app.user_plan import Transaction
+
+from .conditional import touch
+
+# Transaction columns that decide a rollup row, besides the day
+KEY_FIELDS = ("currency", "plan_id", "transaction_type", "status")
+_CENT = Decimal("0.01")
+
+
+def _amount(value) -> Decimal:
+    # Views assign floats (refunds); the column stores two decimal places
+    return Decimal(str(value or 0)).quantize(_CENT, rounding=ROUND_HALF_UP)
+
+
+def contribution(values: dict) -> tuple[tuple, Decimal] | None:
+    """``(rollup key, amount)`` a transaction with ``values`` adds, None before it has a date."""
+    if values.get("created_at") is None:
+        return None
+    day = timezone.localdate(values["created_at"]) if timezone.is_aware(values["created_at"]) else values["created_at"].date()
+    return (day, *(values[name] for name in KEY_FIELDS)), _amount(values["amount"])
+
+
+def transaction_values(txn: Transaction) -> dict:
+    return {"created_at": txn.created_at, "amount": txn.amount, **{name: getattr(txn, name) for name in KEY_FIELDS}}
+
+
+def stored_values(pk) -> dict | None:
+    """The saved state of transaction ``pk``, before an update overwrites it."""
+    return Transaction.objects.filter(pk=pk).values("created_at", "amount", *KEY_FIELDS).first()
+
+
+def apply(key: tuple, amount: Decimal, count: int) -> None:
+    """Add ``amount`` and ``count`` to the rollup row for ``key``, in the current transaction."""
+    day, currency, plan_id, transaction_type, status = key
+    lookup = {"day": day, "currency": currency, "plan_id": plan_id, "transaction_type": transaction_type, "status": status}
+    updated = RevenueDaily.objects.filter(**lookup).update(amount=F("amount") + amount, count=F("count") + count)
+    if not updated:
+        RevenueDaily.objects.create(amount=amount, count=count, **lookup)
+
+
+def record_change(before: dict | None, after: dict | None) -> None:
+    """Move a transaction's contribution from its ``before`` to its ``after`` state (either may be None)."""
+    old = contribution(before) if before else None
+    new = contribution(after) if after else None
+    if old == new:
+        return
+    touch("revenue")
+    if old is not None:
+        apply(old[0], -old[1], -1)
+    if new is not None:
+        apply(new[0], new[1], 1)
+
+
+def _bounds(start: date | None, end: date | None) -> dict:
+    # Range on the raw timestamp (index friendly) rather than a cast to date
+    lookup = {}
+    if start is not None:
+        lookup["created_at__gte"] = timezone.make_aware(datetime.combine(start, time.min))
+    if end is not None:
+        lookup["created_at__lt"] = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min))
+    return lookup
+
+
+def _days(start: date | None, end: date | None) -> dict:
+    lookup = {}
+    if start is not None:
+        lookup["day__gte"] = start
+    if end is not None:
+        lookup["day__lte"] = end
+    return lookup
+
+
+def raw_totals(start: date | None = None, end: date | None = None) -> dict[tuple, tuple[Decimal, int]]:
+    """``{key: (amount, count)}`` computed from ``Transaction`` itself."""
+    rows = (
+        Transaction.objects.filter(**_bounds(start, end))
+        .annotate(day=TruncDate("created_at"))
+        .values("day", *KEY_FIELDS)
+        .annotate(total=Sum("amount"), n=Count("id"))
+        .order_by()
+    )
+    return {(row["day"], *(row[name] for name in KEY_FIELDS)): (_amount(row["total"]), row["n"]) for row in rows}
+
+
+def rollup_totals(start: date | None = None, end: date | None = None) -> dict[tuple, tuple[Decimal, int]]:
+    """``{key: (amount, count)}`` as recorded in ``RevenueDaily`` (empty keys left out)."""
+    rows = (
+        RevenueDaily.objects.filter(**_days(start, end))
+        .values("day", *KEY_FIELDS)
+        .annotate(total=Sum("amount"), n=Sum("count"))
+        .order_by()
+    )
+    return {
+        (row["day"], *(row[name] for name in KEY_FIELDS)): (_amount(row["total"]), row["n"])
+        for row in rows
+        if row["n"] or row["total"]
+    }
+
+
+def differences(start: date | None = None, end: date | None = None) -> dict[tuple, tuple]:
+    """Keys whose rollup disagrees with the raw rows: ``{key: ((amount, count) raw, rollup)}``."""
+    raw, rolled = raw_totals(start, end), rollup_totals(start, end)
+    zero = (Decimal("0.00"), 0)
+    return {
+        key: (raw.get(key, zero), rolled.get(key, zero))
+        for key in raw.keys() | rolled.keys()
+        if raw.get(key, zero) != rolled.get(key, zero)
+    }
+
+
+def rebuild(start: date | None = None, end: date | None = None, days: set[date] | None = None) -> int:
+    """Replace the rollup rows for a date range (or just ``days``) with fresh totals.
+
+    Runs in one transaction, so readers see either the old or the new rows.
+    Returns the number of rows written.
+    """
+    with transaction.atomic():
+        totals = raw_totals(start, end)
+        stale = RevenueDaily.objects.filter(**_days(start, end))
+        if days is not None:
+            stale = stale.filter(day__in=days)
+            totals = {key: value for key, value in totals.items() if key[0] in days}
+        stale.delete()
+        rows = [
+            RevenueDaily(
+                day=key[0],
+                **dict(zip(KEY_FIELDS, key[1:])),
+                amount=amount,
+                count=count,
+            )
+            for key, (amount, count) in totals.items()
+        ]
+        RevenueDaily.objects.bulk_create(rows, batch_size=1000)
+        touch("revenue")
+    return len(rows)
+
+
+# Series API: bucket sizes, the dimensions a series can be split by (request
+# name -> rollup column) and a cap on points per series
+BUCKETS = ("day", "week", "month")
+GROUPS = {"plan": "plan_id", "currency": "currency", "status": "status", "type": "transaction_type"}
+MAX_SERIES_BUCKETS = 1000
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    """First day of the ``bucket`` containing ``day`` (weeks start on Monday, like ``TruncWeek``)."""
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def bucket_starts(start: date, end: date, bucket: str) -> list[date]:
+    """Every bucket between ``start`` and ``end``, the calendar a series is filled against."""
+    starts, current = [], bucket_start(start, bucket)
+    while current <= end:
+        starts.append(current)
+        if bucket == "month":
+            current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+        else:
+            current += timedelta(days=7 if bucket == "week" else 1)
+    return starts
+
+
+def bucket_count(start: date, end: date, bucket: str) -> int:
+    """``len(bucket_starts(start, end, bucket))`` without building the list."""
+    if bucket == "month":
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    if bucket == "week":
+        return (bucket_start(end, "week") - bucket_start(start, "week")).days // 7 + 1
+    return (end - start).days + 1
+
+
+def year_before(day: date) -> date:
+    """The same date a year earlier; 29 February maps to the 28th."""
+    try:
+        return day.replace(year=day.year - 1)
+    except ValueError:
+        return day.replace(year=day.year - 1, day=28)
+
+
+def _bucket_expression(bucket: str):
+    if bucket == "week":
+        return TruncWeek("day")
+    if bucket == "month":
+        return TruncMonth("day")
+    return F("day")
+
+
+def series(
+    start: date,
+    end: date,
+    bucket: str = "day",
+    group_by: tuple[str, ...] = (),
+    statuses: tuple[str, ...] | None = None,
+    transaction_types: tuple[str, ...] | None = None,
+) -> dict:
+    """Amount and count per ``bucket`` between ``start`` and ``end``, split by ``group_by``.
+
+    Read from ``RevenueDaily`` only: the database sums the rollup rows per
+    bucket and group, so the work grows with days x groups, never with the
+    number of transactions. Each series is returned column-wise, one array
+    per measure aligned with ``buckets``, and buckets without rows hold 0.
+    ``statuses`` / ``transaction_types`` of None mean no filter.
+    """
+    buckets = bucket_starts(start, end, bucket)
+    position = {day: index for index, day in enumerate(buckets)}
+    columns = [GROUPS[name] for name in group_by]
+    if "plan" in group_by:
+        columns.append("plan__name")
+
+    rows = RevenueDaily.objects.filter(day__gte=start, day__lte=end)
+    if statuses is not None:
+        rows = rows.filter(status__in=statuses)
+    if transaction_types is not None:
+        rows = rows.filter(transaction_type__in=transaction_types)
+    rows = (
+        rows.annotate(bucket=_bucket_expression(bucket))
+        .values("bucket", *columns)
+        .annotate(total=Sum("amount"), n=Sum("count"))
+        .filter(n__gt=0)
+        .order_by()
+        .values_list("bucket", "total", "n", *columns)
+    )
+
+    # Scatter the grouped rows into zero-filled arrays: one write per returned
+    # row, the empty buckets are already in place
+    amounts: dict[tuple, list[float]] = {}
+    counts: dict[tuple, list[int]] = {}
+    for day, total, n, *key in rows:
+        key = tuple(key)
+        if key not in amounts:
+            amounts[key], counts[key] = [0.0] * len(buckets), [0] * len(buckets)
+        amounts[key][position[day]] = float(_amount(total))
+        counts[key][position[day]] = n
+
+    def label(key: tuple) -> dict:
+        named = dict(zip(group_by, key))
+        if "plan" in group_by:
+            named["plan_name"] = key[-1]
+        return named
+
+    ordered = sorted(amounts, key=lambda key: (-sum(amounts[key]), tuple(str(part) for part in key)))
+    return {
+        "buckets": [day.isoformat() for day in buckets],
+        "series": [{"key": label(key), "amount": amounts[key], "count": counts[key]} for key in ordered],
+        "totals": {
+            "amount": [round(sum(column), 2) for column in zip(*amounts.values())] or [0.0] * len(buckets),
+            "count": [sum(column) for column in zip(*counts.values())] or [0] * len(buckets),
+        },
+    }
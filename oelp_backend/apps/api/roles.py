@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, F, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import GreaterThan
+
+from apps.models_app.user import ROLE_BITS, CustomUser, UserRole
+
+from .cache import bump_version, get_versions
+from .policy import ENDPOINT_MASKS, mask_for
+
+ROLE_CACHE_TTL = getattr(settings, "ROLE_CACHE_TTL", 300)
+
+# User segments over CustomUser.role_mask; "employees" are the staff roles below admin
+END_USER_BIT = ROLE_BITS["End-App-User"]
+EMPLOYEE_ROLES = ("Analyst", "Agronomist", "Support", "Business", "Developer")
+
+
+def role_names(user, refresh: bool = False) -> tuple[str, ...]:
+    """Return the user's role names in assignment order.
+
+    The result is memoized on the user instance for the rest of the request
+    and shared across requests through the cache, keyed by a version counter
+    that ``UserRole``/``Role`` writes bump.
+    """
+    if user is None or not getattr(user, "pk", None):
+        return ()
+    if not refresh:
+        memo = getattr(user, "_role_names", None)
+        if memo is not None:
+            return memo
+    global_version, user_version = get_versions("roles", f"roles:{user.pk}")
+    key = f"roles:{user.pk}:{global_version}.{user_version}"
+    names = cache.get(key)
+    if names is None:
+        names = list(
+            UserRole.objects.filter(user_id=user.pk).order_by("id").values_list("role__name", flat=True)
+        )
+        cache.set(key, names, ROLE_CACHE_TTL)
+    result = tuple(names)
+    user._role_names = result
+    user._role_mask = mask_for(result)
+    return result
+
+
+def role_mask(user) -> int:
+    """Bitmask of the user's roles (see ``ROLE_BITS``), memoized like ``role_names``."""
+    mask = getattr(user, "_role_mask", None)
+    if mask is None:
+        mask = mask_for(role_names(user))
+        if getattr(user, "pk", None):
+            user._role_mask = mask
+    return mask
+
+
+def has_any_role(user, roles) -> bool:
+    return bool(role_mask(user) & mask_for(roles))
+
+
+def is_super_admin(user) -> bool:
+    return bool(user.is_superuser or role_mask(user) & ROLE_BITS["SuperAdmin"])
+
+
+def is_privileged(user) -> bool:
+    return bool(user.is_superuser or role_mask(user) & ENDPOINT_MASKS["privileged-data"])
+
+
+def invalidate_roles(user_id=None) -> None:
+    """Expire cached roles for one user, or for everyone when ``user_id`` is None."""
+    bump_version("roles" if user_id is None else f"roles:{user_id}")
+
+
+def sync_role_masks(user_ids=None) -> int:
+    """Recompute ``CustomUser.role_mask`` from ``UserRole`` in one UPDATE.
+
+    Covers ``user_ids`` (ids or a values queryset), or every user when None.
+    Each role is held at most once per user, so summing the bits gives their OR.
+    """
+    bit = Case(
+        *(When(role__name=name, then=Value(value)) for name, value in ROLE_BITS.items()),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    held = UserRole.objects.filter(user=OuterRef("pk")).order_by().values("user").annotate(mask=Sum(bit)).values("mask")
+    users = CustomUser.objects.all() if user_ids is None else CustomUser.objects.filter(pk__in=user_ids)
+    return users.update(role_mask=Coalesce(Subquery(held), Value(0)))
+
+
+def holds_any(roles) -> Q:
+    """Users holding at least one of ``roles``: a test on ``role_mask``, no join through UserRole.
+
+    A bit AND cannot use an index, so on its own this is a filtered scan of
+    the users table; combine it with an indexed filter where one exists.
+    """
+    return Q(GreaterThan(F("role_mask").bitand(mask_for(roles)), 0))
+
+
+def end_users() -> Q:
+    """Active users whose only known role is End-App-User (served by ``user_end_user_joined_idx``)."""
+    return Q(is_active=True, role_mask=END_USER_BIT)
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
+from datetime import timedelta
+from functools import lru_cache
+
 from django.contrib.auth import password_validation
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import OuterRef, Prefetch, Subquery, Value
+from django.db.models.functions import Coalesce, NullIf
+from django.utils import timezone
 from rest_framework import serializers
 
 from apps.models_app.assets import Asset
@@ -23,8 +30,131 @@ from apps.models_app.user_plan import (
     Transaction,
 )
 
+from .catalog import plan_catalog
+from .encoders import Computed, RowEncoder
+from .hashers import set_password
+from .registry import REFERENCE_MODELS, reference
+from .revenue import BUCKETS, GROUPS, MAX_SERIES_BUCKETS, bucket_count
+from .roles import role_names
+from .summary import PAID_STATUSES
+
+
+class ReferenceRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field for reference tables, validated against the in-memory registry."""
+
+    def __init__(self, table: str, **kwargs):
+        self.table = table
+        if not kwargs.get("read_only"):
+            kwargs.setdefault("queryset", REFERENCE_MODELS[table].objects.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        instance = reference.table(self.table).instance(data)
+        if instance is None:
+            self.fail("does_not_exist", pk_value=data)
+        return instance
+
+
+def reference_name(table: str, pk):
+    row = reference.table(table).get(pk) if pk is not None else None
+    return row.name if row is not None else None
+
+
+def size_acres(area):
+    try:
+        hectares = (area or {}).get("hectares")
+        if isinstance(hectares, (int, float)):
+            return round(float(hectares) * 2.47105, 4)
+    except Exception:
+        pass
+    return None
+
+
+def _query_list(request, name: str) -> list[str]:
+    return [part.strip() for value in request.query_params.getlist(name) for part in value.split(",") if part.strip()]
 
-class UserSerializer(serializers.ModelSerializer):
+
+class SparseModelSerializer(serializers.ModelSerializer):
+    """ModelSerializer that honours ``?fields=a,b`` and ``?omit=c`` on read requests.
+
+    Only the top-level serializer of a GET is trimmed; unrequested fields are
+    dropped before serialization, so their method fields never run. Unknown
+    names are ignored.
+    """
+
+    # Model paths read by fields whose source is not a model field (method fields).
+    # Fields missing here keep querysets un-narrowed; () means "no columns".
+    field_sources: dict[str, tuple[str, ...]] = {}
+
+    @classmethod
+    def selected_fields(cls, request) -> tuple[str, ...] | None:
+        """Field names requested by ``request``, or None when the full representation is wanted."""
+        if request is None or request.method not in ("GET", "HEAD"):
+            return None
+        fields, omit = _query_list(request, "fields"), _query_list(request, "omit")
+        if not fields and not omit:
+            return None
+        names = cls.Meta.fields
+        if fields:
+            names = [name for name in names if name in fields]
+        return tuple(name for name in names if name not in omit)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        parent = self.parent
+        is_root = parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None)
+        selected = self.selected_fields(self.context.get("request")) if is_root else None
+        if selected is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in selected}
+
+    @classmethod
+    def narrow_queryset(cls, queryset, fields):
+        """``only()`` the columns behind ``fields`` and ``select_related()`` just the relations they follow."""
+        plan = _narrowing_plan(cls, tuple(fields))
+        if plan is None:
+            return queryset
+        columns, relations = plan
+        # select_related() with no arguments would follow every foreign key
+        queryset = queryset.select_related(None)
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*columns)
+
+
+@lru_cache(maxsize=256)
+def _narrowing_plan(serializer_class, fields):
+    model = serializer_class.Meta.model
+    declared = serializer_class().fields
+    columns, relations = {model._meta.pk.name}, set()
+    for name in fields:
+        if name in declared and declared[name].write_only:
+            continue
+        if name in serializer_class.field_sources:
+            paths = serializer_class.field_sources[name]
+        elif name in declared and declared[name].source != "*":
+            paths = (declared[name].source.replace(".", "__"),)
+        else:
+            return None
+        for path in paths:
+            head, _, rest = path.partition("__")
+            try:
+                field = model._meta.get_field(head)
+            except Exception:
+                return None
+            if field.many_to_many or field.one_to_many:
+                return None
+            if rest:
+                if not field.is_relation:
+                    return None
+                relations.add(path.rsplit("__", 1)[0])
+            columns.add(path)
+    return tuple(sorted(columns)), tuple(sorted(relations))
+
+
+class UserSerializer(SparseModelSerializer):
     roles = serializers.SerializerMethodField()
     created_by_name = serializers.SerializerMethodField()
     created_by_id = serializers.SerializerMethodField()
@@ -44,54 +174,87 @@ class UserSerializer(serializers.ModelSerializer):
             "created_by_id",
         )
 
+    field_sources = {"roles": (), "created_by_name": (), "created_by_id": ()}
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None):
+        """Resolve roles and creator attribution for a whole page in constant queries.
+
+        ``fields`` (see :meth:`selected_fields`) limits the work to what the response includes.
+        """
+        if fields is None:
+            return cls._prefetch_roles(cls._annotate_creator(queryset))
+        if "roles" in fields:
+            queryset = cls._prefetch_roles(queryset)
+        if "created_by_name" in fields or "created_by_id" in fields:
+            queryset = cls._annotate_creator(queryset)
+        return cls.narrow_queryset(queryset, fields)
+
+    @staticmethod
+    def _prefetch_roles(queryset):
+        return queryset.prefetch_related(
+            Prefetch("user_roles", queryset=UserRole.objects.only("id", "user_id", "role_id").order_by("id"))
+        )
+
+    @staticmethod
+    def _annotate_creator(queryset):
+        ct = ContentType.objects.get_for_model(CustomUser)
+        created = (
+            UserActivity.objects
+            .filter(content_type=ct, object_id=OuterRef("pk"), action="create")
+            .order_by("id")
+        )
+        creator_name = Coalesce(NullIf("user__full_name", Value("")), NullIf("user__username", Value("")))
+        return queryset.annotate(
+            creator_id=Subquery(created.values("user_id")[:1]),
+            creator_name=Subquery(created.annotate(name=creator_name).values("name")[:1]),
+        )
+
     def get_roles(self, obj):
         try:
-            return list(obj.user_roles.select_related("role").values_list("role__name", flat=True))
+            if "user_roles" in getattr(obj, "_prefetched_objects_cache", {}):
+                return [reference_name("role", ur.role_id) for ur in obj.user_roles.all()]
+            return list(role_names(obj))
         except Exception:
             return []
 
+    def _creator(self, obj):
+        if hasattr(obj, "creator_id"):
+            return obj.creator_id, obj.creator_name
+        # Memoize per instance so both creator fields share one query
+        cached = obj.__dict__.get("_creator_cache")
+        if cached is None:
+            cached = (None, None)
+            try:
+                ct = ContentType.objects.get_for_model(obj.__class__)
+                act = (
+                    UserActivity.objects
+                    .filter(content_type=ct, object_id=obj.pk, action__in=["create"])  # created
+                    .order_by("id")
+                    .select_related("user")
+                    .first()
+                )
+                if act and act.user:
+                    cached = (act.user.id, act.user.full_name or act.user.username or None)
+            except Exception:
+                pass
+            obj.__dict__["_creator_cache"] = cached
+        return cached
+
     def get_created_by_name(self, obj):
-        try:
-            from django.contrib.contenttypes.models import ContentType
-            ct = ContentType.objects.get_for_model(obj.__class__)
-            act = (
-                UserActivity.objects
-                .filter(content_type=ct, object_id=obj.pk, action__in=["create"])  # created
-                .order_by("id")
-                .select_related("user")
-                .first()
-            )
-            if act and act.user:
-                return act.user.full_name or act.user.username or None
-        except Exception:
-            pass
-        return None
+        return self._creator(obj)[1]
 
     def get_created_by_id(self, obj):
-        try:
-            from django.contrib.contenttypes.models import ContentType
-            ct = ContentType.objects.get_for_model(obj.__class__)
-            act = (
-                UserActivity.objects
-                .filter(content_type=ct, object_id=obj.pk, action__in=["create"])
-                .order_by("id")
-                .select_related("user")
-                .first()
-            )
-            if act and act.user:
-                return act.user.id
-        except Exception:
-            pass
-        return None
+        return self._creator(obj)[0]
 
 
-class RoleSerializer(serializers.ModelSerializer):
+class RoleSerializer(SparseModelSerializer):
     class Meta:
         model = Role
         fields = ("id", "name", "description")
 
 
-class UserRoleSerializer(serializers.ModelSerializer):
+class UserRoleSerializer(SparseModelSerializer):
     user_username = serializers.CharField(source="user.username", read_only=True)
     role_name = serializers.CharField(source="role.name", read_only=True)
 
@@ -100,7 +263,7 @@ class UserRoleSerializer(serializers.ModelSerializer):
         fields = ("id", "user", "user_username", "role", "role_name", "userrole_id", "assigned_at")
 
 
-class SignUpSerializer(serializers.ModelSerializer):
+class SignUpSerializer(SparseModelSerializer):
     password = serializers.CharField(write_only=True)
     # Enforce required user fields per product requirements
     username = serializers.CharField(required=True, allow_blank=False)
@@ -117,8 +280,10 @@ class SignUpSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         password = validated_data.pop("password")
-        user = CustomUser.objects.create_user(**validated_data)
-        user.set_password(password)
+        user = CustomUser(**validated_data)
+        # create_user() would hash on the request thread; hash on the pool instead
+        set_password(user, password)
+        user.email = CustomUser.objects.normalize_email(user.email or f"{user.username}@agriplatform.com")
         user.save()
         return user
 
@@ -128,19 +293,69 @@ class LoginSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True)
 
 
-class TokenSerializer(serializers.ModelSerializer):
+def _comma_list(value: str) -> tuple[str, ...]:
+    return tuple(dict.fromkeys(part.strip() for part in value.split(",") if part.strip()))
+
+
+class RevenueSeriesQuerySerializer(serializers.Serializer):
+    """Query parameters of the revenue series endpoint.
+
+    ``group_by``, ``status`` and ``type`` take comma separated values;
+    ``status=paid`` (the default) means the paid statuses and ``all`` drops
+    the filter. Without dates the last 30 days are returned.
+    """
+
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    bucket = serializers.ChoiceField(choices=BUCKETS, default="day")
+    group_by = serializers.CharField(required=False, allow_blank=True, default="")
+    status = serializers.CharField(required=False, default="paid")
+    type = serializers.CharField(required=False, allow_blank=True, default="")
+    compare = serializers.ChoiceField(choices=["previous_year"], required=False)
+
+    def validate_group_by(self, value: str) -> tuple[str, ...]:
+        names = _comma_list(value)
+        unknown = [name for name in names if name not in GROUPS]
+        if unknown:
+            raise serializers.ValidationError(f"Unknown group: {', '.join(unknown)}; use {', '.join(GROUPS)}")
+        return names
+
+    def validate_status(self, value: str) -> tuple[str, ...] | None:
+        if value == "all":
+            return None
+        if value == "paid":
+            return PAID_STATUSES
+        return _comma_list(value)
+
+    def validate_type(self, value: str) -> tuple[str, ...] | None:
+        return _comma_list(value) or None
+
+    def validate(self, attrs):
+        end = attrs.get("end") or timezone.localdate()
+        start = attrs.get("start") or end - timedelta(days=29)
+        if start > end:
+            raise serializers.ValidationError({"start": "start must not be after end"})
+        if bucket_count(start, end, attrs["bucket"]) > MAX_SERIES_BUCKETS:
+            raise serializers.ValidationError(
+                {"bucket": f"At most {MAX_SERIES_BUCKETS} buckets per series; use a wider bucket or a shorter range"}
+            )
+        attrs["start"], attrs["end"] = start, end
+        return attrs
+
+
+class TokenSerializer(SparseModelSerializer):
     class Meta:
         model = UserAuthToken
-        fields = ("access_token", "last_login")
+        fields = ("id", "device", "created_at", "last_login", "last_seen")
 
 
-class CropSerializer(serializers.ModelSerializer):
+class CropSerializer(SparseModelSerializer):
     class Meta:
         model = Crop
         fields = ("id", "name", "icon_url")
 
 
-class CropVarietySerializer(serializers.ModelSerializer):
+class CropVarietySerializer(SparseModelSerializer):
     crop_name = serializers.CharField(source="crop.name", read_only=True)
 
     class Meta:
@@ -148,23 +363,25 @@ class CropVarietySerializer(serializers.ModelSerializer):
         fields = ("id", "crop", "name", "is_primary", "crop_name")
 
 
-class FarmSerializer(serializers.ModelSerializer):
+class FarmSerializer(SparseModelSerializer):
     class Meta:
         model = Farm
         fields = ("id", "name", "user")
         read_only_fields = ("user",)
 
 
-class DeviceSerializer(serializers.ModelSerializer):
+class DeviceSerializer(SparseModelSerializer):
     class Meta:
         model = Device
         fields = ("id", "name", "serial_number")
 
 
-class FieldSerializer(serializers.ModelSerializer):
-    soil_type_name = serializers.CharField(source="soil_type.name", read_only=True)
+class FieldSerializer(SparseModelSerializer):
+    soil_type = ReferenceRelatedField("soil_texture", required=False, allow_null=True)
+    soil_type_name = serializers.SerializerMethodField()
     farm_name = serializers.CharField(source="farm.name", read_only=True)
-    crop_name = serializers.CharField(source="crop.name", read_only=True)
+    crop = ReferenceRelatedField("crop", required=False, allow_null=True)
+    crop_name = serializers.SerializerMethodField()
     crop_variety_name = serializers.CharField(source="crop_variety.name", read_only=True)
     irrigation_method_name = serializers.SerializerMethodField()
     irrigation_method_id = serializers.SerializerMethodField()
@@ -207,74 +424,115 @@ class FieldSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ("user", "created_at", "updated_at", "area")
 
-    def get_irrigation_method_name(self, obj):
+    def get_soil_type_name(self, obj):
+        return reference_name("soil_texture", obj.soil_type_id)
+
+    def get_crop_name(self, obj):
+        return reference_name("crop", obj.crop_id)
+
+    # Latest lifecycle columns exposed as current_* fields
+    _lifecycle_fields = ("sowing_date", "growth_start_date", "flowering_date", "harvesting_date")
+
+    field_sources = {
+        "soil_type_name": ("soil_type",),
+        "crop_name": ("crop",),
+        "size_acres": ("area",),
+        "irrigation_method_name": (),
+        "irrigation_method_id": (),
+        **{f"current_{name}": () for name in _lifecycle_fields},
+    }
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None):
+        """Annotate the current irrigation method and latest lifecycle dates onto each row.
+
+        Keeps list pages at a constant number of queries; instances loaded
+        without these annotations fall back to per-object lookups. ``fields``
+        (see :meth:`selected_fields`) skips annotations and columns the
+        response leaves out.
+        """
+        wanted = set(cls.Meta.fields if fields is None else fields)
+        annotations = {}
+        if wanted & {"irrigation_method_name", "irrigation_method_id"}:
+            method = FieldIrrigationMethod.objects.filter(field=OuterRef("pk")).order_by("pk")
+            annotations["current_irrigation_method_id"] = Subquery(method.values("irrigation_method_id")[:1])
+        lifecycle = CropLifecycleDates.objects.filter(field=OuterRef("pk")).order_by("-id")
+        for name in cls._lifecycle_fields:
+            if f"current_{name}" in wanted:
+                annotations[f"current_{name}"] = Subquery(lifecycle.values(name)[:1])
+        queryset = queryset.annotate(**annotations)
+        return queryset if fields is None else cls.narrow_queryset(queryset, fields)
+
+    def _current_method_id(self, obj):
+        if hasattr(obj, "current_irrigation_method_id"):
+            return obj.current_irrigation_method_id
         try:
-            fim = FieldIrrigationMethod.objects.filter(field=obj).select_related("irrigation_method").first()
-            return getattr(getattr(fim, "irrigation_method", None), "name", None)
+            return FieldIrrigationMethod.objects.filter(field=obj).values_list("irrigation_method_id", flat=True).first()
         except Exception:
             return None
 
-    def get_irrigation_method_id(self, obj):
-        try:
-            fim = FieldIrrigationMethod.objects.filter(field=obj).select_related("irrigation_method").first()
-            return getattr(getattr(fim, "irrigation_method", None), "id", None)
-        except Exception:
-            return None
+    def get_irrigation_method_name(self, obj):
+        return reference_name("irrigation_method", self._current_method_id(obj))
 
-    def _latest_lifecycle(self, obj):
-        try:
-            return CropLifecycleDates.objects.filter(field=obj).order_by("-id").first()
-        except Exception:
-            return None
+    def get_irrigation_method_id(self, obj):
+        return self._current_method_id(obj)
+
+    def _lifecycle_value(self, obj, name):
+        attr = f"current_{name}"
+        if hasattr(obj, attr):
+            return getattr(obj, attr)
+        # Memoize per instance so the four date fields share one query
+        cache = obj.__dict__.setdefault("_latest_lifecycle_cache", {})
+        if "row" not in cache:
+            try:
+                cache["row"] = CropLifecycleDates.objects.filter(field=obj).order_by("-id").first()
+            except Exception:
+                cache["row"] = None
+        return getattr(cache["row"], name, None)
 
     def get_current_sowing_date(self, obj):
-        lcd = self._latest_lifecycle(obj)
-        return getattr(lcd, "sowing_date", None)
+        return self._lifecycle_value(obj, "sowing_date")
 
     def get_current_growth_start_date(self, obj):
-        lcd = self._latest_lifecycle(obj)
-        return getattr(lcd, "growth_start_date", None)
+        return self._lifecycle_value(obj, "growth_start_date")
 
     def get_current_flowering_date(self, obj):
-        lcd = self._latest_lifecycle(obj)
-        return getattr(lcd, "flowering_date", None)
+        return self._lifecycle_value(obj, "flowering_date")
 
     def get_current_harvesting_date(self, obj):
-        lcd = self._latest_lifecycle(obj)
-        return getattr(lcd, "harvesting_date", None)
+        return self._lifecycle_value(obj, "harvesting_date")
 
     def get_size_acres(self, obj):
-        try:
-            hectares = (obj.area or {}).get("hectares")
-            if isinstance(hectares, (int, float)):
-                return round(float(hectares) * 2.47105, 4)
-        except Exception:
-            pass
-        return None
+        return size_acres(obj.area)
 
 
-class CropLifecycleDatesSerializer(serializers.ModelSerializer):
+class CropLifecycleDatesSerializer(SparseModelSerializer):
     class Meta:
         model = CropLifecycleDates
         fields = ("id", "field", "sowing_date", "growth_start_date", "flowering_date", "harvesting_date", "yield_amount")
 
 
-class FieldIrrigationMethodSerializer(serializers.ModelSerializer):
+class FieldIrrigationMethodSerializer(SparseModelSerializer):
     class Meta:
         model = FieldIrrigationMethod
         fields = ("id", "field", "irrigation_method")
 
 
-class FieldIrrigationPracticeSerializer(serializers.ModelSerializer):
+class FieldIrrigationPracticeSerializer(SparseModelSerializer):
     field_name = serializers.CharField(source="field.name", read_only=True)
-    method_name = serializers.CharField(source="irrigation_method.name", read_only=True)
-    irrigation_method = serializers.PrimaryKeyRelatedField(queryset=IrrigationMethods.objects.all(), required=False, allow_null=True)
+    method_name = serializers.SerializerMethodField()
+    irrigation_method = ReferenceRelatedField("irrigation_method", required=False, allow_null=True)
     scheduled_time = serializers.DateTimeField(write_only=True, required=False, allow_null=True)
 
     class Meta:
         model = FieldIrrigationPractice
         fields = ("id", "field", "field_name", "irrigation_method", "method_name", "notes", "performed_at", "scheduled_time")
 
+    field_sources = {"method_name": ("irrigation_method",)}
+
+    def get_method_name(self, obj):
+        return reference_name("irrigation_method", obj.irrigation_method_id)
+
     def create(self, validated_data):
         # Map scheduled_time to performed_at if provided
         scheduled = validated_data.pop("scheduled_time", None)
@@ -291,13 +549,13 @@ class FieldIrrigationPracticeSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class SoilTextureSerializer(serializers.ModelSerializer):
+class SoilTextureSerializer(SparseModelSerializer):
     class Meta:
         model = SoilTexture
         fields = ("id", "name", "icon")
 
 
-class SoilReportSerializer(serializers.ModelSerializer):
+class SoilReportSerializer(SparseModelSerializer):
     class Meta:
         model = SoilReport
         fields = (
@@ -318,42 +576,42 @@ class SoilReportSerializer(serializers.ModelSerializer):
         )
 
 
-class IrrigationMethodSerializer(serializers.ModelSerializer):
+class IrrigationMethodSerializer(SparseModelSerializer):
     class Meta:
         model = IrrigationMethods
         fields = ("id", "name")
 
 
-class FeatureTypeSerializer(serializers.ModelSerializer):
+class FeatureTypeSerializer(SparseModelSerializer):
     class Meta:
         model = FeatureType
         fields = ("id", "name", "description", "created_at", "updated_at")
 
 
-class FeatureSerializer(serializers.ModelSerializer):
+class FeatureSerializer(SparseModelSerializer):
     class Meta:
         model = Feature
         fields = ("id", "name", "feature_type", "created_at", "updated_at")
 
 
-class PlanSerializer(serializers.ModelSerializer):
+class PlanSerializer(SparseModelSerializer):
     features = serializers.SerializerMethodField()
 
     class Meta:
         model = Plan
         fields = ("id", "name", "type", "price", "duration", "features")
 
+    field_sources = {"features": ()}
+
     def get_features(self, obj):
-        items = []
-        try:
-            for pf in obj.plan_features.select_related("feature").all():
-                items.append(pf.feature.name)
-        except Exception:
-            pass
-        return items
+        # Feature names come from the plan catalog (or the mapping it passes while building)
+        features = self.context.get("plan_features")
+        if features is None:
+            features = plan_catalog().features
+        return list(features.get(obj.pk, ()))
 
 
-class PlanFeatureSerializer(serializers.ModelSerializer):
+class PlanFeatureSerializer(SparseModelSerializer):
     feature_name = serializers.CharField(source="feature.name", read_only=True)
 
     class Meta:
@@ -370,48 +628,59 @@ class PlanFeatureSerializer(serializers.ModelSerializer):
         )
 
 
-class UserPlanSerializer(serializers.ModelSerializer):
-    plan_name = serializers.CharField(source="plan.name", read_only=True)
-    plan_details = PlanSerializer(source="plan", read_only=True)
+class UserPlanSerializer(SparseModelSerializer):
+    plan_name = serializers.SerializerMethodField()
+    plan_details = serializers.SerializerMethodField()
 
     class Meta:
         model = UserPlan
         fields = ("id", "user", "plan", "plan_name", "plan_details", "start_date", "end_date", "expire_at", "is_active")
 
+    field_sources = {"plan_name": ("plan",), "plan_details": ("plan",)}
+
+    def get_plan_name(self, obj):
+        details = self.get_plan_details(obj)
+        return details["name"] if details else None
+
+    def get_plan_details(self, obj):
+        if obj.plan_id is None:
+            return None
+        return plan_catalog().get(obj.plan_id) or PlanSerializer(obj.plan).data
+
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseModelSerializer):
     class Meta:
         model = Notification
         fields = ("id", "sender", "receiver", "message", "is_read", "created_at")
 
 
-class SupportRequestSerializer(serializers.ModelSerializer):
+class SupportRequestSerializer(SparseModelSerializer):
     class Meta:
         model = SupportRequest
         fields = ("id", "user", "category", "description", "assigned_role", "created_at", "updated_at")
         read_only_fields = ("user", "assigned_role", "created_at", "updated_at")
 
 
-class AssetSerializer(serializers.ModelSerializer):
+class AssetSerializer(SparseModelSerializer):
     class Meta:
         model = Asset
         fields = ("id", "file", "content_type", "object_id", "uploaded_at")
 
 
-class ActivitySerializer(serializers.ModelSerializer):
+class ActivitySerializer(SparseModelSerializer):
     class Meta:
         model = UserActivity
         fields = ("id", "action", "description", "created_at", "object_id")
 
 
-class PaymentMethodSerializer(serializers.ModelSerializer):
+class PaymentMethodSerializer(SparseModelSerializer):
     class Meta:
         model = PaymentMethod
         fields = ("id", "brand", "last4", "exp_month", "exp_year", "is_primary", "created_at", "updated_at")
         read_only_fields = ("created_at", "updated_at")
 
 
-class TransactionSerializer(serializers.ModelSerializer):
+class TransactionSerializer(SparseModelSerializer):
     plan_name = serializers.CharField(source="plan.name", read_only=True)
     user_username = serializers.CharField(source="user.username", read_only=True)
 
@@ -432,3 +701,53 @@ class TransactionSerializer(serializers.ModelSerializer):
             "created_at",
         )
 
+
+# values() fast paths for the large admin/list endpoints (see encoders.FastListMixin)
+
+def _value(value, ctx):
+    return value
+
+
+def _reference_name(table):
+    return lambda pk, ctx: reference_name(table, pk)
+
+
+def _user_roles(rows, columns, fields):
+    if "roles" not in fields:
+        return {}
+    index = columns.index("id")
+    roles: dict = {}
+    links = UserRole.objects.filter(user_id__in=[row[index] for row in rows]).order_by("id")
+    for user_id, role_id in links.values_list("user_id", "role_id"):
+        roles.setdefault(user_id, []).append(reference_name("role", role_id))
+    return {"roles": roles}
+
+
+FIELD_ROW_ENCODER = RowEncoder(
+    FieldSerializer,
+    computed={
+        "soil_type_name": Computed("soil_type_id", convert=_reference_name("soil_texture")),
+        "crop_name": Computed("crop_id", convert=_reference_name("crop")),
+        "irrigation_method_name": Computed("current_irrigation_method_id", convert=_reference_name("irrigation_method")),
+        "irrigation_method_id": Computed("current_irrigation_method_id", convert=_value),
+        "size_acres": Computed("area", convert=lambda area, ctx: size_acres(area)),
+        **{
+            f"current_{name}": Computed(f"current_{name}", convert=_value)
+            for name in FieldSerializer._lifecycle_fields
+        },
+    },
+)
+
+USER_ROW_ENCODER = RowEncoder(
+    UserSerializer,
+    computed={
+        "roles": Computed("id", convert=lambda pk, ctx: ctx["roles"].get(pk, [])),
+        "created_by_name": Computed("creator_name", convert=_value),
+        "created_by_id": Computed("creator_id", convert=_value),
+    },
+    prepare=_user_roles,
+)
+
+NOTIFICATION_ROW_ENCODER = RowEncoder(NotificationSerializer)
+
+TRANSACTION_ROW_ENCODER = RowEncoder(TransactionSerializer)
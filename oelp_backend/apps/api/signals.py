@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from django.core.signals import request_finished
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.models_app.feature import Feature
+from apps.models_app.feature_plan import PlanFeature
+from apps.models_app.field import CropLifecycleDates, Field, FieldIrrigationMethod, FieldIrrigationPractice
+from apps.models_app.models import UserActivity
+from apps.models_app.notifications import Notification
+from apps.models_app.plan import Plan
+from apps.models_app.user import CustomUser, Role, UserRole
+from apps.models_app.user_plan import Transaction, UserPlan
+
+from . import revenue
+from .auth import _last_seen, invalidate_user_tokens
+from .catalog import invalidate_plan_catalog
+from .conditional import touch
+from .registry import REFERENCE_MODELS, reference
+from .roles import invalidate_roles, sync_role_masks
+from .summary import FIELDS, NOTIFICATIONS, PLAN, mark_stale
+
+
+@receiver(request_finished)
+def flush_last_seen(sender, **kwargs):
+    # Session last_seen writes are batched and go out after the response, off the request path
+    _last_seen.flush()
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def drop_cached_user_tokens(sender, instance, **kwargs):
+    # Profile or is_active changes must not be served from the auth cache
+    invalidate_user_tokens(instance.pk)
+
+
+@receiver(post_save, sender=UserRole)
+@receiver(post_delete, sender=UserRole)
+def expire_user_roles(sender, instance, **kwargs):
+    invalidate_roles(instance.user_id)
+
+
+@receiver(post_save, sender=UserRole)
+@receiver(post_delete, sender=UserRole)
+def sync_user_role_mask(sender, instance, raw=False, **kwargs):
+    # Inside the writing transaction, so segment counts never see a half-applied change
+    if not raw:
+        sync_role_masks([instance.user_id])
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def expire_all_roles(sender, instance, **kwargs):
+    # A renamed or removed role changes the cached names of every holder
+    invalidate_roles()
+
+
+@receiver(post_save, sender=Role)
+def sync_role_holder_masks(sender, instance, created, raw=False, **kwargs):
+    # A rename can move holders onto or off a bit; deletions cascade through UserRole
+    if not created and not raw:
+        sync_role_masks(instance.role_users.values("user_id"))
+
+
+def expire_reference_table(sender, instance, **kwargs):
+    reference.invalidate(sender)
+    # Reference names are embedded in field, practice and dashboard payloads
+    touch("reference")
+
+
+# Connected per model: a sender-less receiver would disable fast bulk deletes everywhere
+for _model in REFERENCE_MODELS.values():
+    post_save.connect(expire_reference_table, sender=_model)
+    post_delete.connect(expire_reference_table, sender=_model)
+
+
+@receiver(post_save, sender=Plan)
+@receiver(post_delete, sender=Plan)
+@receiver(post_save, sender=PlanFeature)
+@receiver(post_delete, sender=PlanFeature)
+@receiver(post_save, sender=Feature)
+@receiver(post_delete, sender=Feature)
+def expire_plan_catalog(sender, instance, **kwargs):
+    invalidate_plan_catalog()
+    touch("plans")
+
+
+# Change scopes behind conditional GETs (apps.api.conditional)
+
+@receiver(post_save, sender=Field)
+@receiver(post_delete, sender=Field)
+def touch_field(sender, instance, **kwargs):
+    touch(f"fields:{instance.user_id}", "fields")
+
+
+@receiver(post_save, sender=CropLifecycleDates)
+@receiver(post_delete, sender=CropLifecycleDates)
+@receiver(post_save, sender=FieldIrrigationMethod)
+@receiver(post_delete, sender=FieldIrrigationMethod)
+@receiver(post_save, sender=FieldIrrigationPractice)
+@receiver(post_delete, sender=FieldIrrigationPractice)
+def touch_field_detail(sender, instance, **kwargs):
+    # Lifecycle dates, irrigation method and practices show up in field and dashboard payloads
+    touch(f"fields:{_field_owner(instance)}", "fields")
+
+
+def _field_owner(instance):
+    if type(instance).field.is_cached(instance):
+        return instance.field.user_id
+    return Field.objects.filter(pk=instance.field_id).values_list("user_id", flat=True).first()
+
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def touch_notifications(sender, instance, **kwargs):
+    touch(f"notifications:{instance.receiver_id}")
+
+
+@receiver(post_save, sender=UserPlan)
+@receiver(post_delete, sender=UserPlan)
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+def touch_user_plans(sender, instance, **kwargs):
+    touch(f"plans:{instance.user_id}")
+
+
+@receiver(post_save, sender=UserActivity)
+def touch_activity(sender, instance, created, **kwargs):
+    if created:
+        touch(f"activity:{instance.user_id}")
+
+
+# Dashboard summaries (apps.api.summary)
+
+@receiver(post_save, sender=Field)
+@receiver(post_delete, sender=Field)
+def refresh_summary_fields(sender, instance, **kwargs):
+    mark_stale(instance.user_id, FIELDS)
+
+
+@receiver(post_save, sender=CropLifecycleDates)
+@receiver(post_delete, sender=CropLifecycleDates)
+def refresh_summary_crops(sender, instance, **kwargs):
+    mark_stale(_field_owner(instance), FIELDS)
+
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def refresh_summary_notifications(sender, instance, **kwargs):
+    mark_stale(instance.receiver_id, NOTIFICATIONS)
+
+
+@receiver(post_save, sender=UserPlan)
+@receiver(post_delete, sender=UserPlan)
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+def refresh_summary_plan(sender, instance, **kwargs):
+    # Transactions matter too: the latest successful payment picks the current plan
+    mark_stale(instance.user_id, PLAN)
+
+
+# Daily revenue rollup (apps.api.revenue), applied inside the writing transaction
+
+@receiver(pre_save, sender=Transaction)
+def remember_transaction_state(sender, instance, raw=False, **kwargs):
+    updating = instance.pk is not None and not instance._state.adding and not raw
+    instance._revenue_before = revenue.stored_values(instance.pk) if updating else None
+
+
+@receiver(post_save, sender=Transaction)
+def roll_up_transaction(sender, instance, raw=False, **kwargs):
+    if not raw:
+        revenue.record_change(instance._revenue_before, revenue.transaction_values(instance))
+
+
+@receiver(post_delete, sender=Transaction)
+def roll_back_transaction(sender, instance, **kwargs):
+    revenue.record_change(revenue.transaction_values(instance), None)
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, Count, Exists, OuterRef, Q, Subquery, Sum, When
+from django.utils import timezone
+
+from apps.models_app.dashboard import UserDashboardSummary
+from apps.models_app.field import CropLifecycleDates, Field
+from apps.models_app.notifications import Notification
+from apps.models_app.user import CustomUser
+from apps.models_app.user_plan import Transaction, UserPlan
+
+from .expressions import JSONNumber
+
+logger = logging.getLogger(__name__)
+
+PAID_STATUSES = ("success", "paid", "completed")
+
+# Independently refreshable parts of a summary and the columns each one owns
+FIELDS = "fields"
+NOTIFICATIONS = "notifications"
+PLAN = "plan"
+PART_COLUMNS = {
+    FIELDS: ("active_fields", "active_crops", "total_hectares"),
+    NOTIFICATIONS: ("unread_notifications",),
+    PLAN: ("current_plan_id",),
+}
+
+
+def _field_aggregates() -> dict:
+    growing = CropLifecycleDates.objects.filter(field=OuterRef("pk"), harvesting_date__isnull=True)
+    return {
+        "active_fields": Count("id"),
+        "assigned_crops": Count("id", filter=Q(crop__isnull=False)),
+        "lifecycle_active": Count("id", filter=Q(Exists(growing), crop__isnull=False)),
+        "total_hectares": Sum(JSONNumber("area", "hectares")),
+    }
+
+
+def _field_figures(row: dict) -> dict:
+    # A crop counts as active while its lifecycle has no harvest date, or simply
+    # while one is assigned when that gives more
+    return {
+        "active_fields": row["active_fields"],
+        "active_crops": max(row["lifecycle_active"], row["assigned_crops"]),
+        "total_hectares": row["total_hectares"] or 0.0,
+    }
+
+
+def field_totals(fields) -> dict:
+    """Dashboard field figures over the ``fields`` queryset in one aggregate query."""
+    return _field_figures(fields.aggregate(**_field_aggregates()))
+
+
+def current_plans(user):
+    """Active plans of ``user`` (instance, id or ``OuterRef``), the dashboard's current plan first.
+
+    The plan bought by the most recent successful payment wins, otherwise the
+    most recently created one.
+    """
+    latest_paid_plan = (
+        Transaction.objects
+        .filter(user=OuterRef("user_id"), status__in=PAID_STATUSES, transaction_type="payment")
+        .order_by("-created_at")
+        .values("plan_id")[:1]
+    )
+    return (
+        UserPlan.objects
+        .filter(user=user, is_active=True)
+        .annotate(paid=Case(When(plan_id=Subquery(latest_paid_plan), then=1), default=0))
+        .order_by("-paid", "-created_at")
+    )
+
+
+def _compute(part: str, user_ids: list[int]) -> dict[int, dict]:
+    if part == FIELDS:
+        rows = Field.objects.filter(is_active=True, user_id__in=user_ids).values("user_id").annotate(**_field_aggregates())
+        found = {row["user_id"]: _field_figures(row) for row in rows}
+        empty = {"active_fields": 0, "active_crops": 0, "total_hectares": 0.0}
+        return {uid: found.get(uid, empty) for uid in user_ids}
+    if part == NOTIFICATIONS:
+        rows = (
+            Notification.objects.filter(receiver_id__in=user_ids, is_read=False)
+            .values("receiver_id")
+            .annotate(n=Count("id"))
+            .values_list("receiver_id", "n")
+        )
+        found = dict(rows)
+        return {uid: {"unread_notifications": found.get(uid, 0)} for uid in user_ids}
+    rows = (
+        CustomUser.objects.filter(pk__in=user_ids)
+        .annotate(plan_id=Subquery(current_plans(OuterRef("pk")).values("id")[:1]))
+        .values_list("pk", "plan_id")
+    )
+    return {uid: {"current_plan_id": plan_id} for uid, plan_id in rows}
+
+
+def refresh(user_ids, parts=tuple(PART_COLUMNS)) -> int:
+    """Recompute ``parts`` of the summaries of ``user_ids`` with set-based queries.
+
+    Users without a summary row get every part computed and a row inserted;
+    ids of deleted users are skipped. Returns the number of rows written.
+    """
+    user_ids = list(CustomUser.objects.filter(pk__in=list(user_ids)).values_list("pk", flat=True))
+    if not user_ids:
+        return 0
+    existing = set(UserDashboardSummary.objects.filter(user_id__in=user_ids).values_list("user_id", flat=True))
+    missing = [uid for uid in user_ids if uid not in existing]
+    values: dict[int, dict] = defaultdict(dict)
+    for part in PART_COLUMNS:
+        targets = user_ids if part in parts else missing
+        if targets:
+            for uid, figures in _compute(part, targets).items():
+                values[uid].update(figures)
+
+    now = timezone.now()
+    if missing:
+        UserDashboardSummary.objects.bulk_create(
+            [UserDashboardSummary(user_id=uid, updated_at=now, **values[uid]) for uid in missing],
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=[*(col.removesuffix("_id") for cols in PART_COLUMNS.values() for col in cols), "updated_at"],
+        )
+    stale = [uid for uid in user_ids if uid in existing]
+    if stale:
+        columns = [col.removesuffix("_id") for part in parts for col in PART_COLUMNS[part]]
+        UserDashboardSummary.objects.bulk_update(
+            [UserDashboardSummary(user_id=uid, updated_at=now, **values[uid]) for uid in stale],
+            [*columns, "updated_at"],
+            batch_size=500,
+        )
+    return len(user_ids)
+
+
+_pending = threading.local()
+
+
+def mark_stale(user_id: int | None, *parts: str) -> None:
+    """Refresh ``parts`` of ``user_id``'s summary once the current transaction commits.
+
+    Marks are batched per thread: everything marked before a commit is
+    refreshed together by the first callback to run, so a request that
+    touches many rows still costs a handful of queries.
+    """
+    if user_id is None:
+        return
+    if not hasattr(_pending, "parts"):
+        _pending.parts = defaultdict(set)
+    _pending.parts[user_id].update(parts)
+    transaction.on_commit(_flush)
+
+
+def _flush() -> None:
+    pending = getattr(_pending, "parts", None)
+    if not pending:
+        return
+    _pending.parts = defaultdict(set)
+    groups: dict[frozenset, list[int]] = defaultdict(list)
+    for user_id, parts in pending.items():
+        groups[frozenset(parts)].append(user_id)
+    for parts, user_ids in groups.items():
+        try:
+            refresh(user_ids, tuple(parts))
+        except Exception:
+            # The write itself is committed; rebuild_dashboard_summaries repairs the row
+            logger.exception("Could not refresh dashboard summaries for users %s", user_ids)
+
+
+def summary_for(user) -> UserDashboardSummary:
+    """``user``'s summary with its current plan, built on first use."""
+    queryset = UserDashboardSummary.objects.select_related("current_plan__plan")
+    summary = queryset.filter(pk=user.pk).first()
+    if summary is None:
+        refresh([user.pk])
+        summary = queryset.get(pk=user.pk)
+    return summary
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from celery import shared_task
+
+from . import analytics
+
+
+@shared_task(ignore_result=True)
+def refresh_platform_stats() -> None:
+    """Recompute the admin analytics snapshot (scheduled by beat, queued on stale reads)."""
+    analytics.refresh_platform_stats()
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.models_app.token import UserAuthToken, hash_token
+from apps.models_app.user import CustomUser
+
+from .auth import LastSeenBuffer, _last_seen, invalidate_all_tokens
+
+
+class LastSeenBufferTests(TestCase):
+    def setUp(self):
+        invalidate_all_tokens()
+        self.user = CustomUser.objects.create_user("seen", "pw-Seen-12345")
+        self.raw, self.session = UserAuthToken.issue(self.user, device="test")
+
+    def test_add_never_writes(self):
+        buffer = LastSeenBuffer(interval=3600, max_pending=2)
+        with self.assertNumQueries(0):
+            for i in range(5):
+                buffer.add(hash_token(f"other-{i}"))
+
+    def test_flush_waits_for_threshold(self):
+        buffer = LastSeenBuffer(interval=3600, max_pending=2)
+        buffer.add(self.session.token_digest)
+        with self.assertNumQueries(0):
+            self.assertEqual(buffer.flush(), 0)
+        buffer.add(hash_token("other"))
+        self.assertEqual(buffer.flush(), 1)
+        self.session.refresh_from_db()
+        self.assertIsNotNone(self.session.last_seen)
+
+    def test_threshold_flush_runs_after_the_response(self):
+        _last_seen.flush(force=True)
+        with mock.patch.object(_last_seen, "max_pending", 1), CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/auth/me/", HTTP_AUTHORIZATION=f"Token {self.raw}")
+        self.assertEqual(response.status_code, 200)
+        self.session.refresh_from_db()
+        self.assertIsNotNone(self.session.last_seen)
+        # The view's queries all come first; the write goes out on request_finished
+        sql = [query["sql"] for query in queries.captured_queries]
+        updates = [i for i, statement in enumerate(sql) if statement.startswith("UPDATE") and '"last_seen"' in statement]
+        self.assertEqual(updates, [len(sql) - 1])
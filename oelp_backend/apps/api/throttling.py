@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.db import DatabaseCache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+_PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """``"10/min"`` -> (requests allowed per window, window length in seconds)."""
+    num, period = rate.split("/")
+    return int(num), _PERIODS[period[0]]
+
+
+class FixedWindowThrottle(BaseThrottle):
+    """Request counter per (scope, identity, window) kept in a shared cache.
+
+    Each request is admitted by ``cache.add`` + ``cache.incr`` on the current
+    window's counter (numbered ``add``-only slots on the database cache, whose
+    ``incr`` is not atomic), so concurrent requests from several workers can
+    never get more than the rate's request count through in one window (a
+    read, compute, write bucket would let them all read the same state). Runs in
+    ``APIView.initial()``, i.e. before the view touches the database or
+    hashes a password. Counters live in the ``AUTH_THROTTLE_CACHE`` alias
+    (Redis, the database cache, or per-process memory for local runs and
+    tests); ``manage.py check_throttle_concurrency`` checks the limit holds.
+
+    Windows are aligned to the clock, not to the first request, so a client
+    that spends its whole allowance at the end of one window and again at
+    the start of the next gets up to twice the limit through within one
+    window's length; size a rate by half the burst it must never exceed.
+    """
+
+    scope: Optional[str] = None
+
+    def __init__(self) -> None:
+        self.limit, self.window = parse_rate(api_settings.DEFAULT_THROTTLE_RATES[self.scope])
+        self.cache = caches[getattr(settings, "AUTH_THROTTLE_CACHE", "default")]
+        self._wait: Optional[float] = None
+
+    def get_identity(self, request, view) -> Optional[str]:
+        raise NotImplementedError(".get_identity() must be overridden")
+
+    def allow_request(self, request, view) -> bool:
+        identity = self.get_identity(request, view)
+        if not identity:
+            return True
+        digest = hashlib.sha256(identity.encode()).hexdigest()[:32]
+        now = time.time()
+        window = int(now // self.window)
+        key = f"throttle:{self.scope}:{digest}:{window}"
+        count = self._claim_slot(key) if isinstance(self.cache, DatabaseCache) else self._increment(key)
+        if count > self.limit:
+            self._wait = (window + 1) * self.window - now
+            return False
+        return True
+
+    def _increment(self, key: str) -> int:
+        # Expire with the window (plus slack for clock skew between workers)
+        timeout = self.window + 5
+        self.cache.add(key, 0, timeout)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # Evicted between add and incr: start the window over
+            return 1 if self.cache.add(key, 1, timeout) else self.cache.incr(key)
+
+    def _claim_slot(self, key: str) -> int:
+        # DatabaseCache.incr is a read then a write, but add is a single INSERT on a
+        # unique key: claim numbered slots, starting from a hint that can lag but
+        # never runs ahead, so a full window costs one read per rejected request
+        timeout = self.window + 5
+        for n in range(self.cache.get(key, 0) + 1, self.limit + 1):
+            if self.cache.add(f"{key}:{n}", 1, timeout):
+                self.cache.set(key, n, timeout)
+                return n
+        return self.limit + 1
+
+    def wait(self) -> Optional[float]:
+        return self._wait
+
+
+class IPThrottle(FixedWindowThrottle):
+    def get_identity(self, request, view) -> Optional[str]:
+        return self.get_ident(request)
+
+
+class UsernameThrottle(FixedWindowThrottle):
+    """Buckets per submitted username, so one account cannot be sprayed from many IPs."""
+
+    def get_identity(self, request, view) -> Optional[str]:
+        try:
+            username = request.data.get("username")
+        except Exception:
+            return None
+        return str(username).strip().lower() if username else None
+
+
+class LoginIPThrottle(IPThrottle):
+    scope = "login_ip"
+
+
+class LoginUsernameThrottle(UsernameThrottle):
+    scope = "login_username"
+
+
+class SignUpIPThrottle(IPThrottle):
+    scope = "signup_ip"
+
+
+class PasswordIPThrottle(IPThrottle):
+    scope = "password_ip"
+
+
+class PasswordUsernameThrottle(UsernameThrottle):
+    scope = "password_username"
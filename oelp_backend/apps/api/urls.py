@@ -35,7 +35,9 @@ urlpatterns = [
     path("", lambda r: JsonResponse({"status": "ok"})),
     path("auth/signup/", views.SignUpView.as_view(), name="signup"),
     path("auth/login/", views.LoginView.as_view(), name="login"),
+    path("auth/login/async/", views.AsyncLoginView.as_view(), name="login-async"),
     path("auth/logout/", views.LogoutView.as_view(), name="logout"),
+    path("auth/token/refresh/", views.TokenRefreshView.as_view(), name="token-refresh"),
     path("auth/password/suggest/", views.SuggestPasswordView.as_view(), name="suggest-password"),
     path("auth/password/reset/", views.ResetPasswordView.as_view(), name="reset-password"),
     path("auth/me/", views.MeView.as_view(), name="me"),
@@ -46,10 +48,14 @@ urlpatterns = [
     path("subscriptions/razorpay/success/", views.RazorpayPaymentSuccessView.as_view(), name="razorpay-payment-success"),
     path("subscriptions/razorpay/webhook/", views.RazorpayWebhookView.as_view(), name="razorpay-webhook"),
     path("subscriptions/fake-charge/", views.FakeChargeView.as_view(), name="fake-charge"),
+    path("downloads/sign/", views.DownloadURLView.as_view(), name="download-sign"),
     path("reports/export/csv/", views.ExportCSVView.as_view(), name="export-csv"),
     path("reports/export/pdf/", views.ExportPDFView.as_view(), name="export-pdf"),
     path("analytics/summary/", views.AnalyticsSummaryView.as_view(), name="analytics-summary"),
     path("admin/analytics/", views.AdminAnalyticsView.as_view(), name="admin-analytics"),
+    path("admin/analytics/revenue-series/", views.RevenueSeriesView.as_view(), name="revenue-series"),
+    path("admin/sessions/revoke/", views.SessionRevokeView.as_view(), name="session-revoke"),
+    path("admin/permissions/", views.PermissionMatrixView.as_view(), name="permission-matrix"),
     path("auth/ensure-role/", views.EnsureRoleView.as_view(), name="ensure-role"),
     path("", include(router.urls)),
 ]
@@ -1,28 +1,69 @@
 from __future__ import annotations
 
 import csv
+import hashlib
 import io
+import math
 import os
 import secrets
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from urllib.parse import urlencode
 
 razorpay = None  # type: ignore
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Count, F
-from django.http import HttpResponse
-from rest_framework import mixins, status, viewsets
+from django.db.models import F
+from django.http import HttpResponse, JsonResponse
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.models_app.token import UserAuthToken
 from apps.models_app.user import CustomUser, Role, UserRole
 
-from .auth import TokenAuthentication
+from . import revenue
+from .analytics import cached_field_summary, platform_stats
+from .auth import (
+    TokenAuthentication,
+    invalidate_all_tokens,
+    invalidate_user_tokens,
+    issue_access_token,
+    session_for_token,
+)
+from .backends import PooledModelBackend
+from .catalog import plan_catalog
+from .conditional import ConditionalGetMixin
+from .downloads import DOWNLOAD_RESOURCES, apply_download_cache_headers, resolve_download, sign_download
+from .encoders import FastListMixin
+from .hashers import PasswordHashingBusy, check_password, set_password
+from .pagination import CreatedAtCursorPagination, DateJoinedCursorPagination
 from .permissions import IsOwnerOrReadOnly, HasRole
+from .policy import describe_matrix, support_roles
+from .renderers import FastJSONParser
+from .registry import reference
+from .roles import end_users, holds_any, is_privileged, is_super_admin, role_mask, role_names
+from .summary import field_totals, summary_for
+from .throttling import (
+    LoginIPThrottle,
+    LoginUsernameThrottle,
+    PasswordIPThrottle,
+    PasswordUsernameThrottle,
+    SignUpIPThrottle,
+)
 from .serializers import (
+    FIELD_ROW_ENCODER,
+    NOTIFICATION_ROW_ENCODER,
+    TRANSACTION_ROW_ENCODER,
+    USER_ROW_ENCODER,
     AssetSerializer,
     ActivitySerializer,
     RoleSerializer,
@@ -44,6 +85,7 @@ from .serializers import (
     SupportRequestSerializer,
     TokenSerializer,
     PlanSerializer,
+    RevenueSeriesQuerySerializer,
     UserPlanSerializer,
     IrrigationMethodSerializer,
     PaymentMethodSerializer,
@@ -64,9 +106,42 @@ from apps.models_app.models import UserActivity
 from apps.models_app.soil_report import SoilReport, SoilTexture
 
 
+def access_token_payload(user, session_id=None) -> dict:
+    if not settings.AUTH_JWT_ENABLED:
+        return {}
+    return {"access": issue_access_token(user, session_id), "access_expires_in": settings.JWT_ACCESS_TTL}
+
+
+def open_session(user, request) -> dict:
+    """Start a new device session and return the token payload for the client."""
+    device = request.data.get("device") or request.META.get("HTTP_USER_AGENT") or ""
+    token_value, session = UserAuthToken.issue(user, device=str(device), max_sessions=settings.AUTH_MAX_SESSIONS)
+    return {"token": token_value, **access_token_payload(user, session.pk)}
+
+
+def ensure_end_user_role(user) -> None:
+    # Cached role names make this a no-op for returning users
+    if "End-App-User" in role_names(user):
+        return
+    role_id = reference.ensure_id("role", "End-App-User")
+    _, created = UserRole.objects.get_or_create(user=user, role_id=role_id, defaults={"userrole_id": user.email or user.username})
+    if created:
+        role_names(user, refresh=True)
+
+
+def login_response_data(user, request) -> dict:
+    # Ensure role exists on first login if missing
+    try:
+        ensure_end_user_role(user)
+    except Exception:
+        pass
+    return open_session(user, request)
+
+
 class SignUpView(APIView):
     authentication_classes: list = []
     permission_classes: list = []
+    throttle_classes = [SignUpIPThrottle]
 
     def post(self, request):
         serializer = SignUpSerializer(data=request.data)
@@ -74,18 +149,19 @@ class SignUpView(APIView):
         user = serializer.save()
         # Ensure default role assignment for end users
         try:
-            end_role, _ = Role.objects.get_or_create(name="End-App-User")
-            UserRole.objects.get_or_create(user=user, role=end_role, defaults={"userrole_id": user.email or user.username})
+            ensure_end_user_role(user)
         except Exception:
             pass
-        token_value = secrets.token_urlsafe(48)
-        UserAuthToken.objects.update_or_create(user=user, defaults={"access_token": token_value})
-        return Response({"user": UserSerializer(user).data, "token": token_value}, status=status.HTTP_201_CREATED)
+        return Response(
+            {"user": UserSerializer(user).data, **open_session(user, request)},
+            status=status.HTTP_201_CREATED,
+        )
 
 
 class LoginView(APIView):
     authentication_classes: list = []
     permission_classes: list = []
+    throttle_classes = [LoginIPThrottle, LoginUsernameThrottle]
 
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
@@ -93,25 +169,80 @@ class LoginView(APIView):
         user = authenticate(request, username=serializer.validated_data["username"], password=serializer.validated_data["password"])
         if not user:
             return Response({"detail": "Invalid credentials"}, status=status.HTTP_400_BAD_REQUEST)
-        # Ensure role exists on first login if missing
+        return Response(login_response_data(user, request))
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncLoginView(View):
+    """Login for ASGI deployments.
+
+    The request awaits the hashing pool instead of holding a worker thread,
+    so a burst of logins cannot starve other endpoints.
+    """
+
+    throttle_classes = [LoginIPThrottle, LoginUsernameThrottle]
+
+    async def post(self, request):
+        request = Request(request, parsers=[FastJSONParser(), FormParser(), MultiPartParser()])
+        for throttle in (cls() for cls in self.throttle_classes):
+            # The throttle cache may be the database cache, which is sync only
+            if not await sync_to_async(throttle.allow_request)(request, self):
+                wait = math.ceil(throttle.wait() or 1)
+                return JsonResponse(
+                    {"detail": str(exceptions.Throttled(wait).detail)},
+                    status=status.HTTP_429_TOO_MANY_REQUESTS,
+                    headers={"Retry-After": str(wait)},
+                )
+        serializer = LoginSerializer(data=request.data)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         try:
-            end_role, _ = Role.objects.get_or_create(name="End-App-User")
-            UserRole.objects.get_or_create(user=user, role=end_role, defaults={"userrole_id": user.email or user.username})
-        except Exception:
-            pass
-        token_value = secrets.token_urlsafe(48)
-        UserAuthToken.objects.update_or_create(user=user, defaults={"access_token": token_value})
-        return Response({"token": token_value})
+            user = await PooledModelBackend().aauthenticate(
+                request,
+                username=serializer.validated_data["username"],
+                password=serializer.validated_data["password"],
+            )
+        except PasswordHashingBusy as exc:
+            return JsonResponse(
+                {"detail": str(exc.detail)}, status=exc.status_code, headers={"Retry-After": str(exc.wait)}
+            )
+        if not user:
+            return JsonResponse({"detail": "Invalid credentials"}, status=status.HTTP_400_BAD_REQUEST)
+        return JsonResponse(await sync_to_async(login_response_data)(user, request))
+
+
+class TokenRefreshView(APIView):
+    """Exchange the long-lived DB token for a fresh signed access token."""
+
+    authentication_classes: list = []
+    permission_classes: list = []
+
+    def post(self, request):
+        if not settings.AUTH_JWT_ENABLED:
+            return Response({"detail": "Access tokens are disabled"}, status=status.HTTP_404_NOT_FOUND)
+        refresh = request.data.get("refresh") or request.data.get("token")
+        if not refresh:
+            return Response({"detail": "refresh is required"}, status=status.HTTP_400_BAD_REQUEST)
+        found = session_for_token(str(refresh))
+        if found is None or not found[0].is_active:
+            return Response({"detail": "Invalid token."}, status=status.HTTP_401_UNAUTHORIZED)
+        return Response(access_token_payload(*found))
 
 
 class LogoutView(APIView):
     authentication_classes = [TokenAuthentication]
 
     def post(self, request):
+        # Ends this device's session; {"all": true} signs out everywhere
+        session_id = (request.auth or {}).get("sid")
         try:
-            request.user.auth_token.delete()
+            if session_id is None or str(request.data.get("all", "")).lower() in ("1", "true"):
+                UserAuthToken.revoke(user_ids=[request.user.pk])
+            else:
+                UserAuthToken.objects.filter(pk=session_id, user=request.user).delete()
         except Exception:
             pass
+        invalidate_user_tokens(request.user.pk)
         return Response({"detail": "Logged out"})
 
 
@@ -152,12 +283,12 @@ class ChangePasswordView(APIView):
         if not current_password or not new_password:
             return Response({"detail": "current_password and new_password are required"}, status=status.HTTP_400_BAD_REQUEST)
         user = request.user
-        if not user.check_password(current_password):
+        if not check_password(user, current_password):
             return Response({"detail": "Current password is incorrect"}, status=status.HTTP_400_BAD_REQUEST)
         from django.contrib.auth import password_validation
 
         password_validation.validate_password(new_password, user)
-        user.set_password(new_password)
+        set_password(user, new_password)
         user.save(update_fields=["password"])
         # Record activity in recent activity log
         try:
@@ -177,6 +308,7 @@ class ChangePasswordView(APIView):
 class SuggestPasswordView(APIView):
     authentication_classes: list = []
     permission_classes: list = []
+    throttle_classes = [PasswordIPThrottle]
 
     def get(self, request):
         pw = secrets.token_urlsafe(12)
@@ -191,6 +323,7 @@ class ResetPasswordView(APIView):
     """
     authentication_classes: list = []
     permission_classes: list = []
+    throttle_classes = [PasswordIPThrottle, PasswordUsernameThrottle]
 
     def post(self, request):
         username = request.data.get("username")
@@ -204,12 +337,9 @@ class ResetPasswordView(APIView):
         # Resolve user: prefer authenticated token if present; else username
         user: CustomUser | None = None
         try:
-            auth_header = request.headers.get("Authorization") or ""
-            if auth_header.startswith("Token "):
-                token_value = auth_header.split(" ", 1)[1]
-                token_obj = UserAuthToken.objects.filter(access_token=token_value).select_related("user").first()
-                if token_obj:
-                    user = token_obj.user
+            auth = TokenAuthentication().authenticate(request)
+            if auth is not None:
+                user = auth[0]
         except Exception:
             user = None
         if user is None and username:
@@ -219,7 +349,7 @@ class ResetPasswordView(APIView):
 
         from django.contrib.auth import password_validation
         password_validation.validate_password(new_password, user)
-        user.set_password(new_password)
+        set_password(user, new_password)
         user.save(update_fields=["password"])
         # Record activity
         try:
@@ -230,86 +360,48 @@ class ResetPasswordView(APIView):
         return Response({"detail": "Password reset successfully"})
 
 
-class DashboardView(APIView):
+class DashboardView(ConditionalGetMixin, APIView):
     authentication_classes = [TokenAuthentication]
+    conditional_scopes = ("fields:{user}", "plans:{user}", "notifications:{user}", "activity:{user}", "plans", "reference")
+
+    def get_conditional_scopes(self, request):
+        scopes = super().get_conditional_scopes(request)
+        # Privileged users see totals over every field
+        return scopes + ("fields",) if is_privileged(request.user) else scopes
 
     def get(self, request):
         from django.utils import timezone
 
         user = request.user
-        try:
-            role_names = set(user.user_roles.select_related("role").values_list("role__name", flat=True))
-        except Exception:
-            role_names = set()
-        privileged = user.is_superuser or bool({"SuperAdmin", "Admin", "Agronomist", "Analyst", "Business", "Developer"} & role_names)
+        privileged = is_privileged(user)
 
         base_fields = Field.objects.filter(is_active=True)
         user_fields = base_fields if privileged else base_fields.filter(user=user)
-        active_fields = user_fields.count()
-
-        # Count fields with a crop assigned (considered active until harvested)
-        # Prefer explicit lifecycle harvested flag when available, otherwise count assigned crops
-        lifecycle_active = (
-            CropLifecycleDates.objects
-            .filter(field__in=user_fields, field__crop__isnull=False, harvesting_date__isnull=True)
-            .values("field_id")
-            .distinct()
-            .count()
-        )
-        assigned_crops = user_fields.filter(crop__isnull=False).count()
-        active_crops = max(lifecycle_active, assigned_crops)
-
-        # Total area in hectares summed from JSON field
-        total_hectares = 0.0
-        for f in user_fields:
-            try:
-                hectares = (f.area or {}).get("hectares")
-                if isinstance(hectares, (int, float)):
-                    total_hectares += float(hectares)
-            except Exception:
-                pass
 
-        # Get the most recent active plan that has a successful payment transaction
-        # Prioritize paid plans over Free plans
-        from django.db.models import Max
-        successful_txns = Transaction.objects.filter(
-            user=user, 
-            status__in=["success", "paid", "completed"],
-            transaction_type="payment"
-        ).select_related("plan").order_by("-created_at")
-        
-        current_plan = None
-        if successful_txns.exists():
-            # Get the most recent successful transaction
-            latest_txn = successful_txns.first()
-            if latest_txn and latest_txn.plan:
-                # Find the active UserPlan for this paid plan
-                current_plan = UserPlan.objects.filter(
-                    user=user,
-                    plan=latest_txn.plan,
-                    is_active=True
-                ).select_related("plan").order_by("-created_at").first()
-        
-        # Fallback to any active plan if no paid plan found
-        if not current_plan:
-            plans = UserPlan.objects.filter(user=user, is_active=True).select_related("plan")
-            current_plan = plans.order_by("-created_at").first()
-        notifications_count = Notification.objects.filter(receiver=user, is_read=False).count()
+        # Counters come from the user's summary row (one primary-key read); privileged
+        # users see field totals over the whole platform, aggregated live
+        summary = summary_for(user)
+        totals = field_totals(user_fields) if privileged else {
+            "active_fields": summary.active_fields,
+            "active_crops": summary.active_crops,
+            "total_hectares": summary.total_hectares,
+        }
+        current_plan = summary.current_plan
         recent_practices_qs = (
             FieldIrrigationPractice.objects
             .filter(field__in=user_fields)
-            .select_related("field", "irrigation_method")
+            .select_related("field")
             .order_by("-performed_at")[:3]
         )
         recent_practices = FieldIrrigationPracticeSerializer(recent_practices_qs, many=True).data
         recent_activity = UserActivity.objects.filter(user=user).order_by("-created_at")[:5]
         return Response(
             {
-                "active_fields": active_fields,
-                "active_crops": active_crops,
+                "active_fields": totals["active_fields"],
+                "active_crops": totals["active_crops"],
                 "current_plan": UserPlanSerializer(current_plan).data if current_plan else None,
-                "total_hectares": round(total_hectares, 4),
-                "unread_notifications": notifications_count,
+                "total_hectares": round(totals["total_hectares"], 4),
+                "unread_notifications": summary.unread_notifications,
                 "current_practices": recent_practices,
                 "recent_activity": ActivitySerializer(recent_activity, many=True).data,
             }
@@ -332,15 +424,19 @@ class MenuView(APIView):
         return Response(base_items)
 
 
-class AdminUsersViewSet(viewsets.ModelViewSet):
+class AdminUsersViewSet(FastListMixin, viewsets.ModelViewSet):
     """Admin: manage users and assign roles."""
 
     authentication_classes = [TokenAuthentication]
     permission_classes = [HasRole]
-    required_roles = ["SuperAdmin", "Admin", "Analyst", "Business", "Developer"]
+    permission_policy = "admin-users"
+    row_encoder = USER_ROW_ENCODER
+    pagination_class = DateJoinedCursorPagination
 
     def get_queryset(self):
-        return CustomUser.objects.all().order_by("-date_joined")
+        return UserSerializer.setup_eager_loading(
+            CustomUser.objects.all().order_by("-date_joined"), fields=UserSerializer.selected_fields(self.request)
+        )
 
     def get_serializer_class(self):  # defer import to avoid circular timing
         from .serializers import UserSerializer as _UserSerializer
@@ -374,16 +470,10 @@ class AdminUsersViewSet(viewsets.ModelViewSet):
             return Response({"detail": "role is required"}, status=status.HTTP_400_BAD_REQUEST)
 
         # Determine acting user's roles
-        try:
-            actor_roles = set(
-                request.user.user_roles.select_related("role").values_list("role__name", flat=True)
-            )
-        except Exception:
-            actor_roles = set()
+        actor_roles = role_names(request.user)
 
         # SuperAdmin (or Django superuser) can assign any role
-        is_super_admin = request.user.is_superuser or ("SuperAdmin" in actor_roles)
-        if not is_super_admin:
+        if not is_super_admin(request.user):
             # Admins can assign non-end-user, non-admin, non-superadmin roles only
             if "Admin" in actor_roles:
                 disallowed = {"SuperAdmin", "Admin", "End-App-User"}
@@ -411,14 +501,14 @@ class AdminUsersViewSet(viewsets.ModelViewSet):
                 )
         except Exception:
             pass
-        serializer = self.get_serializer(user)
+        # Re-fetch so preloaded roles and creator reflect the changes above
+        serializer = self.get_serializer(self.get_object())
         return Response(serializer.data)
 
     @action(detail=False, methods=["post"], url_path="create-admin")
     def create_admin(self, request):
         # Only SuperAdmin can create Admin accounts
-        roles = set(request.user.user_roles.select_related("role").values_list("role__name", flat=True))
-        if not (request.user.is_superuser or ("SuperAdmin" in roles)):
+        if not is_super_admin(request.user):
             return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
 
         full_name = request.data.get("full_name") or request.data.get("name")
@@ -442,12 +532,9 @@ class AdminUsersViewSet(viewsets.ModelViewSet):
         email = f"{base_username}@agriplatform.com"
 
         # Create user with normalized username/email and optional phone
-        user = CustomUser.objects.create_user(
-            username=base_username,
-            password=password,
-            full_name=full_name,
-            email=email,
-        )
+        user = CustomUser(username=base_username, full_name=full_name, email=email)
+        set_password(user, password)
+        user.save()
         if phone_number:
             try:
                 user.phone_number = phone_number
@@ -481,20 +568,18 @@ class AdminUsersViewSet(viewsets.ModelViewSet):
     def dedupe_roles(self, request, pk=None):
         # Remove any duplicate End-App-User role for Admin users
         user = self.get_object()
-        roles = set(user.user_roles.select_related("role").values_list("role__name", flat=True))
-        if "Admin" in roles:
+        if "Admin" in role_names(user):
             try:
                 end_role = Role.objects.get(name="End-App-User")
                 UserRole.objects.filter(user=user, role=end_role).delete()
             except Role.DoesNotExist:
                 pass
-        return Response({"roles": list(user.user_roles.select_related("role").values_list("role__name", flat=True))})
+        return Response({"roles": list(role_names(user, refresh=True))})
 
     @action(detail=False, methods=["post"], url_path="dedupe-roles-bulk")
     def dedupe_roles_bulk(self, request):
         """Remove End-App-User role from users who also have other roles. SuperAdmin only."""
-        roles = set(request.user.user_roles.select_related("role").values_list("role__name", flat=True))
-        if not (request.user.is_superuser or ("SuperAdmin" in roles)):
+        if not is_super_admin(request.user):
             return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
 
         try:
@@ -520,20 +605,14 @@ class AdminUsersViewSet(viewsets.ModelViewSet):
 class UsersReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
     authentication_classes = [TokenAuthentication]
     permission_classes = [HasRole]
-    required_roles = ["SuperAdmin", "Admin", "Agronomist", "Analyst", "Business", "Developer", "Support"]
+    permission_policy = "users-readonly"
 
     def get_queryset(self):
-        # Only return pure End-App-Users (exclude users who also have privileged roles)
-        end_user_qs = CustomUser.objects.filter(is_active=True, user_roles__role__name="End-App-User").distinct()
-        privileged_roles = [
-            "SuperAdmin", "Admin", "Analyst", "Business", "Developer", "Support", "Agronomist", "Manager",
-        ]
-        mixed_ids = (
-            CustomUser.objects
-            .filter(id__in=end_user_qs.values_list("id", flat=True), user_roles__role__name__in=privileged_roles)
-            .values_list("id", flat=True)
+        # Only pure End-App-Users (no other role), straight from the role mask column
+        return UserSerializer.setup_eager_loading(
+            CustomUser.objects.filter(end_users()).order_by("-date_joined"),
+            fields=UserSerializer.selected_fields(self.request),
         )
-        return end_user_qs.exclude(id__in=mixed_ids).order_by("-date_joined")
 
     def get_serializer_class(self):
         from .serializers import UserSerializer as _UserSerializer
@@ -542,16 +621,18 @@ class UsersReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
 class AdminRolesViewSet(viewsets.ReadOnlyModelViewSet):
     authentication_classes = [TokenAuthentication]
     permission_classes = [HasRole]
-    required_roles = ["SuperAdmin", "Admin", "Business", "Developer"]
+    permission_policy = "admin-roles"
     queryset = Role.objects.all().order_by("name")
     serializer_class = RoleSerializer
 
 
-class AdminNotificationsViewSet(viewsets.ModelViewSet):
+class AdminNotificationsViewSet(FastListMixin, viewsets.ModelViewSet):
     authentication_classes = [TokenAuthentication]
     permission_classes = [HasRole]
-    required_roles = ["SuperAdmin", "Admin", "Support", "Business", "Developer", "Analyst"]
+    permission_policy = "admin-notifications"
     serializer_class = NotificationSerializer
+    row_encoder = NOTIFICATION_ROW_ENCODER
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
         return (
@@ -621,126 +702,88 @@ class AdminNotificationsViewSet(viewsets.ModelViewSet):
         return Response({"status": "ok"})
 
 
-class AdminFieldViewSet(viewsets.ReadOnlyModelViewSet):
+class AdminFieldViewSet(FastListMixin, viewsets.ReadOnlyModelViewSet):
     authentication_classes = [TokenAuthentication]
     permission_classes = [HasRole]
-    required_roles = ["SuperAdmin", "Admin", "Analyst", "Agronomist", "Business", "Developer"]
-    queryset = Field.objects.select_related("user", "farm", "crop", "crop_variety", "soil_type")
+    permission_policy = "admin-fields"
     serializer_class = FieldSerializer
+    row_encoder = FIELD_ROW_ENCODER
+
+    def get_queryset(self):
+        return FieldSerializer.setup_eager_loading(
+            Field.objects.select_related("farm", "crop_variety"), fields=FieldSerializer.selected_fields(self.request)
+        )
 
 
 class AdminAnalyticsView(APIView):
     authentication_classes = [TokenAuthentication]
     permission_classes = [HasRole]
-    required_roles = ["SuperAdmin", "Admin", "Analyst", "Business", "Developer"]
+    permission_policy = "admin-analytics"
 
     def get(self, request):
-        # Role of requester for UI
-        role_names = list(request.user.user_roles.select_related("role").values_list("role__name", flat=True))
-        # Stats per requirements
-        # Total revenue from transactions
-        try:
-            total_revenue = (
-                Transaction.objects.all().aggregate(total=Count("id"))  # fallback count if no sum
-            )
-        except Exception:
-            total_revenue = {"total": 0}
-        try:
-            from django.db.models import Sum
-
-            revenue_amount = (
-                Transaction.objects.filter(status__in=["success", "paid", "completed"]).aggregate(sum_amt=Sum("amount"))
-            )["sum_amt"] or 0
-        except Exception:
-            revenue_amount = 0
-
-        # Active end-users: users who have ONLY the End-App-User role (no other roles)
-        try:
-            from django.db.models import Q
-            end_user_ids = (
-                CustomUser.objects
-                .filter(is_active=True, user_roles__role__name="End-App-User")
-                .values_list("id", flat=True)
-            )
-            # Exclude anyone who also has any non end-user role
-            privileged_roles = [
-                "SuperAdmin", "Admin", "Analyst", "Business", "Developer", "Support", "Agronomist", "Manager",
-            ]
-            mixed_ids = (
-                CustomUser.objects
-                .filter(id__in=end_user_ids, user_roles__role__name__in=privileged_roles)
-                .values_list("id", flat=True)
-            )
-            active_end_users = (
-                CustomUser.objects.filter(id__in=end_user_ids).exclude(id__in=mixed_ids).distinct().count()
-            )
-        except Exception:
-            active_end_users = 0
-        # Total fields
-        total_fields = Field.objects.count()
-        # Active admins (exclude SuperAdmin)
-        active_admins = (
-            CustomUser.objects.filter(is_active=True, user_roles__role__name="Admin").distinct().count()
-        )
-
-        # Business-centric analytics
-        from django.db.models.functions import TruncDate
-        from django.db.models import Sum
-        last_7_days = datetime.now().date() - timedelta(days=6)
-        revenue_daily_qs = (
-            Transaction.objects.filter(created_at__date__gte=last_7_days, status__in=["success", "paid", "completed"])
-            .annotate(day=TruncDate("created_at"))
-            .values("day")
-            .annotate(amount=Sum("amount"))
-            .order_by("day")
-        )
-        revenue_by_day = [
-            {"name": row["day"].isoformat() if getattr(row.get("day"), "isoformat", None) else str(row.get("day")), "value": float(row["amount"] or 0)}
-            for row in revenue_daily_qs
-        ]
-        # Transactions by status
-        txn_status_counts = (
-            Transaction.objects.values("status").annotate(cnt=Count("id")).order_by("-cnt")
-        )
-        transactions_by_status = [
-            {"name": (row["status"] or "unknown"), "value": row["cnt"]} for row in txn_status_counts
-        ]
-        # Plan distribution (active user plans by plan)
-        plan_counts = (
-            UserPlan.objects.filter(is_active=True).values("plan__name").annotate(cnt=Count("id")).order_by("-cnt")
-        )
-        plan_distribution = [
-            {"name": (row["plan__name"] or "Unknown"), "value": row["cnt"]} for row in plan_counts
-        ]
-
-        # Recent activity for this user
+        # Platform figures come from the precomputed snapshot; only the viewer's part is live
+        snapshot, stale = platform_stats()
         recent_activity = UserActivity.objects.filter(user=request.user).order_by("-created_at")[:6]
-
         return Response(
             {
-                "role_names": role_names,
-                "stats": {
-                    "total_revenue": float(revenue_amount) if revenue_amount is not None else 0,
-                    "active_end_users": active_end_users,
-                    "total_fields": total_fields,
-                    "active_admins": active_admins,
-                    "active_employees": CustomUser.objects.filter(
-                        is_active=True,
-                        user_roles__role__name__in=["Analyst","Agronomist","Support","Business","Developer"],
-                    ).distinct().count(),
-                },
-                "revenue_by_day": revenue_by_day,
-                "transactions_by_status": transactions_by_status,
-                "plan_distribution": plan_distribution,
+                "role_names": list(role_names(request.user)),
+                **snapshot.data,
                 "recent_activity": ActivitySerializer(recent_activity, many=True).data,
+                "computed_at": snapshot.computed_at,
+                "stale": stale,
             }
         )
 
 
+class RevenueSeriesView(ConditionalGetMixin, APIView):
+    """Admin: revenue and transaction counts per day, week or month, optionally split by plan,
+    currency, status or type. ``compare=previous_year`` adds the same range a year earlier."""
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [HasRole]
+    permission_policy = "admin-analytics"
+    # Plan names appear in the grouped series
+    conditional_scopes = ("revenue", "plans")
+
+    def get_conditional_state(self, request):
+        # Without dates the range is "the last 30 days", so the URL alone does not pin
+        # the response: fold the resolved range into the ETag. Bad params skip to the 400
+        params = RevenueSeriesQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return None, None
+        etag, last_ms = super().get_conditional_state(request)
+        if etag is None:
+            return None, None
+        raw = f"{etag}|{params.validated_data['start']}|{params.validated_data['end']}"
+        return f'W/"{hashlib.sha1(raw.encode()).hexdigest()[:24]}"', last_ms
+
+    def get(self, request):
+        params = RevenueSeriesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data
+        options = {
+            "bucket": query["bucket"],
+            "group_by": query["group_by"],
+            "statuses": query["status"],
+            "transaction_types": query["type"],
+        }
+        body = {
+            "start": query["start"],
+            "end": query["end"],
+            "bucket": query["bucket"],
+            "group_by": list(query["group_by"]),
+            **revenue.series(query["start"], query["end"], **options),
+        }
+        if query.get("compare") == "previous_year":
+            start, end = revenue.year_before(query["start"]), revenue.year_before(query["end"])
+            body["previous"] = {"start": start, "end": end, **revenue.series(start, end, **options)}
+        return Response(body)
+
+
 class PlanFeatureViewSet(viewsets.ModelViewSet):
     authentication_classes = [TokenAuthentication]
     permission_classes = [HasRole]
-    required_roles = ["SuperAdmin", "Admin", "Business", "Developer"]
+    permission_policy = "plan-features"
 
     def get_queryset(self):
         qs = PlanFeature.objects.select_related("plan", "feature").all()
@@ -757,6 +800,44 @@ class PlanFeatureViewSet(viewsets.ModelViewSet):
         return _PlanFeatureSerializer
 
 
+class SessionRevokeView(APIView):
+    """Admin: sign out every session of the given users and/or holders of a role."""
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [HasRole]
+    permission_policy = "session-revoke"
+
+    def post(self, request):
+        user_ids = request.data.get("users")
+        if user_ids is None and request.data.get("user") is not None:
+            user_ids = [request.data.get("user")]
+        role_name = request.data.get("role")
+        if not user_ids and not role_name:
+            return Response({"detail": "users or role is required"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            user_ids = [int(pk) for pk in user_ids] if user_ids else None
+        except (TypeError, ValueError):
+            return Response({"detail": "users must be a list of ids"}, status=status.HTTP_400_BAD_REQUEST)
+        revoked = UserAuthToken.revoke(user_ids=user_ids, role=role_name or None)
+        if role_name:
+            invalidate_all_tokens()
+        else:
+            for pk in user_ids:
+                invalidate_user_tokens(pk)
+        return Response({"revoked": revoked})
+
+
+class PermissionMatrixView(APIView):
+    """Dump the compiled role -> endpoint permission matrix."""
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [HasRole]
+    permission_policy = "permission-matrix"
+
+    def get(self, request):
+        return Response({**describe_matrix(), "user_mask": role_mask(request.user)})
+
+
 class EnsureRoleView(APIView):
     authentication_classes = [TokenAuthentication]
 
@@ -766,24 +847,14 @@ class EnsureRoleView(APIView):
             return Response({"detail": "role is required"}, status=status.HTTP_400_BAD_REQUEST)
         # Only allow all users to ensure the default end-user role for themselves.
         # Elevating to privileged roles requires SuperAdmin (or Django superuser).
-        try:
-            user_roles = set(
-                request.user.user_roles.select_related("role").values_list("role__name", flat=True)
-            )
-        except Exception:
-            user_roles = set()
         if role_name != "End-App-User":
-            is_super_admin = request.user.is_superuser or ("SuperAdmin" in user_roles)
-            if not is_super_admin:
+            if not is_super_admin(request.user):
                 return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
         role, _ = Role.objects.get_or_create(name=role_name)
         UserRole.objects.get_or_create(
             user=request.user, role=role, defaults={"userrole_id": request.user.email or request.user.username}
         )
-        roles = list(
-            request.user.user_roles.select_related("role").values_list("role__name", flat=True)
-        )
-        return Response({"roles": roles})
+        return Response({"roles": list(role_names(request.user, refresh=True))})
 
 
 class CropViewSet(viewsets.ModelViewSet):
@@ -818,15 +889,19 @@ class FarmViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class FieldViewSet(viewsets.ModelViewSet):
+class FieldViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     authentication_classes = [TokenAuthentication]
     serializer_class = FieldSerializer
+    conditional_scopes = ("fields:{user}", "reference")
     filterset_fields = ["farm", "crop", "is_active"]
     search_fields = ["name", "location_name"]
     ordering_fields = ["created_at", "updated_at", "name"]
 
     def get_queryset(self):
-        return Field.objects.filter(user=self.request.user).select_related("farm", "crop", "crop_variety")
+        return FieldSerializer.setup_eager_loading(
+            Field.objects.filter(user=self.request.user).select_related("farm", "crop_variety"),
+            fields=FieldSerializer.selected_fields(self.request),
+        )
 
     def perform_create(self, serializer):
         # Map size_acres to area.hectares if provided on create
@@ -847,8 +922,8 @@ class FieldViewSet(viewsets.ModelViewSet):
         # Persist irrigation method relation when passed during create
         try:
             method_id = self.request.data.get("irrigation_method")
-            if method_id:
-                method = IrrigationMethods.objects.get(pk=method_id)
+            method = reference.table("irrigation_method").instance(method_id) if method_id else None
+            if method is not None:
                 FieldIrrigationMethod.objects.update_or_create(field=field, defaults={"irrigation_method": method})
         except Exception:
             pass
@@ -893,12 +968,11 @@ class FieldViewSet(viewsets.ModelViewSet):
             pass
         method_id = request.data.get("irrigation_method")
         if method_id:
-            try:
-                field = self.get_object()
-                method = IrrigationMethods.objects.get(pk=method_id)
-                FieldIrrigationMethod.objects.update_or_create(field=field, defaults={"irrigation_method": method})
-            except IrrigationMethods.DoesNotExist:
+            method = reference.table("irrigation_method").instance(method_id)
+            if method is None:
                 return Response({"detail": "Invalid irrigation_method"}, status=status.HTTP_400_BAD_REQUEST)
+            field = self.get_object()
+            FieldIrrigationMethod.objects.update_or_create(field=field, defaults={"irrigation_method": method})
         # Proceed with default partial update for other fields
         response = super().partial_update(request, *args, **kwargs)
         # Return fresh serialized field with derived attributes
@@ -920,12 +994,12 @@ class FieldViewSet(viewsets.ModelViewSet):
         # After update, persist irrigation method relationship if provided
         try:
             method_id = request.data.get("irrigation_method")
-            if method_id:
+            method = reference.table("irrigation_method").instance(method_id) if method_id else None
+            if method is not None:
                 field = self.get_object()
-                method = IrrigationMethods.objects.get(pk=method_id)
                 FieldIrrigationMethod.objects.update_or_create(field=field, defaults={"irrigation_method": method})
-                # return refreshed representation
-                return Response(FieldSerializer(field).data)
+                # return refreshed representation (re-fetched so the preloaded method is current)
+                return Response(FieldSerializer(self.get_object()).data)
         except Exception:
             pass
         return response
@@ -954,9 +1028,8 @@ class FieldViewSet(viewsets.ModelViewSet):
         method_id = request.data.get("irrigation_method")
         if not method_id:
             return Response({"detail": "irrigation_method is required"}, status=status.HTTP_400_BAD_REQUEST)
-        try:
-            method = IrrigationMethods.objects.get(pk=method_id)
-        except IrrigationMethods.DoesNotExist:
+        method = reference.table("irrigation_method").instance(method_id)
+        if method is None:
             return Response({"detail": "Invalid irrigation_method"}, status=status.HTTP_400_BAD_REQUEST)
         FieldIrrigationMethod.objects.update_or_create(field=field, defaults={"irrigation_method": method})
         return Response({"detail": "Irrigation method set"})
@@ -996,7 +1069,7 @@ class FieldIrrigationPracticeViewSet(viewsets.ModelViewSet):
     serializer_class = FieldIrrigationPracticeSerializer
 
     def get_queryset(self):
-        return FieldIrrigationPractice.objects.filter(field__user=self.request.user).select_related("field", "irrigation_method")
+        return FieldIrrigationPractice.objects.filter(field__user=self.request.user).select_related("field")
 
 
 class AssetViewSet(viewsets.ModelViewSet):
@@ -1005,9 +1078,12 @@ class AssetViewSet(viewsets.ModelViewSet):
     serializer_class = AssetSerializer
 
 
-class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+class NotificationViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     authentication_classes = [TokenAuthentication]
     serializer_class = NotificationSerializer
+    conditional_scopes = ("notifications:{user}",)
+    pagination_class = CreatedAtCursorPagination
+    conditional_actions = ("list", "retrieve", "unread_count")
 
     def get_queryset(self):
         return Notification.objects.filter(receiver=self.request.user)
@@ -1037,23 +1113,15 @@ class SupportRequestViewSet(viewsets.ModelViewSet):
         # Auto route to appropriate roles and create notifications (Support flows)
         try:
             category = obj.category
-            # Map categories to roles that should be notified
-            category_roles_map = {
-                "transaction": ["Business", "Support", "Admin"],
-                "analysis": ["Analyst", "Support", "Admin"],
-                "software_issue": ["Development", "Support", "Admin"],
-                "crop": ["Agronomist", "Support", "Admin"],
-            }
-            target_roles = category_roles_map.get(category, ["Support", "Admin"])
-            # Ensure we do not include SuperAdmin per requirements
-            target_roles = [r for r in target_roles if r != "SuperAdmin"]
+            # Category -> roles to notify lives in policy.SUPPORT_ROUTING
+            target_roles = support_roles(category)
             # Persist the first assigned role for quick triage
             try:
                 obj.assigned_role = target_roles[0]
                 obj.save(update_fields=["assigned_role"])
             except Exception:
                 pass
-            users = CustomUser.objects.filter(user_roles__role__name__in=target_roles).distinct()
+            users = CustomUser.objects.filter(holds_any(target_roles))
             for u in users:
                 Notification.objects.create(
                     sender=self.request.user,
@@ -1085,11 +1153,24 @@ class FeatureTypeViewSet(viewsets.ModelViewSet):
     serializer_class = FeatureTypeSerializer
 
 
-class PlanViewSet(viewsets.ModelViewSet):
+class PlanViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     authentication_classes = [TokenAuthentication]
     queryset = Plan.objects.all()
     serializer_class = PlanSerializer
 
+    def get_conditional_state(self, request):
+        # The catalog's content hash is identical across workers; mix in the URL for pages and filters
+        raw = f"{plan_catalog().etag}|{request.get_full_path()}|{getattr(request, 'accepted_media_type', '')}"
+        return f'"plans-{hashlib.sha1(raw.encode()).hexdigest()[:20]}"', None
+
+    def list(self, request, *args, **kwargs):
+        if PlanSerializer.selected_fields(request) is not None or "ordering" in request.query_params:
+            return super().list(request, *args, **kwargs)
+        # Served from the in-memory catalog
+        catalog = plan_catalog()
+        page = self.paginate_queryset(list(catalog.plans))
+        return self.get_paginated_response(page) if page is not None else Response(list(catalog.plans))
+
 
 class UserPlanViewSet(viewsets.ModelViewSet):
     authentication_classes = [TokenAuthentication]
@@ -1245,7 +1326,7 @@ class UserPlanViewSet(viewsets.ModelViewSet):
         request_refund = request.data.get("request_refund", False)
         
         try:
-            # Find Free plan
+            # Find Free plan; from the database, the registry may lag a price change
             free_plan = Plan.objects.filter(name__iexact="Free").first()
             if not free_plan:
                 return Response({"detail": "Free plan not found"}, status=status.HTTP_404_NOT_FOUND)
@@ -1320,12 +1401,14 @@ class PaymentMethodViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class TransactionViewSet(viewsets.ReadOnlyModelViewSet):
+class TransactionViewSet(FastListMixin, viewsets.ReadOnlyModelViewSet):
     authentication_classes = [TokenAuthentication]
     serializer_class = TransactionSerializer
+    row_encoder = TRANSACTION_ROW_ENCODER
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
-        return Transaction.objects.filter(user=self.request.user).select_related("plan")
+        return Transaction.objects.filter(user=self.request.user).select_related("plan", "user")
 
     @action(
         detail=True,
@@ -1335,30 +1418,13 @@ class TransactionViewSet(viewsets.ReadOnlyModelViewSet):
         permission_classes=[],
     )
     def invoice(self, request, pk=None):
-        # Allow Authorization header OR token query param like exports
-        resolved_user: CustomUser | None = None
-        try:
-            auth_header = request.headers.get("Authorization") or ""
-            token_value = None
-            if auth_header.startswith("Token "):
-                token_value = auth_header.split(" ", 1)[1]
-            token_value = token_value or request.query_params.get("token") or request.query_params.get("access_token")
-            if token_value:
-                tok = UserAuthToken.objects.filter(access_token=token_value).select_related("user").first()
-                if tok:
-                    resolved_user = tok.user
-        except Exception:
-            resolved_user = None
-        if resolved_user is None and not request.user.is_authenticated:
+        # Authorized like exports: signed URL bound to this transaction, or the Authorization header
+        grant = resolve_download(request, "invoice", object_id=pk)
+        if grant is None:
             return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
 
         # Only allow downloading your own invoice
-        base_qs = Transaction.objects.all()
-        if resolved_user:
-            base_qs = base_qs.filter(user=resolved_user)
-        else:
-            base_qs = base_qs.filter(user=request.user)
-        txn = base_qs.filter(pk=pk).select_related("plan", "user").first()
+        txn = Transaction.objects.filter(user_id=grant.user_id, pk=pk).select_related("plan", "user").first()
         if not txn:
             return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
 
@@ -1390,7 +1456,7 @@ class TransactionViewSet(viewsets.ReadOnlyModelViewSet):
         buffer.seek(0)
         response = HttpResponse(buffer.getvalue(), content_type="application/pdf")
         response["Content-Disposition"] = f"attachment; filename=invoice_{txn.id}.pdf"
-        return response
+        return apply_download_cache_headers(response, grant)
 
 
 class RazorpayCreateOrderView(APIView):
@@ -1404,6 +1470,7 @@ class RazorpayCreateOrderView(APIView):
         plan_obj = None
         try:
             if plan_id:
+                # Charged amounts come from the database, never the (possibly stale) registry
                 plan_obj = Plan.objects.filter(pk=plan_id).first()
                 if plan_obj and getattr(plan_obj, "price", None) is not None:
                     amount_paise = int(float(plan_obj.price) * 100)
@@ -1448,9 +1515,9 @@ class RazorpayPaymentSuccessView(APIView):
         if not order_id or not plan_id:
             return Response({"detail": "order_id and plan_id are required"}, status=status.HTTP_400_BAD_REQUEST)
         
-        try:
-            plan_obj = Plan.objects.get(pk=plan_id)
-        except Plan.DoesNotExist:
+        # Price and duration from the database, never the (possibly stale) registry
+        plan_obj = Plan.objects.filter(pk=plan_id).first()
+        if plan_obj is None:
             return Response({"detail": "Plan not found"}, status=status.HTTP_404_NOT_FOUND)
         
         # Find or create transaction
@@ -1568,9 +1635,9 @@ class FakeChargeView(APIView):
         if not plan_id or not payment_method_id:
             return Response({"detail": "plan_id and payment_method_id are required"}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            plan = Plan.objects.get(pk=plan_id)
-        except Plan.DoesNotExist:
+        # Price and duration from the database, never the (possibly stale) registry
+        plan = Plan.objects.filter(pk=plan_id).first()
+        if plan is None:
             return Response({"detail": "Plan not found"}, status=status.HTTP_404_NOT_FOUND)
 
         pm = PaymentMethod.objects.filter(id=payment_method_id, user=request.user).first()
@@ -1606,32 +1673,49 @@ class FakeChargeView(APIView):
         })
 
 
+class DownloadURLView(APIView):
+    """Mint a short-lived signed URL for a report export or an invoice."""
+
+    authentication_classes = [TokenAuthentication]
+
+    def post(self, request):
+        resource = request.data.get("resource")
+        if resource not in DOWNLOAD_RESOURCES:
+            return Response(
+                {"detail": f"resource must be one of: {', '.join(DOWNLOAD_RESOURCES)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        object_id = request.data.get("id")
+        params = request.data.get("params") or {}
+        if not isinstance(params, dict):
+            return Response({"detail": "params must be an object"}, status=status.HTTP_400_BAD_REQUEST)
+        if resource == "invoice":
+            if not object_id or not Transaction.objects.filter(pk=object_id, user=request.user).exists():
+                return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
+            path = reverse(DOWNLOAD_RESOURCES[resource], kwargs={"pk": object_id})
+        else:
+            object_id = None
+            path = reverse(DOWNLOAD_RESOURCES[resource])
+        params = {k: str(v) for k, v in params.items() if v not in (None, "")}
+        sig, expires_at = sign_download(request.user.pk, resource, object_id, params)
+        url = request.build_absolute_uri(f"{path}?{urlencode({**params, 'sig': sig})}")
+        return Response({"url": url, "expires_at": datetime.fromtimestamp(expires_at, tz=dt_timezone.utc).isoformat()})
+
+
 class ExportCSVView(APIView):
-    # Accept token via header or query param; handle auth manually to support new-tab downloads
+    # Authorized by a signed URL or the Authorization header; handled manually to support new-tab downloads
     authentication_classes: list = []
     permission_classes: list = []
 
     def get(self, request):
-        # Resolve user from Authorization header (Token ...) or token query param
-        resolved_user: CustomUser | None = None
-        try:
-            auth_header = request.headers.get("Authorization") or ""
-            token_value = None
-            if auth_header.startswith("Token "):
-                token_value = auth_header.split(" ", 1)[1]
-            token_value = token_value or request.query_params.get("token") or request.query_params.get("access_token")
-            if token_value:
-                tok = UserAuthToken.objects.filter(access_token=token_value).select_related("user").first()
-                if tok:
-                    resolved_user = tok.user
-        except Exception:
-            resolved_user = None
-        if resolved_user is None:
+        grant = resolve_download(request, "export-csv")
+        if grant is None:
             return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+        params = grant.params
         # Optional date filters (YYYY-MM-DD)
-        start_date_str = request.query_params.get("start_date")
-        end_date_str = request.query_params.get("end_date")
-        field_id = request.query_params.get("field_id") or request.query_params.get("field")
+        start_date_str = params.get("start_date")
+        end_date_str = params.get("end_date")
+        field_id = params.get("field_id") or params.get("field")
         start_date = None
         end_date = None
         try:
@@ -1645,7 +1729,7 @@ class ExportCSVView(APIView):
         buffer = io.StringIO()
         writer = csv.writer(buffer)
         writer.writerow(["Field", "Crop", "Hectares"])
-        queryset = Field.objects.filter(user=resolved_user)
+        queryset = Field.objects.filter(user_id=grant.user_id)
         if field_id:
             queryset = queryset.filter(pk=field_id)
         if start_date:
@@ -1658,35 +1742,23 @@ class ExportCSVView(APIView):
         buffer.seek(0)
         response = HttpResponse(buffer.getvalue(), content_type="text/csv")
         response["Content-Disposition"] = "attachment; filename=report.csv"
-        return response
+        return apply_download_cache_headers(response, grant)
 
 
 class ExportPDFView(APIView):
-    # Accept token via header or query param; handle auth manually to support new-tab downloads
+    # Authorized by a signed URL or the Authorization header; handled manually to support new-tab downloads
     authentication_classes: list = []
     permission_classes: list = []
 
     def get(self, request):
-        # Resolve user from Authorization header (Token ...) or token query param
-        resolved_user: CustomUser | None = None
-        try:
-            auth_header = request.headers.get("Authorization") or ""
-            token_value = None
-            if auth_header.startswith("Token "):
-                token_value = auth_header.split(" ", 1)[1]
-            token_value = token_value or request.query_params.get("token") or request.query_params.get("access_token")
-            if token_value:
-                tok = UserAuthToken.objects.filter(access_token=token_value).select_related("user").first()
-                if tok:
-                    resolved_user = tok.user
-        except Exception:
-            resolved_user = None
-        if resolved_user is None:
+        grant = resolve_download(request, "export-pdf")
+        if grant is None:
             return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+        params = grant.params
         # Minimal PDF export with optional date filter
-        start_date_str = request.query_params.get("start_date")
-        end_date_str = request.query_params.get("end_date")
-        field_id = request.query_params.get("field_id") or request.query_params.get("field")
+        start_date_str = params.get("start_date")
+        end_date_str = params.get("end_date")
+        field_id = params.get("field_id") or params.get("field")
         start_date = None
         end_date = None
         try:
@@ -1702,7 +1774,7 @@ class ExportPDFView(APIView):
         p = canvas.Canvas(buffer)
         p.drawString(100, 800, "OELP Report")
         y = 760
-        queryset = Field.objects.filter(user=resolved_user)
+        queryset = Field.objects.filter(user_id=grant.user_id)
         if field_id:
             queryset = queryset.filter(pk=field_id)
         if start_date:
@@ -1717,89 +1789,18 @@ class ExportPDFView(APIView):
         buffer.seek(0)
         response = HttpResponse(buffer.getvalue(), content_type="application/pdf")
         response["Content-Disposition"] = "attachment; filename=report.pdf"
-        return response
+        return apply_download_cache_headers(response, grant)
 
-class AnalyticsSummaryView(APIView):
+class AnalyticsSummaryView(ConditionalGetMixin, APIView):
     authentication_classes = [TokenAuthentication]
+    conditional_scopes = ("fields:{user}", "reference")
 
-    def get(self, request):
-        user = request.user
-        try:
-            role_names = set(user.user_roles.select_related("role").values_list("role__name", flat=True))
-        except Exception:
-            role_names = set()
-        privileged = user.is_superuser or bool({"SuperAdmin", "Admin", "Agronomist", "Analyst", "Business", "Developer"} & role_names)
-
-        # Crop distribution by assigned crop on fields
-        crop_counts = (
-            (Field.objects.all() if privileged else Field.objects.filter(user=user))
-            .values("crop__name")
-            .annotate(cnt=Count("id"))
-            .order_by("-cnt")
-        )
-        crop_distribution = [
-            {"name": (row["crop__name"] or "Unassigned"), "value": row["cnt"]}
-            for row in crop_counts
-        ]
-
-        # Irrigation distribution: prefer explicit method mapping; fallback to practices
-        irrigation_counts = (
-            FieldIrrigationMethod.objects.filter(field__in=(Field.objects.all() if privileged else Field.objects.filter(user=user)))
-            .values("irrigation_method__name")
-            .annotate(cnt=Count("id"))
-            .order_by("-cnt")
-        )
-        irrigation_distribution = [
-            {"name": (row["irrigation_method__name"] or "Unspecified"), "value": row["cnt"]}
-            for row in irrigation_counts
-        ]
-        if not irrigation_distribution:
-            practice_counts = (
-                FieldIrrigationPractice.objects.filter(field__in=(Field.objects.all() if privileged else Field.objects.filter(user=user)))
-                .values("irrigation_method__name")
-                .annotate(cnt=Count("id"))
-                .order_by("-cnt")
-            )
-            irrigation_distribution = [
-                {"name": (row["irrigation_method__name"] or "Unspecified"), "value": row["cnt"]}
-                for row in practice_counts
-            ]
-
-        # Lifecycle completion breakdown and percent
-        lifecycle_base = CropLifecycleDates.objects.filter(field__in=(Field.objects.all() if privileged else Field.objects.filter(user=user)))
-        total_lifecycle = lifecycle_base.count()
-        completed_lifecycle = lifecycle_base.filter(harvesting_date__isnull=False).count()
-        remaining_lifecycle = max(total_lifecycle - completed_lifecycle, 0)
-        lifecycle_completion_percent = int(round((completed_lifecycle / total_lifecycle) * 100)) if total_lifecycle else 0
-        lifecycle_completion = [
-            {"name": "Completed", "value": completed_lifecycle},
-            {"name": "Remaining", "value": remaining_lifecycle},
-        ]
-
-        # Region distribution based on Field.location_name (fallback to Unknown)
-        region_counts = (
-            (Field.objects.all() if privileged else Field.objects.filter(user=user))
-            .values("location_name")
-            .annotate(cnt=Count("id"))
-            .order_by("-cnt")
-        )
-        region_distribution = [
-            {"name": (row["location_name"] or "Unknown"), "value": row["cnt"]}
-            for row in region_counts
-        ]
-
-        has_data = bool(crop_distribution or irrigation_distribution or region_distribution or total_lifecycle)
+    def get_conditional_scopes(self, request):
+        # Privileged users see breakdowns over every field
+        return ("fields", "reference") if is_privileged(request.user) else super().get_conditional_scopes(request)
 
-        return Response(
-            {
-                "has_data": has_data,
-                "lifecycle_completion": lifecycle_completion,
-                "lifecycle_completion_percent": lifecycle_completion_percent,
-                "crop_distribution": crop_distribution,
-                "irrigation_distribution": irrigation_distribution,
-                "region_distribution": region_distribution,
-            }
-        )
+    def get(self, request):
+        return Response(cached_field_summary(request.user, is_privileged(request.user)))
 
 # Import at end to avoid circular reference
 from .serializers import UserSerializer  # noqa: E402
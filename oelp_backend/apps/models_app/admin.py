@@ -2,8 +2,10 @@ from __future__ import annotations
 
 from django.contrib import admin
 
+from .analytics import PlatformStatsSnapshot, RevenueDaily
 from .assets import Asset
 from .crop_variety import Crop, CropVariety
+from .dashboard import UserDashboardSummary
 from .farm import Farm
 from .field import Field, Device, CropLifecycleDates, FieldIrrigationMethod, FieldIrrigationPractice
 from .feature import FeatureType, Feature
@@ -37,7 +39,7 @@ class CustomUserAdmin(admin.ModelAdmin):
 
 @admin.register(UserAuthToken)
 class UserAuthTokenAdmin(admin.ModelAdmin):
-    list_display = ("user", "last_login")
+    list_display = ("user", "device", "created_at", "last_seen")
     search_fields = ("user__email",)
 
 
@@ -131,6 +133,24 @@ admin.site.register(PaymentMethod)
 admin.site.register(Transaction)
 
 
+@admin.register(UserDashboardSummary)
+class UserDashboardSummaryAdmin(admin.ModelAdmin):
+    list_display = ("user", "active_fields", "active_crops", "total_hectares", "unread_notifications", "updated_at")
+    raw_id_fields = ("user", "current_plan")
+
+
+@admin.register(PlatformStatsSnapshot)
+class PlatformStatsSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("key", "computed_at", "duration_ms")
+
+
+@admin.register(RevenueDaily)
+class RevenueDailyAdmin(admin.ModelAdmin):
+    list_display = ("day", "currency", "plan", "transaction_type", "status", "amount", "count")
+    list_filter = ("status", "transaction_type", "currency")
+    date_hierarchy = "day"
+
+
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
     list_display = ("id", "receiver", "is_read", "created_at")
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+from .plan import Plan
+
+
+class PlatformStatsSnapshot(models.Model):
+    """Latest precomputed platform-wide statistics, one row per ``key``.
+
+    Written by the ``refresh_platform_stats`` task and served as-is by the
+    admin analytics endpoint.
+    """
+
+    key = models.CharField(max_length=64, unique=True)
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    computed_at = models.DateTimeField()
+    duration_ms = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"{self.key} @ {self.computed_at:%Y-%m-%d %H:%M:%S}"
+
+
+class RevenueDaily(models.Model):
+    """Transaction totals per local day, currency, plan, type and status.
+
+    Kept in step with ``Transaction`` writes by ``apps.api.revenue``; rebuild
+    with ``manage.py backfill_revenue_daily`` and audit with
+    ``manage.py reconcile_revenue_daily``. A key may span several rows (two
+    first writes racing), so always read with ``Sum()``.
+    """
+
+    day = models.DateField()
+    currency = models.CharField(max_length=10)
+    plan = models.ForeignKey(Plan, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    transaction_type = models.CharField(max_length=20)
+    status = models.CharField(max_length=20)
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["day", "status"], name="revenue_daily_day_status_idx")]
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"{self.day} {self.currency} {self.status}: {self.amount} ({self.count})"
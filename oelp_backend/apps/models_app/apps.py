@@ -20,6 +20,8 @@ class ModelsAppConfig(AppConfig):
         from . import user_plan  # noqa: F401
         from . import notifications  # noqa: F401
         from . import token  # noqa: F401
+        from . import dashboard  # noqa: F401
+        from . import analytics  # noqa: F401
         # Import signals
         from . import signals  # noqa: F401
 
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from django.db import models
+
+from .user import CustomUser
+from .user_plan import UserPlan
+
+
+class UserDashboardSummary(models.Model):
+    """Per-user dashboard figures, kept current from the write paths (see ``apps.api.summary``).
+
+    Field figures cover the user's own active fields. Privileged users'
+    platform-wide totals are aggregated live. Repair drift with
+    ``manage.py rebuild_dashboard_summaries``.
+    """
+
+    user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, primary_key=True, related_name="dashboard_summary")
+    active_fields = models.PositiveIntegerField(default=0)
+    active_crops = models.PositiveIntegerField(default=0)
+    total_hectares = models.FloatField(default=0.0)
+    unread_notifications = models.PositiveIntegerField(default=0)
+    current_plan = models.ForeignKey(UserPlan, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"Dashboard summary for {self.user_id}"
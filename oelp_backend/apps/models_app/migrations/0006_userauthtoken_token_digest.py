@@ -0,0 +1,43 @@
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_existing_tokens(apps, schema_editor):
+    UserAuthToken = apps.get_model("models_app", "UserAuthToken")
+    # Rows without a token can never authenticate, and a repeated token would
+    # collide on the unique digest; drop both (newest copy of a token wins)
+    seen, unusable = set(), []
+    for tok in UserAuthToken.objects.order_by("-id").only("id", "access_token"):
+        if not tok.access_token or tok.access_token in seen:
+            unusable.append(tok.pk)
+            continue
+        seen.add(tok.access_token)
+        tok.token_digest = hashlib.sha256(tok.access_token.encode()).hexdigest()
+        tok.save(update_fields=["token_digest"])
+    UserAuthToken.objects.filter(pk__in=unusable).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("models_app", "0005_add_refund_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userauthtoken",
+            name="token_digest",
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.RunPython(hash_existing_tokens, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="userauthtoken",
+            name="token_digest",
+            field=models.CharField(max_length=64, unique=True),
+        ),
+        migrations.RemoveField(
+            model_name="userauthtoken",
+            name="access_token",
+        ),
+    ]
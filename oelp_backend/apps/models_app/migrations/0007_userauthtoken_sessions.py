@@ -0,0 +1,35 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("models_app", "0006_userauthtoken_token_digest"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="userauthtoken",
+            name="user",
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="auth_tokens", to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name="userauthtoken",
+            name="device",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="userauthtoken",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="userauthtoken",
+            name="last_seen",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
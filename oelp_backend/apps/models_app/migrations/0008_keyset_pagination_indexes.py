@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("models_app", "0007_userauthtoken_sessions"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="customuser",
+            index=models.Index(fields=["date_joined", "id"], name="user_date_joined_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(fields=["receiver", "created_at", "id"], name="notif_receiver_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(fields=["created_at", "id"], name="notif_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["user", "created_at", "id"], name="txn_user_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="useractivity",
+            index=models.Index(fields=["user", "created_at", "id"], name="activity_user_created_idx"),
+        ),
+    ]
@@ -0,0 +1,22 @@
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("models_app", "0009_userdashboardsummary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlatformStatsSnapshot",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("key", models.CharField(max_length=64, unique=True)),
+                ("data", models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ("computed_at", models.DateTimeField()),
+                ("duration_ms", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,67 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill(apps, schema_editor):
+    # Same grouping as manage.py backfill_revenue_daily; one row per key
+    Transaction = apps.get_model("models_app", "Transaction")
+    RevenueDaily = apps.get_model("models_app", "RevenueDaily")
+    rows = (
+        Transaction.objects.annotate(day=TruncDate("created_at"))
+        .values("day", "currency", "plan_id", "transaction_type", "status")
+        .annotate(total=Sum("amount"), n=Count("id"))
+        .order_by()
+    )
+    RevenueDaily.objects.bulk_create(
+        [
+            RevenueDaily(
+                day=row["day"],
+                currency=row["currency"],
+                plan_id=row["plan_id"],
+                transaction_type=row["transaction_type"],
+                status=row["status"],
+                amount=row["total"] or 0,
+                count=row["n"],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("models_app", "0010_platformstatssnapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RevenueDaily",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                ("currency", models.CharField(max_length=10)),
+                ("transaction_type", models.CharField(max_length=20)),
+                ("status", models.CharField(max_length=20)),
+                ("amount", models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "plan",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="models_app.plan",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["day", "status"], name="revenue_daily_day_status_idx")],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
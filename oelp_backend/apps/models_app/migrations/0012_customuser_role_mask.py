@@ -0,0 +1,62 @@
+from collections import defaultdict
+
+from django.db import migrations, models
+
+# ROLE_BITS as of this migration, frozen so the backfill does not depend on the code running it
+ROLE_BITS = {
+    "SuperAdmin": 1 << 0,
+    "Admin": 1 << 1,
+    "Agronomist": 1 << 2,
+    "Analyst": 1 << 3,
+    "Business": 1 << 4,
+    "Developer": 1 << 5,
+    "Support": 1 << 6,
+    "End-App-User": 1 << 7,
+    "Manager": 1 << 8,
+}
+
+
+def backfill(apps, schema_editor):
+    # Same result as apps.api.roles.sync_role_masks() at the time of this migration
+    CustomUser = apps.get_model("models_app", "CustomUser")
+    UserRole = apps.get_model("models_app", "UserRole")
+    masks = defaultdict(int)
+    for user_id, name in UserRole.objects.values_list("user_id", "role__name").iterator():
+        masks[user_id] |= ROLE_BITS.get(name, 0)
+    CustomUser.objects.bulk_update(
+        [CustomUser(pk=user_id, role_mask=mask) for user_id, mask in masks.items() if mask],
+        ["role_mask"],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("models_app", "0011_revenuedaily"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customuser",
+            name="role_mask",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="customuser",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("role_mask", 128)),
+                fields=["date_joined", "id"],
+                name="user_end_user_joined_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="customuser",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["role_mask"],
+                name="user_active_role_mask_idx",
+            ),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
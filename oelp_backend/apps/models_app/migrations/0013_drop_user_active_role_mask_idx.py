@@ -0,0 +1,16 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("models_app", "0012_customuser_role_mask"),
+    ]
+
+    operations = [
+        # role_mask is tested with a bit AND (apps.api.roles.holds_any), which a btree cannot serve
+        migrations.RemoveIndex(
+            model_name="customuser",
+            name="user_active_role_mask_idx",
+        ),
+    ]
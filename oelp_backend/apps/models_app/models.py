@@ -43,3 +43,4 @@ class UserActivity(models.Model):
     class Meta:
         app_label = "models_app"
         ordering = ("-created_at",)
+        indexes = [models.Index(fields=["user", "created_at", "id"], name="activity_user_created_idx")]
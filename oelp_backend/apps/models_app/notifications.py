@@ -12,6 +12,13 @@ class Notification(models.Model):
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Keyset pagination: the inbox by receiver, the admin list across everyone
+        indexes = [
+            models.Index(fields=["receiver", "created_at", "id"], name="notif_receiver_created_idx"),
+            models.Index(fields=["created_at", "id"], name="notif_created_idx"),
+        ]
+
     def __str__(self) -> str:  # pragma: no cover
         return f"Notification to {self.receiver}"
 
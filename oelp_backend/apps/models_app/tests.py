@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.api.roles import sync_role_masks
+
+from .user import ROLE_BITS, CustomUser, Role, UserRole
+
+
+class RoleMaskSaveTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user("masked", "pw-Masked-12345")
+
+    def grant(self, name):
+        UserRole.objects.create(user=self.user, role=Role.objects.get_or_create(name=name)[0])
+        sync_role_masks([self.user.pk])
+
+    def test_stale_full_save_keeps_new_mask(self):
+        stale = CustomUser.objects.get(pk=self.user.pk)
+        self.grant("Support")
+        stale.full_name = "Renamed"
+        stale.save()
+        fresh = CustomUser.objects.get(pk=self.user.pk)
+        self.assertEqual(fresh.full_name, "Renamed")
+        self.assertEqual(fresh.role_mask, ROLE_BITS["Support"])
+
+    def test_deferred_save_writes_only_loaded_fields(self):
+        partial = CustomUser.objects.only("id", "full_name").get(pk=self.user.pk)
+        partial.full_name = "Partial"
+        with CaptureQueriesContext(connection) as queries:
+            partial.save()
+        # No SELECTs for the deferred columns; the savepoint is there because TestCase is a transaction
+        statements = [q["sql"] for q in queries.captured_queries if "SAVEPOINT" not in q["sql"]]
+        self.assertEqual(len(statements), 1)
+        self.assertTrue(statements[0].startswith("UPDATE"))
+        self.assertNotIn('"email"', statements[0])
+        self.assertEqual(CustomUser.objects.get(pk=self.user.pk).full_name, "Partial")
+
+    def test_full_save_of_deleted_row_inserts_it(self):
+        stale = CustomUser.objects.get(pk=self.user.pk)
+        CustomUser.objects.filter(pk=self.user.pk).delete()
+        stale.save()
+        self.assertTrue(CustomUser.objects.filter(pk=self.user.pk).exists())
@@ -1,17 +1,65 @@
 from __future__ import annotations
 
+import hashlib
+import secrets
+
 from django.db import models
 from django.utils import timezone
 
 from .user import CustomUser
 
 
+def hash_token(raw_token: str) -> str:
+    """Return the SHA-256 hex digest stored in place of a raw access token."""
+    return hashlib.sha256(raw_token.encode()).hexdigest()
+
+
 class UserAuthToken(models.Model):
-    user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name="auth_token")
-    access_token = models.TextField()
+    """One login session; a user may hold several (one per device)."""
+
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="auth_tokens")
+    # Only the digest is persisted; the raw token is handed to the client once at login
+    token_digest = models.CharField(max_length=64, unique=True)
+    device = models.CharField(max_length=255, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
     last_login = models.DateTimeField(auto_now=True)
+    # Written back in batches by the auth layer, so it lags by up to the flush interval
+    last_seen = models.DateTimeField(null=True, blank=True)
 
     def __str__(self) -> str:  # pragma: no cover - trivial
         username = self.user.username or self.user.email
-        return f"{username} - Auth Token"
+        return f"{username} - Auth Token ({self.device or 'unknown device'})"
+
+    @classmethod
+    def issue(cls, user: CustomUser, device: str = "", max_sessions: int | None = None) -> tuple[str, "UserAuthToken"]:
+        """Open a new session for ``user`` and return ``(raw token, session)``.
+
+        Other sessions stay valid; beyond ``max_sessions`` the oldest are dropped.
+        """
+        raw_token = secrets.token_urlsafe(48)
+        session = cls.objects.create(user=user, token_digest=hash_token(raw_token), device=device[:255])
+        if max_sessions:
+            stale = list(
+                cls.objects.filter(user=user).order_by("-id").values_list("id", flat=True)[max_sessions:]
+            )
+            if stale:
+                cls.objects.filter(id__in=stale).delete()
+        return raw_token, session
+
+    @classmethod
+    def revoke(cls, user_ids=None, role: str | None = None) -> int:
+        """Delete all sessions of the given users and/or holders of ``role`` in one statement."""
+        if user_ids is None and role is None:
+            raise ValueError("revoke() needs user_ids or role")
+        qs = cls.objects.all()
+        if user_ids is not None:
+            qs = qs.filter(user_id__in=user_ids)
+        if role is not None:
+            qs = qs.filter(user__user_roles__role__name=role)
+        deleted, _ = qs.delete()
+        return deleted
 
+    @classmethod
+    def touch(cls, digests, when=None) -> int:
+        """Bulk-update ``last_seen`` for the given token digests."""
+        return cls.objects.filter(token_digest__in=list(digests)).update(last_seen=when or timezone.now())
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from contextlib import nullcontext
+
 from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
 from django.contrib.auth.models import PermissionsMixin
-from django.db import models
+from django.db import DatabaseError, connections, models, router, transaction
 from django.utils import timezone
 
 
@@ -34,6 +36,21 @@ class CustomUserManager(BaseUserManager):
         return self.create_user(username, password, **extra_fields)
 
 
+# Bit per known role for compiled permission checks and ``CustomUser.role_mask``;
+# append only, never renumber (stored masks would change meaning)
+ROLE_BITS = {
+    "SuperAdmin": 1 << 0,
+    "Admin": 1 << 1,
+    "Agronomist": 1 << 2,
+    "Analyst": 1 << 3,
+    "Business": 1 << 4,
+    "Developer": 1 << 5,
+    "Support": 1 << 6,
+    "End-App-User": 1 << 7,
+    "Manager": 1 << 8,
+}
+
+
 class CustomUser(AbstractBaseUser, PermissionsMixin):
     username = models.CharField(max_length=150, unique=True, null=True, blank=True)
     full_name = models.CharField(max_length=255, default="User")
@@ -44,15 +61,67 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
     date_joined = models.DateTimeField(default=timezone.now)
+    # OR of ROLE_BITS over the user's UserRole rows, kept in sync by apps.api.roles.sync_role_masks
+    role_mask = models.IntegerField(default=0, editable=False)
 
     USERNAME_FIELD = "username"
     REQUIRED_FIELDS: list[str] = ["email"]
 
     objects = CustomUserManager()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["date_joined", "id"], name="user_date_joined_idx"),
+            # Pure end users by join date; other role tests (roles.holds_any) are bit ANDs,
+            # which no btree index serves
+            models.Index(
+                fields=["date_joined", "id"],
+                name="user_end_user_joined_idx",
+                condition=models.Q(is_active=True, role_mask=ROLE_BITS["End-App-User"]),
+            ),
+        ]
+
     def __str__(self) -> str:  # pragma: no cover - trivial
         return self.username or self.email or self.phone_number or "Unknown"
 
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        # Users built from access-token claims defer the profile columns; the first
+        # access to one loads all of them in a single query rather than one each
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = list(deferred)
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+
+    def save(self, *args, **kwargs):
+        # role_mask is written only by sync_role_masks; a full save of an instance
+        # loaded before a role change must not put the old mask back. Such saves
+        # name the loaded fields minus role_mask, which is what stock save() writes
+        # for a deferred instance anyway
+        if self._state.adding or args or kwargs.get("update_fields") is not None or kwargs.get("force_insert"):
+            return super().save(*args, **kwargs)
+        deferred = self.get_deferred_fields()
+        fields = [
+            field.name
+            for field in self._meta.concrete_fields
+            if not field.primary_key and field.attname not in deferred and field.name != "role_mask"
+        ]
+        using = kwargs.pop("using", None) or router.db_for_write(type(self), instance=self)
+        force_update = kwargs.pop("force_update", False)
+        # save() raises when no row matched; inside a transaction that error would doom
+        # it, so the attempt gets its own savepoint there
+        guard = transaction.atomic(using=using) if connections[using].in_atomic_block else nullcontext()
+        try:
+            with guard:
+                super().save(using=using, update_fields=fields, **kwargs)
+        except DatabaseError as exc:
+            # Only save()'s own "did not affect any rows" error: the row was deleted
+            # meanwhile, and stock save() inserts it again, so do the same
+            if force_update or type(exc) is not DatabaseError:
+                raise
+            if type(self)._base_manager.using(using).filter(pk=self.pk).exists():
+                raise
+            super().save(using=using, force_insert=True, **kwargs)
+
 
 # Simple Role model for RBAC
 class Role(models.Model):
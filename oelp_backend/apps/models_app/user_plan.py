@@ -58,6 +58,9 @@ class Transaction(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["user", "created_at", "id"], name="txn_user_created_idx")]
+
 
 class RefundPolicy(models.Model):
     plan_type = models.CharField(max_length=16, choices=Plan.PlanType.choices)
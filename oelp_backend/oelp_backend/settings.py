@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from datetime import timedelta
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # Load .env for local dev (repo root and project dir); not needed on Render
@@ -12,7 +13,8 @@ load_dotenv(dotenv_path=REPO_ROOT / ".env")
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # ------------------- SECURITY -------------------
-SECRET_KEY = os.getenv("DJANGO_SECRET_KEY", "local-secret-key")
+DEFAULT_SECRET_KEY = "local-secret-key"
+SECRET_KEY = os.getenv("DJANGO_SECRET_KEY", DEFAULT_SECRET_KEY)
 DEBUG = os.getenv("DJANGO_DEBUG", "true").lower() == "true"
 ALLOWED_HOSTS = os.getenv("DJANGO_ALLOWED_HOSTS", "*").split(",")
 CORS_ALLOW_ALL_ORIGINS = True
@@ -41,13 +43,16 @@ INSTALLED_APPS = [
     "corsheaders",
     "drf_spectacular",
     "apps.models_app.apps.ModelsAppConfig",
-    "apps.api",
+    "apps.api.apps.ApiConfig",
 ]
 
 MIDDLEWARE = [
+    # Outermost so the counters include queries made by the other middleware
+    "apps.api.middleware.QueryBudgetMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    # Async capable subclass, so ASGI requests are not forced through a sync thread
+    "apps.api.middleware.AsyncWhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -56,6 +61,10 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Per-request SQL counters in X-DB-* response headers (on with DEBUG by default)
+QUERY_INSTRUMENTATION = os.getenv("QUERY_INSTRUMENTATION", str(DEBUG)).lower() == "true"
+QUERY_BUDGET_FILE = os.getenv("QUERY_BUDGET_FILE", str(BASE_DIR / "apps" / "api" / "query_budgets.json"))
+
 ROOT_URLCONF = "oelp_backend.urls"
 
 TEMPLATES = [
@@ -150,18 +159,102 @@ CSRF_TRUSTED_ORIGINS = [
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.IsAuthenticated"],
     "DEFAULT_AUTHENTICATION_CLASSES": ["apps.api.auth.TokenAuthentication"],
+    # orjson-backed JSON (apps.api.renderers); behaves like DRF's classes when orjson is missing
+    "DEFAULT_RENDERER_CLASSES": [
+        "apps.api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "apps.api.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_PAGINATION_CLASS": "apps.api.pagination.DefaultPageNumberPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
+        "apps.api.filters.SparseFieldsFilter",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Fixed-window limits for the unauthenticated auth endpoints (apps.api.throttling)
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": os.getenv("THROTTLE_LOGIN_IP", "30/min"),
+        "login_username": os.getenv("THROTTLE_LOGIN_USERNAME", "10/min"),
+        "signup_ip": os.getenv("THROTTLE_SIGNUP_IP", "10/min"),
+        "password_ip": os.getenv("THROTTLE_PASSWORD_IP", "10/min"),
+        "password_username": os.getenv("THROTTLE_PASSWORD_USERNAME", "5/min"),
+    },
+    # Set to the number of proxies in front of the app (Render: 1) so client IPs come from X-Forwarded-For
+    "NUM_PROXIES": int(os.environ["DRF_NUM_PROXIES"]) if os.getenv("DRF_NUM_PROXIES") else None,
 }
 
+# Serve the large admin lists from values() rows instead of model instances (same JSON)
+FAST_LIST_SERIALIZATION = os.getenv("FAST_LIST_SERIALIZATION", "false").lower() == "true"
+
 SPECTACULAR_SETTINGS = {"TITLE": "OELP API", "VERSION": "1.0.0"}
 
+# ------------------- CACHE -------------------
+# Shared Redis cache when available (Render sets REDIS_URL); per-process memory otherwise
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": REDIS_URL}}
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+# Throttle counters and conditional GET change stamps must be shared by all workers to be
+# effective: Redis when available, else the database cache (run `manage.py createcachetable`).
+# Per-process memory would multiply every limit by the worker count and let a worker answer
+# 304 for data another worker changed, so it is only the default with DEBUG on
+SHARED_DB_CACHE = os.getenv("THROTTLE_DB_CACHE", "false" if DEBUG else "true").lower() == "true"
+if REDIS_URL:
+    CACHES["throttle"] = CACHES["conditional"] = CACHES["default"]
+elif SHARED_DB_CACHE:
+    CACHES["throttle"] = {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "api_throttle_cache"}
+    CACHES["conditional"] = {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "api_conditional_cache",
+    }
+else:
+    CACHES["throttle"] = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "throttle"}
+    CACHES["conditional"] = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "conditional"}
+AUTH_THROTTLE_CACHE = "throttle"
+# Change stamps behind ETags and the analytics cache keys (apps.api.conditional); never expire
+CONDITIONAL_CACHE = "conditional"
+
+# Role writes invalidate cached roles through the cache itself, which only reaches other
+# workers when it is shared; per-process, the TTL bounds how long a revoked role lingers
+ROLE_CACHE_TTL = int(os.getenv("ROLE_CACHE_TTL", "300" if REDIS_URL else "5"))
+# Reference tables (roles, plans, crops, ...) are held per worker and reloaded when their
+# change counter moves; the max age bounds staleness when the cache is per-process
+REFERENCE_REGISTRY_MAX_AGE = int(os.getenv("REFERENCE_REGISTRY_MAX_AGE", "300"))
+# Analytics results are keyed by data version, so the TTL only bounds how long old entries linger
+ANALYTICS_CACHE_TTL = int(os.getenv("ANALYTICS_CACHE_TTL", "3600"))
+
+# ------------------- AUTH TOKENS -------------------
+# Per-worker cache of token digest -> user; TTL bounds staleness across workers
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+AUTH_TOKEN_CACHE_TTL = int(os.getenv("AUTH_TOKEN_CACHE_TTL", "30"))
+# Concurrent device sessions per user (oldest dropped beyond this) and last_seen write-back batching
+AUTH_MAX_SESSIONS = int(os.getenv("AUTH_MAX_SESSIONS", "10"))
+AUTH_LAST_SEEN_FLUSH_INTERVAL = int(os.getenv("AUTH_LAST_SEEN_FLUSH_INTERVAL", "60"))
+
+# Short-lived signed access tokens (Authorization: Bearer ...); the DB token acts as refresh token
+AUTH_JWT_ENABLED = os.getenv("AUTH_JWT_ENABLED", "true").lower() == "true"
+JWT_SIGNING_KEY = os.getenv("JWT_SIGNING_KEY", SECRET_KEY)
+if AUTH_JWT_ENABLED and not DEBUG and JWT_SIGNING_KEY == DEFAULT_SECRET_KEY:
+    # The default is public; anyone could mint access tokens for any user
+    raise ImproperlyConfigured("Set JWT_SIGNING_KEY (or DJANGO_SECRET_KEY) before running with DEBUG off")
+JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+JWT_ACCESS_TTL = int(os.getenv("JWT_ACCESS_TTL", "300"))
+
+# Signed download URLs for exports and invoices (POST /api/downloads/sign/)
+DOWNLOAD_URL_TTL = int(os.getenv("DOWNLOAD_URL_TTL", "300"))
+# Legacy ?token=<auth token> on download URLs leaks long-lived tokens into logs; off unless
+# explicitly enabled as a stopgap while clients move to signed URLs
+DOWNLOAD_ALLOW_QUERY_TOKEN = os.getenv("DOWNLOAD_ALLOW_QUERY_TOKEN", "false").lower() == "true"
+
 # ------------------- THIRD PARTY KEYS -------------------
 RAZORPAY_KEY_ID = os.getenv("RAZORPAY_KEY_ID", "")
 RAZORPAY_KEY_SECRET = os.getenv("RAZORPAY_KEY_SECRET", "")
@@ -169,15 +262,42 @@ RAZORPAY_KEY_SECRET = os.getenv("RAZORPAY_KEY_SECRET", "")
 # ------------------- CELERY -------------------
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", CELERY_BROKER_URL)
+# Run tasks inline in the caller instead of on a worker (tests, local development)
+CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_TASK_ALWAYS_EAGER", "false").lower() == "true"
+CELERY_TASK_EAGER_PROPAGATES = True
+# Admin analytics come from a snapshot refreshed by beat every interval (seconds); one older
+# than the max age is still served while a refresh is queued
+PLATFORM_STATS_REFRESH_INTERVAL = int(os.getenv("PLATFORM_STATS_REFRESH_INTERVAL", "300"))
+PLATFORM_STATS_MAX_AGE = int(os.getenv("PLATFORM_STATS_MAX_AGE", "600"))
+CELERY_BEAT_SCHEDULE = {
+    "refresh-platform-stats": {
+        "task": "apps.api.tasks.refresh_platform_stats",
+        "schedule": PLATFORM_STATS_REFRESH_INTERVAL,
+    },
+}
 
 # ------------------- PASSWORDS -------------------
 PASSWORD_HASHERS = [
-    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "apps.api.hashers.ConfigurableArgon2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
     "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
 ]
 
+# Argon2 cost per deployment (memory in KiB); existing hashes are upgraded on next login
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "102400"))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "8"))
+
+# Hashing runs on a small per-worker pool; requests beyond workers + queue get 503 + Retry-After.
+# Only the ASGI login (auth/login/async/) frees the request while it hashes; sync views still
+# wait on the pool, which then just caps hashing CPU per worker
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "8"))
+PASSWORD_HASH_RETRY_AFTER = int(os.getenv("PASSWORD_HASH_RETRY_AFTER", "1"))
+
+AUTHENTICATION_BACKENDS = ["apps.api.backends.PooledModelBackend"]
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator", "OPTIONS": {"min_length": 8}},